@@ -1,13 +1,18 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
-
+import numpy as np
+from astropy.table import Table
+from astropy.coordinates import Angle
+from astropy.coordinates.angle_utilities import angular_separation
+from regions import CircleSkyRegion
 from .ring import ring_area_factor
 from .reflected import find_reflected_regions
 
 __all__ = [
     'BackgroundEstimate',
     'ring_background_estimate',
-    'reflected_regions_background_estimate'
+    'reflected_regions_background_estimate',
+    'multi_target_background_estimate',
 ]
 
 
@@ -91,3 +96,177 @@ def reflected_regions_background_estimate(on_region, pointing, exclusion,
     a_off = len(off_region)
 
     return BackgroundEstimate(off_region, off_events, a_on, a_off, tag='reflected')
+
+
+def _unit_vectors(lon, lat):
+    """Cartesian unit vectors for given lon / lat (radian) arrays."""
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+class _EventConeLookup(object):
+    """Spatial lookup of events in sky circles.
+
+    Builds a KD-tree on the event unit vectors once, so that the events
+    in many sky circles can be found without scanning the full event list
+    for every circle.
+
+    Parameters
+    ----------
+    events : `~gammapy.data.EventList`
+        Events
+    """
+
+    def __init__(self, events):
+        from scipy.spatial import cKDTree
+        self.lon = np.radians(np.asarray(events['RA'], dtype=float))
+        self.lat = np.radians(np.asarray(events['DEC'], dtype=float))
+        self.tree = cKDTree(_unit_vectors(self.lon, self.lat))
+
+    def query(self, center, radius):
+        """Find events within a sky circle.
+
+        Parameters
+        ----------
+        center : `~astropy.coordinates.SkyCoord`
+            Circle center
+        radius : `~astropy.coordinates.Angle`
+            Circle radius
+
+        Returns
+        -------
+        idx : `~numpy.ndarray`
+            Indices of candidate events (sorted)
+        separation : `~numpy.ndarray`
+            Separation of the candidate events from the center (radian)
+        """
+        center = center.icrs
+        lon, lat = center.ra.radian, center.dec.radian
+        radius = min(Angle(radius).radian, np.pi)
+        xyz = _unit_vectors(np.atleast_1d(lon), np.atleast_1d(lat))[0]
+        # Chord length for the radius, slightly enlarged to be safe against
+        # rounding. The exact selection is done on the separation below.
+        chord = 2 * np.sin(radius / 2) * (1 + 1e-9) + 1e-12
+        idx = np.array(sorted(self.tree.query_ball_point(xyz, chord)), dtype=int)
+        separation = angular_separation(lon, lat, self.lon[idx], self.lat[idx])
+        return idx, np.asarray(separation)
+
+    def query_circle(self, center, radius):
+        """Indices of events inside a sky circle."""
+        idx, separation = self.query(center, radius)
+        return idx[separation < Angle(radius).radian]
+
+    def query_ring(self, center, inner_radius, outer_radius):
+        """Indices of events inside a sky ring."""
+        idx, separation = self.query(center, outer_radius)
+        mask = (Angle(inner_radius).radian < separation)
+        mask &= (separation < Angle(outer_radius).radian)
+        return idx[mask]
+
+
+def multi_target_background_estimate(positions, on_radius, events, method='ring',
+                                     inner_radius=None, outer_radius=None,
+                                     pointing=None, exclusion=None,
+                                     return_indices=False, **kwargs):
+    """On / off background estimates for many targets in one pass.
+
+    Same results as calling :func:`~gammapy.background.ring_background_estimate`
+    and / or :func:`~gammapy.background.reflected_regions_background_estimate`
+    for every target, but events are assigned to all ON, ring and reflected
+    regions using a spatial lookup (KD-tree) that is built only once,
+    instead of computing the separation of all events for every region.
+
+    kwargs are forwarded to :func:`gammapy.background.find_reflected_regions`
+
+    Parameters
+    ----------
+    positions : `~astropy.coordinates.SkyCoord`
+        Target positions (ON region centers), array-valued
+    on_radius : `~astropy.coordinates.Angle`
+        ON region radius, scalar or one value per target
+    events : `~gammapy.data.EventList`
+        Events
+    method : {'ring', 'reflected'} or list
+        Background estimation method(s)
+    inner_radius : `~astropy.coordinates.Angle`
+        Inner ring radius (for method 'ring')
+    outer_radius : `~astropy.coordinates.Angle`
+        Outer ring radius (for method 'ring')
+    pointing : `~astropy.coordinates.SkyCoord`
+        Pointing position (for method 'reflected')
+    exclusion : `~gammapy.image.SkyMask`, optional
+        Exclusion mask (for method 'reflected')
+    return_indices : bool
+        Add columns ``on_idx`` and ``off_idx`` with the indices of the ON and OFF
+        events in ``events`` (object columns, can't be written to FITS)
+
+    Returns
+    -------
+    table : `~astropy.table.Table`
+        One row per target and method with columns ``target_idx``, ``method``,
+        ``n_on``, ``n_off``, ``a_on``, ``a_off``, ``alpha`` and ``n_off_regions``.
+    """
+    if isinstance(method, (list, tuple)):
+        methods = list(method)
+    else:
+        methods = [method]
+
+    valid_methods = ['ring', 'reflected']
+    for tag in methods:
+        if tag not in valid_methods:
+            raise ValueError('Invalid method: {}. Choose one of: {}'
+                             ''.format(tag, ', '.join(valid_methods)))
+    if 'ring' in methods and (inner_radius is None or outer_radius is None):
+        raise ValueError('Ring method requires inner_radius and outer_radius')
+    if 'reflected' in methods and pointing is None:
+        raise ValueError('Reflected regions method requires pointing')
+
+    positions = positions.icrs
+    n_targets = len(positions)
+    on_radius = Angle(on_radius) * np.ones(n_targets)
+
+    lookup = _EventConeLookup(events)
+
+    rows = []
+    for idx in range(n_targets):
+        position = positions[idx]
+        on_idx = lookup.query_circle(position, on_radius[idx])
+
+        for tag in methods:
+            if tag == 'ring':
+                off_idx = lookup.query_ring(position, inner_radius, outer_radius)
+                a_off = ring_area_factor(on_radius[idx].deg, Angle(inner_radius).deg,
+                                         Angle(outer_radius).deg)
+                n_off_regions = 1
+            else:
+                on_region = CircleSkyRegion(position, on_radius[idx])
+                off_regions = find_reflected_regions(on_region, pointing, exclusion, **kwargs)
+                off_idx = [lookup.query_circle(region.center, region.radius)
+                           for region in off_regions]
+                off_idx = np.unique(np.concatenate([np.array([], dtype=int)] + off_idx))
+                a_off = len(off_regions)
+                n_off_regions = len(off_regions)
+
+            row = dict(target_idx=idx, method=tag, n_on=len(on_idx), n_off=len(off_idx),
+                       a_on=1., a_off=float(a_off), n_off_regions=n_off_regions)
+            if return_indices:
+                row.update(on_idx=on_idx, off_idx=off_idx)
+            rows.append(row)
+
+    names = ['target_idx', 'method', 'n_on', 'n_off', 'a_on', 'a_off', 'n_off_regions']
+    if return_indices:
+        names += ['on_idx', 'off_idx']
+
+    table = Table()
+    for name in names:
+        values = [row[name] for row in rows]
+        if name in ['on_idx', 'off_idx']:
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            values = column
+        table[name] = values
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        table['alpha'] = np.asarray(table['a_on'], dtype=float) / np.asarray(table['a_off'], dtype=float)
+
+    return table
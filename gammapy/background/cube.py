@@ -141,6 +141,80 @@ class Cube(object):
 
         self.scheme = scheme
 
+    @property
+    def data(self):
+        """Data cube (3D `~astropy.units.Quantity` or `~numpy.ndarray`)"""
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._interpolate_cache = dict()
+
+    def _interpolate(self, interp_kwargs=None):
+        """Interpolated data (`~scipy.interpolate.RegularGridInterpolator`).
+
+        Interpolation is done on the (energy, Y, X) bin centers. The interpolator
+        is cached for each set of ``interp_kwargs`` and re-created when the data
+        are set or filled.
+        """
+        if not interp_kwargs:
+            interp_kwargs = dict(bounds_error=False, fill_value=None)
+
+        key = tuple(sorted(interp_kwargs.items()))
+        if key not in self._interpolate_cache:
+            from scipy.interpolate import RegularGridInterpolator
+            coordx, coordy = self.image_bin_centers
+            points = [self.energy_edges.log_centers.value,
+                      Angle(coordy).to('deg').value,
+                      Angle(coordx).to('deg').value]
+            values = np.asanyarray(getattr(self.data, 'value', self.data))
+
+            # Grid interpolation requires increasing coordinates
+            for axis, point in enumerate(points):
+                if len(point) > 1 and point[0] > point[-1]:
+                    points[axis] = point[::-1]
+                    slices = [slice(None)] * values.ndim
+                    slices[axis] = slice(None, None, -1)
+                    values = values[tuple(slices)]
+
+            self._interpolate_cache[key] = RegularGridInterpolator(points, values,
+                                                                   **interp_kwargs)
+        return self._interpolate_cache[key]
+
+    def evaluate_at_coord(self, energy, coordx, coordy, interp_kwargs=None):
+        """Interpolate the cube at given coordinates.
+
+        ``energy``, ``coordx`` and ``coordy`` are broadcast against each other
+        and the output has the broadcast shape, e.g. to evaluate a background
+        model at the (energy, DETX, DETY) coordinates of all events, or at all
+        pixels of an image, in one call. The interpolator is cached, so
+        repeated calls are cheap.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy values
+        coordx, coordy : `~astropy.coordinates.Angle`
+            X and Y coordinate values
+        interp_kwargs : dict
+            option for interpolation for `~scipy.interpolate.RegularGridInterpolator`
+
+        Returns
+        -------
+        values : `~astropy.units.Quantity`
+            Interpolated values
+        """
+        energy = Energy(energy).to(self.energy_edges.unit)
+        coordx = Angle(coordx).to('deg')
+        coordy = Angle(coordy).to('deg')
+        energy, coordy, coordx = np.broadcast_arrays(energy.value, coordy.value, coordx.value)
+
+        pix_coords = np.column_stack([energy.ravel(), coordy.ravel(), coordx.ravel()])
+        values = self._interpolate(interp_kwargs)(pix_coords)
+        unit = getattr(self.data, 'unit', '')
+        return Quantity(values.reshape(energy.shape), unit)
+
     @property
     def scheme_dict(self):
         """Naming scheme, depending on the kind of cube (dict)"""
@@ -37,6 +37,33 @@ class EnergyOffsetArray(object):
         else:
             self.data = Quantity(data, data_units)
 
+    @property
+    def data(self):
+        """Data array (2D `~astropy.units.Quantity`)"""
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._interpolate_cache = dict()
+
+    def _interpolate(self, interp_kwargs=None):
+        """Interpolated data (`~scipy.interpolate.RegularGridInterpolator`).
+
+        The interpolator is cached for each set of ``interp_kwargs`` and
+        re-created when the data are set or filled.
+        """
+        if not interp_kwargs:
+            interp_kwargs = dict(bounds_error=False, fill_value=None)
+
+        key = tuple(sorted(interp_kwargs.items()))
+        if key not in self._interpolate_cache:
+            from scipy.interpolate import RegularGridInterpolator
+            points = (self.energy.log_centers.value, self.offset_bin_center.value)
+            self._interpolate_cache[key] = RegularGridInterpolator(points, self.data.value,
+                                                                   **interp_kwargs)
+        return self._interpolate_cache[key]
+
     def fill_events(self, event_lists):
         """Fill events histogram.
 
@@ -177,6 +204,10 @@ class EnergyOffsetArray(object):
                  interp_kwargs=None):
         """Interpolate the value of the `EnergyOffsetArray` at a given offset and Energy.
 
+        The array is evaluated on the grid of all ``energy`` and ``offset``
+        combinations, use `evaluate_at_coord` to evaluate at given pairs of
+        energy and offset.
+
         Parameters
         ----------
         energy : `~astropy.units.Quantity`
@@ -191,28 +222,45 @@ class EnergyOffsetArray(object):
         values : `~astropy.units.Quantity`
             Interpolated value
         """
-        if not interp_kwargs:
-            interp_kwargs = dict(bounds_error=False, fill_value=None)
-
-        from scipy.interpolate import RegularGridInterpolator
         if energy is None:
             energy = self.energy.log_centers
         if offset is None:
             offset = self.offset_bin_center
 
-        energy = Energy(energy).to('TeV')
-        offset = Angle(offset).to('deg')
+        energy = Energy(energy).flatten()
+        offset = Angle(offset).flatten()
+        return self.evaluate_at_coord(energy[:, np.newaxis], offset[np.newaxis, :],
+                                      interp_kwargs)
 
-        energy_bin = self.energy.log_centers
-        offset_bin = self.offset_bin_center
-        points = (energy_bin, offset_bin)
-        interpolator = RegularGridInterpolator(points, self.data.value, **interp_kwargs)
-        ee, off = np.meshgrid(energy.value, offset.value, indexing='ij')
-        shape = ee.shape
-        pix_coords = np.column_stack([ee.flat, off.flat])
+    def evaluate_at_coord(self, energy, offset, interp_kwargs=None):
+        """Interpolate the value of the `EnergyOffsetArray` at given coordinates.
 
-        data_interp = interpolator(pix_coords)
-        return Quantity(data_interp.reshape(shape), self.data.unit)
+        ``energy`` and ``offset`` are broadcast against each other and the
+        output has the broadcast shape, e.g. to evaluate the background rate
+        at the positions of all events or all pixels of an image in one call.
+        The interpolator is cached, so repeated calls are cheap.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy values
+        offset : `~astropy.coordinates.Angle`
+            Offset values
+        interp_kwargs : dict
+            option for interpolation for `~scipy.interpolate.RegularGridInterpolator`
+
+        Returns
+        -------
+        values : `~astropy.units.Quantity`
+            Interpolated values
+        """
+        energy = Energy(energy).to(self.energy.unit)
+        offset = Angle(offset).to('deg')
+        energy, offset = np.broadcast_arrays(energy.value, offset.value)
+
+        pix_coords = np.column_stack([energy.ravel(), offset.ravel()])
+        values = self._interpolate(interp_kwargs)(pix_coords)
+        return Quantity(values.reshape(energy.shape), self.data.unit)
 
     @property
     def offset_bin_center(self):
@@ -346,13 +394,9 @@ class EnergyOffsetArray(object):
         coordy_center = (coordy_edges[:-1] + coordy_edges[1:]) / 2.
 
         xx, yy = np.meshgrid(coordx_center, coordy_center)
-        dist = np.sqrt(xx ** 2 + yy ** 2)
-        shape = np.shape(dist)
-        data = self.evaluate(energy_edges.log_centers, dist.flat, interp_kwargs)
-
-        data_reshape = np.zeros((len(energy_edges) - 1,
-                                 len(coordy_edges) - 1,
-                                 len(coordx_edges) - 1))
-        for i in range(len(energy_edges.log_centers)):
-            data_reshape[i, :, :] = np.reshape(data[i, :], shape)
-        return Cube(coordx_edges, coordy_edges, energy_edges, data_reshape)
+        dist = Angle(np.sqrt(xx ** 2 + yy ** 2))
+        energy = EnergyBounds(energy_edges).log_centers
+
+        data = self.evaluate_at_coord(energy[:, np.newaxis, np.newaxis],
+                                      dist[np.newaxis, :, :], interp_kwargs)
+        return Cube(coordx_edges, coordy_edges, energy_edges, data.value)
@@ -3,7 +3,8 @@
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
-from astropy.coordinates import Angle, SkyCoord
+from astropy.coordinates import Angle
+from astropy.coordinates.angle_utilities import angular_separation, position_angle
 from astropy.io import fits
 from astropy.modeling.models import Gaussian1D
 from astropy.table import Table
@@ -22,58 +23,15 @@ __all__ = [
 DEFAULT_SPLINE_KWARGS = dict(k=1, s=0)
 
 
-def _add_column_and_sort_table(sources, pointing_position):
-    """Sort the table and add the column separation (offset from the source) and phi (position angle from the source)
+def _compute_pie_exclusion(sources, events, pointing_position, fov_radius):
+    """Event mask and excluded fraction for pies around all sources in the FoV.
 
-    Parameters
-    ----------
-    sources : `~astropy.table.Table`
-            Table of excluded sources.
-    pointing_position : `~astropy.coordinates.SkyCoord`
-            Coordinates of the pointing position
-
-    Returns
-    -------
-    sources : `~astropy.table.Table`
-        given sources table sorted with extra column "separation" and "phi"
-    """
-    sources = sources.copy()
-    source_pos = SkyCoord(sources["RA"], sources["DEC"], unit="deg")
-    sources["separation"] = pointing_position.separation(source_pos)
-    sources["phi"] = pointing_position.position_angle(source_pos)
-    sources.sort("separation")
-    return sources
-
-
-def _compute_pie_fraction(sources, pointing_position, fov_radius):
-    """Compute the fraction of the pie over a circle.
-
-    Parameters
-    ----------
-    sources : `~astropy.table.Table`
-        Table of excluded sources.
-        Required columns: RA, DEC, Radius
-    pointing_position : `~astropy.coordinates.SkyCoord`
-        Coordinates of the pointing position
-    fov_radius : `~astropy.coordinates.Angle`
-        Field of view radius
-
-    Returns
-    -------
-    pie fraction : float
-        If 0: nothing is excluded
-    """
-    sources = _add_column_and_sort_table(sources, pointing_position)
-    radius = Angle(sources["Radius"])[0]
-    separation = Angle(sources["separation"])[0]
-    if separation > fov_radius:
-        return 0
-    else:
-        return (2 * np.arctan(radius / separation) / (2 * np.pi)).value
-
-
-def _select_events_outside_pie(sources, events, pointing_position, fov_radius):
-    """The index table of the events outside the pie.
+    A pie is excluded for every source within ``fov_radius`` of the pointing
+    position. Sources are pre-filtered
+    on their separation to the pointing position, then the position angles of
+    all events are compared to all remaining pies at once. The excluded
+    fraction is computed from the union of the pies, so overlapping pies are
+    not counted twice.
 
     Parameters
     ----------
@@ -89,26 +47,51 @@ def _select_events_outside_pie(sources, events, pointing_position, fov_radius):
 
     Returns
     -------
-    idx : `~numpy.array`
-        coord of the events that are outside the pie
+    mask : `~numpy.ndarray`
+        Boolean mask, ``True`` for events outside all pies
+    pie_fraction : float
+        Excluded fraction of the field of view. If 0: nothing is excluded
     """
-    sources = _add_column_and_sort_table(sources, pointing_position)
-    radius = Angle(sources["Radius"])[0]
-    phi = Angle(sources["phi"])[0]
-    separation = Angle(sources["separation"])[0]
-    if separation > fov_radius:
-        return np.arange(len(events))
-    else:
-        phi_min = phi - np.arctan(radius / separation)
-        phi_max = phi + np.arctan(radius / separation)
-        phi_events = pointing_position.position_angle(events.radec)
-        if phi_max.degree > 360:
-            phi_max = phi_max - Angle(360, "deg")
-            idx = np.where((phi_events > phi_max) & (phi_events < phi_min))
-        else:
-            idx = np.where((phi_events > phi_max) | (phi_events < phi_min))
-
-        return idx[0]
+    pointing_position = pointing_position.icrs
+    lon_pnt, lat_pnt = pointing_position.ra.radian, pointing_position.dec.radian
+
+    lon_src = Angle(sources['RA'], 'deg').radian
+    lat_src = Angle(sources['DEC'], 'deg').radian
+    radius_src = Angle(sources['Radius'], 'deg').radian
+
+    # Spatial pre-filter: only sources within the FoV are excluded
+    separation = np.asarray(angular_separation(lon_pnt, lat_pnt, lon_src, lat_src))
+    in_fov = separation <= Angle(fov_radius).radian
+    if not in_fov.any():
+        return np.ones(len(events), dtype=bool), 0
+
+    separation = separation[in_fov]
+    phi_src = Angle(position_angle(lon_pnt, lat_pnt, lon_src[in_fov], lat_src[in_fov])).radian
+    with np.errstate(divide='ignore'):
+        half_width = np.arctan(radius_src[in_fov] / separation)
+
+    # Position angles of all events, compared with all pies at once
+    lon_events = Angle(events['RA'], 'deg').radian
+    lat_events = Angle(events['DEC'], 'deg').radian
+    phi_events = Angle(position_angle(lon_pnt, lat_pnt, lon_events, lat_events)).radian
+    dphi = phi_events[:, np.newaxis] - phi_src[np.newaxis, :]
+    dphi = (dphi + np.pi) % (2 * np.pi) - np.pi
+    mask = ~(np.abs(dphi) <= half_width).any(axis=1)
+
+    # Length of the union of the pie intervals on the circle
+    two_pi = 2 * np.pi
+    lo = (phi_src - half_width) % two_pi
+    hi = lo + 2 * half_width
+    wrap = hi > two_pi
+    starts = np.concatenate([lo, np.zeros(wrap.sum())])
+    ends = np.concatenate([np.minimum(hi, two_pi), hi[wrap] - two_pi])
+    order = np.argsort(starts)
+    starts, ends = starts[order], ends[order]
+    previous_end = np.concatenate([[0], np.maximum.accumulate(ends)[:-1]])
+    covered = np.clip(ends - np.maximum(starts, previous_end), 0, None).sum()
+    pie_fraction = min(covered / two_pi, 1)
+
+    return mask, pie_fraction
 
 
 def _poisson_gauss_smooth(counts, bkg):
@@ -659,6 +642,8 @@ class EnergyOffsetBackgroundModel(object):
         excluded_sources : `~astropy.table.Table`
             Table of excluded sources.
             Required columns: RA, DEC, Radius
+            For each observation, a pie is excluded for every source within
+            ``fov_radius`` of the pointing position.
         fov_radius : `~astropy.coordinates.Angle`
             Field of view radius
         """
@@ -667,9 +652,9 @@ class EnergyOffsetBackgroundModel(object):
             events = obs.events
 
             if excluded_sources:
-                pie_fraction = _compute_pie_fraction(excluded_sources, events.pointing_radec, fov_radius)
-                idx = _select_events_outside_pie(excluded_sources, events, events.pointing_radec, fov_radius)
-                events = events[idx]
+                mask, pie_fraction = _compute_pie_exclusion(excluded_sources, events,
+                                                            events.pointing_radec, fov_radius)
+                events = events[mask]
             else:
                 pie_fraction = 0
 
@@ -7,6 +7,7 @@ from ..image import ring_correlate
 
 __all__ = [
     'ring_correlate_off_maps',
+    'adaptive_ring_correlate_off_maps',
     'RingBgMaker',
     'ring_r_out',
     'ring_area_factor',
@@ -31,14 +32,17 @@ class RingBgMaker(object):
         Outer ring radius (deg)
     pixscale : float
         degrees per pixel
+    method : {'auto', 'direct', 'fft'}
+        Correlation method, see `~gammapy.image.ring_correlate`.
     """
 
-    def __init__(self, r_in, r_out, pixscale=0.01):
+    def __init__(self, r_in, r_out, pixscale=0.01, method='auto'):
         self.pixscale = float(pixscale)
         # Note: internally all computations are in pixels,
         # so convert deg to pix here:
         self.r_in = r_in / self.pixscale
         self.r_out = r_out / self.pixscale
+        self.method = method
 
     def info(self):
         """Print some basic parameter info."""
@@ -50,9 +54,19 @@ class RingBgMaker(object):
         print('pixscale: {0} deg/pix'.format(self.pixscale))
         print()
 
-    def correlate(self, image):
-        """Ring-correlate a given image."""
-        return ring_correlate(image, self.r_in, self.r_out)
+    def correlate(self, image, r_in=None, r_out=None):
+        """Ring-correlate a given image.
+
+        Parameters
+        ----------
+        image : `~numpy.ndarray`
+            Image to be correlated.
+        r_in, r_out : float, optional
+            Ring radii (pix), by default the radii of the ring maker are used.
+        """
+        r_in = self.r_in if r_in is None else r_in
+        r_out = self.r_out if r_out is None else r_out
+        return ring_correlate(image, r_in, r_out, method=self.method)
 
     def correlate_maps(self, maps):
         """Compute off maps as ring-correlated versions of the on maps.
@@ -73,8 +87,76 @@ class RingBgMaker(object):
         maps['a_off'] = self.correlate(a_on.data * exclusion.data)
         maps.is_off_correlated = True
 
+    def correlate_maps_adaptive(self, maps, r_out_max, stepsize, alpha_max=0.1):
+        """Compute off maps with an adaptive ring.
+
+        Starting from the ring of this ring maker, the ring is moved outwards
+        in steps of ``stepsize`` (keeping the width fixed), until for every
+        pixel the ratio ``alpha = a_on / a_off`` falls below ``alpha_max``,
+        or the outer radius reaches ``r_out_max``. For each pixel the off
+        counts and acceptance of the first ring fulfilling the condition
+        are used (the largest ring for pixels never fulfilling it).
+
+        The exclusion map is taken into account. Each ring step costs one
+        correlation of the ``n_on`` and ``a_on`` maps, so with the FFT
+        correlation method the cost doesn't grow with the ring radius.
+
+        Parameters
+        ----------
+        maps : gammapy.data.maps.MapsBunch
+            Input maps (is modified in-place)
+        r_out_max : float
+            Maximum outer ring radius (deg)
+        stepsize : float
+            Step size for the ring radii (deg)
+        alpha_max : float
+            Maximum accepted ``alpha`` value.
+        """
+        r_out_max = r_out_max / self.pixscale
+        stepsize = stepsize / self.pixscale
+        n_steps = int(np.floor((r_out_max - self.r_out) / stepsize + 1e-6)) + 1
+        n_steps = max(n_steps, 1)
+
+        exclusion = maps['exclusion'].data
+        n_on_excluded = maps['n_on'].data * exclusion
+        a_on = maps['a_on'].data
+        a_on_excluded = a_on * exclusion
+
+        n_off = np.zeros(a_on.shape)
+        a_off = np.zeros(a_on.shape)
+        r_in_map = np.zeros(a_on.shape)
+        done = np.zeros(a_on.shape, dtype=bool)
+
+        for step in range(n_steps):
+            r_in = self.r_in + step * stepsize
+            r_out = self.r_out + step * stepsize
+            a_off_ring = self.correlate(a_on_excluded, r_in, r_out)
+
+            if step == n_steps - 1:
+                select = ~done
+            else:
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    alpha = a_on / a_off_ring
+                select = ~done & (a_off_ring > 0) & (alpha <= alpha_max)
+                if not select.any():
+                    continue
+
+            n_off_ring = self.correlate(n_on_excluded, r_in, r_out)
+            n_off[select] = n_off_ring[select]
+            a_off[select] = a_off_ring[select]
+            r_in_map[select] = r_in * self.pixscale
+            done |= select
 
-def ring_correlate_off_maps(maps, r_in, r_out):
+            if done.all():
+                break
+
+        maps['n_off'] = n_off
+        maps['a_off'] = a_off
+        maps['r_in'] = r_in_map
+        maps.is_off_correlated = True
+
+
+def ring_correlate_off_maps(maps, r_in, r_out, method='auto'):
     """Ring-correlate the basic off maps.
 
     Parameters
@@ -85,12 +167,42 @@ def ring_correlate_off_maps(maps, r_in, r_out):
         Inner ring radius (deg)
     r_out : float
         Outer ring radius (deg)
+    method : {'auto', 'direct', 'fft'}
+        Correlation method, see `~gammapy.image.ring_correlate`.
     """
     pixscale = maps['n_on'].header['CDELT2']
-    ring_bg_maker = RingBgMaker(r_in, r_out, pixscale)
+    ring_bg_maker = RingBgMaker(r_in, r_out, pixscale, method=method)
     return ring_bg_maker.correlate_maps(maps)
 
 
+def adaptive_ring_correlate_off_maps(maps, r_in, r_out, r_out_max, stepsize,
+                                     alpha_max=0.1, method='auto'):
+    """Ring-correlate the basic off maps with an adaptive ring.
+
+    See `RingBgMaker.correlate_maps_adaptive` for details.
+
+    Parameters
+    ----------
+    maps : gammapy.data.maps.MapsBunch
+        Maps container
+    r_in : float
+        Inner radius of the smallest ring (deg)
+    r_out : float
+        Outer radius of the smallest ring (deg)
+    r_out_max : float
+        Maximum outer ring radius (deg)
+    stepsize : float
+        Step size for the ring radii (deg)
+    alpha_max : float
+        Maximum accepted ``alpha = a_on / a_off`` value.
+    method : {'auto', 'direct', 'fft'}
+        Correlation method, see `~gammapy.image.ring_correlate`.
+    """
+    pixscale = maps['n_on'].header['CDELT2']
+    ring_bg_maker = RingBgMaker(r_in, r_out, pixscale, method=method)
+    return ring_bg_maker.correlate_maps_adaptive(maps, r_out_max, stepsize, alpha_max)
+
+
 def ring_r_out(theta, r_in, area_factor):
     """Compute ring outer radius.
 
@@ -0,0 +1,58 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
+from astropy.tests.helper import pytest
+from astropy.coordinates import SkyCoord, Angle
+from regions import CircleSkyRegion
+from ...data import EventList
+from ...utils.testing import requires_dependency
+from ..background_estimate import (
+    ring_background_estimate,
+    reflected_regions_background_estimate,
+    multi_target_background_estimate,
+)
+
+
+def make_test_events(n_events=10000, seed=0):
+    random_state = np.random.RandomState(seed)
+    events = EventList()
+    events['RA'] = random_state.uniform(81, 86, n_events)
+    events['DEC'] = random_state.uniform(20, 24, n_events)
+    return events
+
+
+@requires_dependency('scipy')
+def test_multi_target_background_estimate():
+    events = make_test_events()
+    positions = SkyCoord([83, 84.5], [21.5, 22.5], unit='deg')
+    pointing = SkyCoord(83.6, 22.0, unit='deg')
+    on_radius = Angle(0.2, 'deg')
+    inner_radius, outer_radius = Angle(0.5, 'deg'), Angle(0.8, 'deg')
+
+    table = multi_target_background_estimate(
+        positions, on_radius, events, method=['ring', 'reflected'],
+        inner_radius=inner_radius, outer_radius=outer_radius,
+        pointing=pointing, return_indices=True,
+    )
+    assert len(table) == 4
+    assert_equal(table['method'], ['ring', 'reflected', 'ring', 'reflected'])
+
+    for row in table:
+        position = positions[row['target_idx']]
+        on_region = CircleSkyRegion(position, on_radius)
+        assert row['n_on'] == len(events.select_circular_region(on_region))
+
+        if row['method'] == 'ring':
+            desired = ring_background_estimate(position, on_radius, inner_radius,
+                                               outer_radius, events)
+        else:
+            desired = reflected_regions_background_estimate(on_region, pointing,
+                                                            None, events)
+        assert row['n_off'] == len(desired.off_events)
+        assert_equal(events[row['off_idx']]['RA'], desired.off_events['RA'])
+        assert_allclose(row['a_off'], desired.a_off)
+        assert_allclose(row['alpha'], desired.a_on / desired.a_off)
+
+    with pytest.raises(ValueError):
+        multi_target_background_estimate(positions, on_radius, events, method='spam')
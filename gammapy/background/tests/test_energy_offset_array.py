@@ -6,6 +6,7 @@ import astropy.units as u
 from astropy.tests.helper import assert_quantity_allclose
 from astropy.table import Table
 from astropy.coordinates import Angle
+from astropy.units import Quantity
 from ...data import DataStore
 from ...datasets import gammapy_extra
 from ...utils.testing import requires_dependency, requires_data
@@ -172,3 +173,50 @@ def test_to_cube():
     xx, yy = np.meshgrid(x, y)
     dist = np.sqrt(xx ** 2 + yy ** 2)
     assert_quantity_allclose(dist[i], 0.6 * u.deg, atol=0.1 * u.deg)
+
+
+@requires_dependency('scipy')
+def test_evaluate_at_coord():
+    array = make_test_array()
+    random_state = np.random.RandomState(seed=0)
+    array.data = random_state.uniform(size=array.data.shape) * u.Unit('s-1 MeV-1 sr-1')
+
+    energy = Energy([0.3, 2, 7, 30], 'TeV')
+    offset = Angle([0.1, 0.5, 1.2, 2.0], 'deg')
+    actual = array.evaluate_at_coord(energy, offset)
+    desired = array.evaluate(energy, offset).diagonal()
+    assert_quantity_allclose(actual, desired)
+
+    # Broadcasting and unit handling
+    actual = array.evaluate_at_coord(energy.to('GeV')[:, np.newaxis], offset)
+    desired = array.evaluate(energy, offset)
+    assert_quantity_allclose(actual, desired)
+
+    # The cached interpolator is reset when the data change
+    array.data *= 2
+    actual = array.evaluate_at_coord(energy, offset)
+    assert_quantity_allclose(actual, 2 * desired.diagonal())
+
+    cube = array.to_cube()
+    cube_values = cube.evaluate_at_coord(energy[1], Angle(0.3, 'deg'), Angle(0.4, 'deg'))
+    desired = array.evaluate_at_coord(energy[1], Angle(0.5, 'deg'))
+    assert_quantity_allclose(cube_values.value, desired.value, rtol=1e-2)
+
+
+@requires_dependency('scipy')
+def test_cube_evaluate_at_coord():
+    cube = make_empty_cube()
+    energy = cube.energy_edges.log_centers
+    coordx, coordy = cube.image_bin_centers
+    ee, yy, xx = np.meshgrid(energy.value, coordy.value, coordx.value, indexing='ij')
+    cube.data = Quantity(ee + 2 * yy + 3 * xx, 's-1')
+
+    energy = Energy([1, 2, 3], 'TeV')
+    coordx = Angle([0.1, 0.2, 0.3], 'deg')
+    coordy = Angle([0.5, 0.4, 0.3], 'deg')
+    actual = cube.evaluate_at_coord(energy, coordx, coordy)
+    desired = Quantity([2.3, 3.4, 4.5], 's-1')
+    assert_quantity_allclose(actual, desired)
+
+    actual = cube.evaluate_at_coord(energy[:, np.newaxis], coordx, coordy)
+    assert actual.shape == (3, 3)
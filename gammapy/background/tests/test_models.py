@@ -15,7 +15,7 @@ from ...background import GaussianBand2D, CubeBackgroundModel, EnergyOffsetBackg
 from ...utils.energy import EnergyBounds
 from ...data import ObservationTable
 from ...data import DataStore, EventList
-from ...background.models import _compute_pie_fraction, _select_events_outside_pie
+from ...background.models import _compute_pie_exclusion
 
 
 @requires_dependency('scipy')
@@ -170,47 +170,44 @@ def make_source_nextCrab():
     return catalog
 
 
-def test_compute_pie_fraction():
+def test_compute_pie_exclusion():
     excluded_sources = make_excluded_sources()
     pointing_position = SkyCoord(0.5, 0.5, unit='deg')
-
-    # Test that if the sources are out of the fov, it gives a pie_fraction equal to zero
-    pie_fraction = _compute_pie_fraction(excluded_sources, pointing_position, Angle(0.3, "deg"))
-    assert_allclose(pie_fraction, 0)
-
-    # I have to use an other object excluded_region because the previous one was
-    # already sorted in the compute_pie_fraction
-    excluded_sources2 = make_excluded_sources()
-    source_closest = SkyCoord(excluded_sources2["RA"][1], excluded_sources2["DEC"][1], unit="deg")
-    separation = pointing_position.separation(source_closest).value
-    pie_fraction = _compute_pie_fraction(excluded_sources, pointing_position, Angle(5, "deg"))
-    pie_fraction_expected = (2 * np.arctan(excluded_sources2["Radius"][1] / separation) / (2 * np.pi))
-    assert_allclose(pie_fraction, pie_fraction_expected)
-
-
-def test_select_events_outside_pie():
-    """
-    Create an empty image centered on the pointing position and all the radec position of the pixels will
-    define one event. Thus we create a false EventList with these pixels. We apply the select_events_outside_pie()
-    and we fill the image only with the events (pixels) outside the pie. We assert that outside the pie the image is
-    fill with 1 and inside with 0.
-    """
-    excluded_sources = make_excluded_sources()
-
-    pointing_position = SkyCoord(0.5, 0.5, unit='deg')
-
-    # Create fake EventList with the radec of all the pixel in the empty image
     events = EventList()
     events["RA"] = [0.25, 0.02, 359.3, 1.04, 1.23, 359.56, 359.48]
     events["DEC"] = [0.72, 0.96, 1.71, 1.05, 0.19, 2.01, 0.24]
 
-    # Test that if the sources are out of the fov, it gives the index for all the events since no event will be removed
-    idx = _select_events_outside_pie(excluded_sources, events, pointing_position, Angle(0.3, "deg"))
-    assert_allclose(np.arange(len(events)), idx)
+    # No source in the FoV
+    mask, pie_fraction = _compute_pie_exclusion(excluded_sources, events,
+                                                pointing_position, Angle(0.3, "deg"))
+    assert mask.all()
+    assert_allclose(pie_fraction, 0)
 
-    # Test if after calling the select_events_outside_pie, the image is 0 inside the pie and 1 outside the pie
-    idx = _select_events_outside_pie(excluded_sources, events, pointing_position, Angle(5, "deg"))
-    assert_allclose(idx, [3, 4, 6])
+    # Only the closest source in the FoV
+    mask, pie_fraction = _compute_pie_exclusion(excluded_sources, events,
+                                                pointing_position, Angle(1, "deg"))
+    assert_allclose(np.where(mask)[0], [3, 4, 6])
+    source = SkyCoord(excluded_sources["RA"][1], excluded_sources["DEC"][1], unit="deg")
+    separation = pointing_position.separation(source).deg
+    desired = 2 * np.arctan(excluded_sources["Radius"][1] / separation) / (2 * np.pi)
+    assert_allclose(pie_fraction, desired)
+    assert_allclose(pie_fraction, 0.12772601631509242)
+
+    # Both sources in the FoV: the pies don't overlap, so the fractions add up
+    mask, pie_fraction = _compute_pie_exclusion(excluded_sources, events,
+                                                pointing_position, Angle(5, "deg"))
+    assert_allclose(np.where(mask)[0], [3, 4, 6])
+    assert_allclose(pie_fraction, 0.05968713051974974 + 0.12772601631509242)
+
+    # Overlapping pies are counted only once
+    excluded_sources = make_excluded_sources()
+    excluded_sources['RA'] = [0.5, 0.5] * u.deg
+    excluded_sources['DEC'] = [1, 2] * u.deg
+    mask, pie_fraction = _compute_pie_exclusion(excluded_sources, events,
+                                                pointing_position, Angle(5, "deg"))
+    _, desired = _compute_pie_exclusion(excluded_sources[[0]], events,
+                                        pointing_position, Angle(5, "deg"))
+    assert_allclose(pie_fraction, desired)
 
 
 @requires_data('gammapy-extra')
@@ -247,11 +244,12 @@ class TestEnergyOffsetBackgroundModel:
 
         # Test if the livetime array where we apply the pie is less by the factor pie_fraction of the livetime
         # array where we don't apply the pie
-        pie_fraction = _compute_pie_fraction(excluded_sources, events.pointing_radec, Angle(5, "deg"))
+        mask, pie_fraction = _compute_pie_exclusion(excluded_sources, events,
+                                                    events.pointing_radec, Angle(2.5, "deg"))
         assert_allclose(multi_array1.livetime.data, multi_array2.livetime.data * (1 - pie_fraction))
 
         # Test if the total counts array where we apply the pie is equal to the number of events outside the pie
-        idx = _select_events_outside_pie(excluded_sources, events, events.pointing_radec, Angle(5, "deg"))
+        idx = np.where(mask)[0]
         offmax = multi_array1.counts.offset.max()
 
         # This is important since in the counts array the events > offsetmax will not be in the histogram.
@@ -31,6 +31,25 @@ class TestRingBgMaker:
         r = RingBgMaker(10, 13, 1)
         r.correlate_maps(maps)
 
+    def test_correlate_maps_adaptive(self):
+        n_on = np.ones((200, 200))
+        maps = SkyImageCollection()
+        maps['n_on'] = n_on
+        maps['a_on'] = n_on
+        exclusion = np.ones((200, 200))
+        exclusion[80:120, 80:120] = 0
+        maps['exclusion'] = exclusion
+        r = RingBgMaker(10, 13, 1, method='fft')
+        r.correlate_maps_adaptive(maps, r_out_max=40, stepsize=5, alpha_max=0.01)
+
+        # Far from the exclusion region the smallest ring is used
+        assert_allclose(maps['r_in'].data[20, 20], 10)
+        assert_allclose(maps['n_off'].data[20, 20], maps['a_off'].data[20, 20])
+        # In the exclusion region center the ring is grown
+        assert maps['r_in'].data[100, 100] > 10
+        alpha = maps['a_on'].data[100, 100] / maps['a_off'].data[100, 100]
+        assert alpha <= 0.01
+
 
 def test_ring_r_out():
     actual = ring_r_out(1, 0, 1)
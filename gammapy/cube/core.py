@@ -9,6 +9,7 @@ TODO: split `SkyCube` into a base class ``SkyCube`` and a few sub-classes:
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 from collections import OrderedDict
+from itertools import islice
 import numpy as np
 from astropy.io import fits
 import astropy.units as u
@@ -17,7 +18,10 @@ from astropy.table import Table
 from astropy.wcs import WCS
 from ..utils.energy import EnergyBounds
 from ..utils.fits import table_to_fits_table
+from ..utils.dtype import _float_dtype
 from ..image import SkyImage
+from ..image.core import _get_geometry
+from ..image.reprojection import ReprojectionPlan
 from ..image.utils import _bin_events_in_cube
 from ..spectrum import LogEnergyAxis
 from ..spectrum.powerlaw import power_law_I_from_points
@@ -168,18 +172,80 @@ class SkyCube(object):
             raise ValueError('Not a valid cube fits format')
         return cls(data=data, wcs=wcs, energy=energy, meta=meta)
 
-    def fill(self, events, origin=0):
+    def fill(self, events, origin=0, accumulate=False, parallel=False):
         """
         Fill sky cube with events.
 
+        The energy binning is given by ``energy``. If it is `None`, a single
+        energy bin containing all events is used.
+
+        Several event lists, e.g. from many observations or chunks of a large
+        event list, can be given as a list or any other iterable, for example
+        a generator that reads the events of one observation at a time. The
+        counts of all event lists are summed.
+
         Parameters
         ----------
-        events : `~astropy.table.Table`
-            Event list table
+        events : `~astropy.table.Table` or iterable of `~astropy.table.Table`
+            Event list table(s)
         origin : {0, 1}
             Pixel coordinate origin.
+        accumulate : bool
+            Add the counts to the existing cube data in place, instead of
+            replacing it. If the data shape doesn't match the counts cube
+            shape (e.g. for a cube created with `SkyCube.empty`, which
+            has one image per energy bound) it is reset to zero first.
+        parallel : bool
+            Bin the event lists in parallel on multiple cores and sum the
+            results as they arrive.
         """
-        self.data = _bin_events_in_cube(events, self.wcs, self.data.shape, self.energy, origin=origin)
+        if isinstance(events, Table):
+            events = [events]
+
+        # Binning is defined by the energy bounds, not the current data shape.
+        # Without energy bounds a single energy bin containing all events is used.
+        if self.energy is None:
+            shape = self.data.shape[-2:]
+            counts_shape = (1,) + shape
+        else:
+            shape = (len(self.energy),) + self.data.shape[-2:]
+            counts_shape = (len(self.energy) - 1,) + shape[1:]
+
+        tasks = ((_, self.wcs, shape, self.energy, origin) for _ in events)
+        counts = np.zeros(counts_shape)
+        if not parallel:
+            for task in tasks:
+                counts += _bin_events_worker(task)
+        else:
+            from multiprocessing import Pool, cpu_count
+            # Submit the event lists in bounded batches, so that a generator
+            # of event lists isn't read into memory all at once
+            batch_size = 2 * cpu_count()
+            pool = Pool()
+            try:
+                while True:
+                    batch = list(islice(tasks, batch_size))
+                    if not batch:
+                        break
+                    for result in pool.imap_unordered(_bin_events_worker, batch):
+                        counts += result
+            except BaseException:
+                pool.terminate()
+                raise
+            else:
+                pool.close()
+            finally:
+                pool.join()
+
+        data = self.data
+        if not accumulate or data.shape != counts.shape:
+            dtype = data.dtype if data.dtype.kind == 'f' else _float_dtype()
+            self.data = Quantity(np.zeros(counts.shape, dtype=dtype), 'count')
+            data = self.data
+
+        if isinstance(data, Quantity):
+            data = data.value
+        data += counts.astype(data.dtype, copy=False)
 
     @classmethod
     def empty(cls, emin=0.5, emax=100, enbins=10, eunit='TeV', **kwargs):
@@ -198,11 +264,11 @@ class SkyCube(object):
             Energy unit.
         kwargs : dict
             Keyword arguments passed to `~gammapy.image.SkyImage.empty` to create
-            the spatial part of the cube.
+            the spatial part of the cube, e.g. ``dtype``.
         """
         refmap = SkyImage.empty(**kwargs)
         energy = EnergyBounds.equal_log_spacing(emin, emax, enbins, eunit)
-        data = refmap.data * np.ones(len(energy)).reshape((-1, 1, 1))
+        data = refmap.data * np.ones(len(energy), dtype=refmap.data.dtype).reshape((-1, 1, 1))
         return cls(data=data, wcs=refmap.wcs, energy=energy)
 
     @classmethod
@@ -290,9 +356,7 @@ class SkyCube(object):
         coordinates : `~astropy.coordinates.SkyCoord`
             Position on the sky.
         """
-        image = self.sky_image(0)
-        coordinates = image.coordinates(mode)
-        return coordinates
+        return _get_geometry(self.wcs, self.data.shape[1:]).coordinates(mode)
 
     def to_sherpa_data3d(self):
         """
@@ -323,8 +387,7 @@ class SkyCube(object):
     @property
     def solid_angle(self):
         """Solid angle image in steradian (`~astropy.units.Quantity`)"""
-        image = self.sky_image(idx_energy=0)
-        return image.solid_angle()
+        return Quantity(_get_geometry(self.wcs, self.data.shape[1:]).solid_angle, 'sr')
 
     def sky_image(self, idx_energy, copy=True):
         """Slice a 2-dim `~gammapy.image.SkyImage` from the cube.
@@ -467,6 +530,9 @@ class SkyCube(object):
     def reproject_to(self, reference_cube, projection_type='bicubic'):
         """Spatially reprojects a `SkyCube` onto a reference cube.
 
+        The pixel mapping is computed once and applied to all energy slices,
+        see `~gammapy.image.ReprojectionPlan`.
+
         Parameters
         ----------
         reference_cube : `SkyCube`
@@ -480,8 +546,6 @@ class SkyCube(object):
         reprojected_cube : `SkyCube`
             Cube spatially reprojected to the reference cube.
         """
-        from reproject import reproject_interp
-
         reference = reference_cube.data
         shape_out = reference[0].shape
         try:
@@ -494,18 +558,15 @@ class SkyCube(object):
             wcs_out = reference_cube.wcs
         energy = self.energy
 
-        cube = self.data
-        new_cube = np.zeros((cube.shape[0], reference.shape[1],
-                             reference.shape[2]))
-        energy_slices = np.arange(cube.shape[0])
-        # TODO: Re-implement to reproject cubes directly without needing
-        # to loop over energies here. Errors with reproject when doing this
-        # first need to be understood and fixed.
-        for i in energy_slices:
-            array = cube[i]
-            data_in = (array.value, wcs_in)
-            new_cube[i] = reproject_interp(data_in, wcs_out, shape_out, order=projection_type)[0]
-        new_cube = Quantity(new_cube, array.unit)
+        if projection_type == 'flux-conserving':
+            plan = ReprojectionPlan.get(wcs_in, self.data.shape, wcs_out,
+                                        shape_out, mode='exact')
+        else:
+            plan = ReprojectionPlan.get(wcs_in, self.data.shape, wcs_out,
+                                        shape_out, order=projection_type)
+
+        new_cube = plan.apply(self.data.value)[0]
+        new_cube = Quantity(new_cube, self.data.unit)
         # Create new wcs
         header_in = self.wcs.to_header()
         header_out = reference_cube.wcs.to_header()
@@ -589,3 +650,13 @@ class SkyCube(object):
         Print summary info about the cube.
         """
         print(repr(self))
+
+
+def _bin_events_worker(args):
+    """Bin one event list for `SkyCube.fill`.
+
+    Module level function taking a single tuple argument, so that it can be
+    used with `multiprocessing.Pool`.
+    """
+    events, wcs, shape, energy, origin = args
+    return _bin_events_in_cube(events, wcs, shape, energy, origin=origin).value
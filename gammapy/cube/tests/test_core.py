@@ -306,3 +306,64 @@ def test_reproject_cube():
     actual = reprojected_cube.sum()
 
     assert_quantity_allclose(actual, expected, rtol=1e-2)
+
+
+def test_sky_cube_fill_chunks():
+    from astropy.coordinates import SkyCoord
+    from astropy.table import Table
+
+    np.random.seed(0)
+    n_events = 1000
+    energy = 10 ** np.random.uniform(0, 1, n_events)
+    glon = np.random.uniform(-3, 3, n_events)
+    glat = np.random.uniform(-2, 2, n_events)
+    radec = SkyCoord(glon, glat, unit='deg', frame='galactic').icrs
+    events = Table()
+    events['RA'] = radec.ra.deg
+    events['DEC'] = radec.dec.deg
+    events['ENERGY'] = energy
+
+    cube = SkyCube.empty(emin=1, emax=10, enbins=4, nxpix=30, nypix=20, binsz=0.2)
+    cube.fill(events)
+    expected = cube.data.value.copy()
+    assert expected.shape == (4, 20, 30)
+    assert expected.sum() == n_events
+    counts_energy, _ = np.histogram(events['ENERGY'], bins=cube.energy.value)
+    assert_allclose(expected.sum(axis=(1, 2)), counts_energy)
+    assert_allclose(counts_energy, [254, 263, 242, 241])
+
+    # Chunks given as a generator
+    chunks = (events[idx:idx + 300] for idx in range(0, n_events, 300))
+    cube.fill(chunks)
+    assert_allclose(cube.data.value, expected)
+
+    # Accumulate in place over several calls
+    cube.fill(events[:500])
+    cube.fill(events[500:], accumulate=True)
+    assert_allclose(cube.data.value, expected)
+
+    cube.fill([events[:500], events[500:]], parallel=True)
+    assert_allclose(cube.data.value, expected)
+
+    # Generator with more chunks than one batch of parallel tasks
+    chunks = (events[idx:idx + 10] for idx in range(0, n_events, 10))
+    cube.fill(chunks, parallel=True)
+    assert_allclose(cube.data.value, expected)
+
+    # Galactic coordinate columns give the same result
+    events['GLON'] = glon % 360
+    events['GLAT'] = glat
+    cube.fill(events)
+    assert_allclose(cube.data.value, expected)
+
+    # Without energy bounds a single energy bin is used
+    cube_no_energy = SkyCube(data=Quantity(np.zeros((1, 20, 30)), 'count'),
+                             wcs=cube.wcs, energy=None)
+    cube_no_energy.fill(events)
+    assert cube_no_energy.data.shape == (1, 20, 30)
+    assert_allclose(cube_no_energy.data.value[0], expected.sum(axis=0))
+
+    # The pool is closed if binning fails
+    del events['ENERGY']
+    with pytest.raises(KeyError):
+        cube.fill([events], parallel=True)
@@ -68,10 +68,13 @@ def compute_npred_cube(flux_cube, exposure_cube, energy_bins,
     return npred_cube
 
 
-def convolve_cube(cube, psf, offset_max):
+def convolve_cube(cube, psf, offset_max, cache_dir=None):
     """Convolves a predicted counts cube in energy bins with the an
     energy-dependent PSF.
 
+    The kernels are cached on the PSF object, see
+    `~gammapy.irf.EnergyDependentTablePSF.kernel`.
+
     Parameters
     ----------
     cube : `SkyCube`
@@ -80,6 +83,8 @@ def convolve_cube(cube, psf, offset_max):
         Energy dependent PSF.
     offset_max : `~astropy.units.Quantity`
         Maximum offset in degrees of the PSF convolution kernel from its center.
+    cache_dir : str, optional
+        Directory to store the kernels on disk.
 
     Returns
     -------
@@ -94,8 +99,8 @@ def convolve_cube(cube, psf, offset_max):
 
     for i in indices:
         energy_band = energy[i:i + 2]
-        psf_at_energy = psf.table_psf_in_energy_band(energy_band)
-        kernel_image = psf_at_energy.kernel(pixel_size, offset_max, normalize=True)
+        kernel_image = psf.kernel(energy_band, pixel_size, offset_max,
+                                  normalize=True, cache_dir=cache_dir)
         convolved_cube[i] = convolve(cube.data[i], kernel_image,
                                      mode='mirror')
     convolved_cube = SkyCube(data=convolved_cube, wcs=cube.wcs,
@@ -7,3 +7,4 @@ from .iterfind import *
 from .matched_filter import *
 from .test_statistics import *
 from .lima import *
+from .tiling import *
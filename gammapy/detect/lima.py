@@ -6,6 +6,7 @@ import logging
 import numpy as np
 from astropy.convolution import Tophat2DKernel
 
+from ..utils.dtype import _float_dtype
 from ..image import SkyImageCollection
 from ..stats import significance, significance_on_off
 
@@ -15,7 +16,7 @@ log = logging.getLogger(__name__)
 
 
 
-def compute_lima_map(counts, background, kernel, exposure=None):
+def compute_lima_map(counts, background, kernel, exposure=None, dtype=None):
     """
     Compute Li&Ma significance and flux maps for known background.
 
@@ -31,6 +32,9 @@ def compute_lima_map(counts, background, kernel, exposure=None):
         convolution kernel.
     exposure : `~numpy.ndarray`
         Exposure map
+    dtype : {'float32', 'float64'}, optional
+        Float data type used for the computation and the result maps.
+        Default is given by `~gammapy.utils.dtype.get_default_float_dtype`.
 
     Returns
     -------
@@ -50,27 +54,37 @@ def compute_lima_map(counts, background, kernel, exposure=None):
     if not kernel.is_bool:
         log.warn('Using weighted kernels can lead to biased results.')
 
+    dtype = _float_dtype(dtype)
+    counts = np.asarray(counts, dtype=dtype)
+    background = np.asarray(background, dtype=dtype)
+
     kernel.normalize('peak')
-    counts_ = convolve(counts, kernel.array, mode='constant', cval=np.nan)
-    background_ = convolve(background, kernel.array, mode='constant', cval=np.nan)
+    kernel_array = kernel.array.astype(dtype)
+    counts_ = convolve(counts, kernel_array, mode='constant', cval=np.nan)
+    background_ = convolve(background, kernel_array, mode='constant', cval=np.nan)
 
+    # The significance is computed in float64, because of the cancellation
+    # in the Li & Ma formula
     significance_lima = significance(counts_, background_, method='lima')
+    significance_lima = significance_lima.astype(dtype, copy=False)
 
+    excess = counts_ - background_
     result = SkyImageCollection(significance=significance_lima,
                                 counts=counts_,
                                 background=background_,
-                                excess= counts_ - background_)
+                                excess=excess)
 
     if not exposure is None:
+        exposure = np.asarray(exposure, dtype=dtype)
         kernel.normalize('integral')
-        exposure_ = convolve(exposure, kernel.array, mode='constant', cval=np.nan)
-        flux = (counts_ - background_) / exposure_
+        exposure_ = convolve(exposure, kernel.array.astype(dtype), mode='constant', cval=np.nan)
+        flux = np.divide(excess, exposure_, out=exposure_)
         result.flux = flux
 
     return result
 
 
-def compute_lima_on_off_map(n_on, n_off, a_on, a_off, kernel, exposure=None):
+def compute_lima_on_off_map(n_on, n_off, a_on, a_off, kernel, exposure=None, dtype=None):
     """
     Compute Li&Ma significance and flux maps for on-off observations.
 
@@ -88,6 +102,9 @@ def compute_lima_on_off_map(n_on, n_off, a_on, a_off, kernel, exposure=None):
         convolution kernel.
     exposure : `~numpy.ndarray`
         Exposure map.
+    dtype : {'float32', 'float64'}, optional
+        Float data type used for the computation and the result maps.
+        Default is given by `~gammapy.utils.dtype.get_default_float_dtype`.
 
     Returns
     -------
@@ -107,13 +124,21 @@ def compute_lima_on_off_map(n_on, n_off, a_on, a_off, kernel, exposure=None):
     if not kernel.is_bool:
         log.warn('Using weighted kernels can lead to biased results.')
 
+    dtype = _float_dtype(dtype)
+    n_on = np.asarray(n_on, dtype=dtype)
+    n_off = np.asarray(n_off, dtype=dtype)
+    a_on = np.asarray(a_on, dtype=dtype)
+    a_off = np.asarray(a_off, dtype=dtype)
+
     kernel.normalize('peak')
-    n_on_ = convolve(n_on, kernel.array, mode='constant', cval=np.nan)
-    a_ = convolve(a_on, kernel.array, mode='constant', cval=np.nan)
-    alpha = a_ / a_off
+    kernel_array = kernel.array.astype(dtype)
+    n_on_ = convolve(n_on, kernel_array, mode='constant', cval=np.nan)
+    a_ = convolve(a_on, kernel_array, mode='constant', cval=np.nan)
+    alpha = np.divide(a_, a_off, out=a_)
     background = alpha * n_off
 
     significance_lima = significance_on_off(n_on_, n_off, alpha, method='lima')
+    significance_lima = np.asarray(significance_lima).astype(dtype, copy=False)
 
     result = SkyImageCollection(significance=significance_lima,
                                 n_on=n_on_,
@@ -122,9 +147,10 @@ def compute_lima_on_off_map(n_on, n_off, a_on, a_off, kernel, exposure=None):
                                 alpha=alpha)
 
     if not exposure is None:
+        exposure = np.asarray(exposure, dtype=dtype)
         kernel.normalize('integral')
-        exposure_ = convolve(exposure, kernel.array, mode='constant', cval=np.nan)
-        flux = (n_on_ - background_) / exposure_
+        exposure_ = convolve(exposure, kernel.array.astype(dtype), mode='constant', cval=np.nan)
+        flux = np.divide(n_on_ - background, exposure_, out=exposure_)
         result.flux = flux
 
     return result
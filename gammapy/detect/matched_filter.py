@@ -2,7 +2,7 @@
 """Matched filter source detection methods"""
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
-from ..image import process_image_pixels
+from ..image.utils import _correlate
 from ..stats import probability_to_significance_normal
 
 __all__ = []
@@ -69,10 +69,33 @@ def probability_image(images, kernel):
     Returns
     -------
     probability : array
+
+    Notes
+    -----
+    This gives the same result as evaluating `probability_center` for every
+    pixel, with the kernel truncated at the image edges. The kernel weighted
+    sums are computed as correlations with zero padding, using FFTs for
+    large kernels.
     """
-    out = np.zeros_like(images['counts'], dtype='float64')
-    process_image_pixels(images, kernel, out, probability_center)
-    return out
+    from scipy.special import gammaincc as Q
+
+    C = np.asanyarray(images['counts'], dtype='float64')
+    B = np.asanyarray(images['background'], dtype='float64')
+    w = np.asanyarray(kernel, dtype='float64')
+
+    def correlate(image, weights):
+        # `_correlate` convolves, so flip the kernel to correlate
+        return _correlate(image, weights[::-1, ::-1], mode='constant', method='auto')
+
+    # Kernel normalisation for each pixel, accounting for the truncation
+    # of the kernel at the image edges
+    norm = correlate(np.ones_like(C), w)
+
+    U = correlate(C, w) / norm
+    B_prime = correlate(B, w) / norm
+    w_equiv = correlate(B, w * w) / norm ** 2 / B_prime
+    P = Q(B_prime / w_equiv, U / w_equiv)
+    return P
 
 
 def significance_image(images, kernel):
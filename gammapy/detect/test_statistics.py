@@ -20,6 +20,7 @@ from ..morphology import Shell2D
 from ..extern.bunch import Bunch
 from ..image import (measure_containment_radius, SkyImageCollection)
 from ..utils.array import shape_2N, symmetric_crop_pad_width
+from ..utils.dtype import _float_dtype
 
 __all__ = [
     'compute_ts_map',
@@ -228,10 +229,13 @@ def compute_maximum_ts_map(ts_map_results):
 
 def compute_ts_map(counts, background, exposure, kernel, mask=None, flux=None,
                    method='root brentq', optimizer='Brent', parallel=True,
-                   threshold=None):
+                   threshold=None, dtype=None):
     """
     Compute TS map using different optimization methods.
 
+    The fit itself is always done in float64 precision, ``dtype`` only
+    sets the data type of the result images.
+
     Parameters
     ----------
     counts : `~gammapy.image.SkyImage`
@@ -261,6 +265,9 @@ def compute_ts_map(counts, background, exposure, kernel, mask=None, flux=None,
     threshold : float (None)
         If the TS value corresponding to the initial flux estimate is not above
         this threshold, the optimizing step is omitted to save computing time.
+    dtype : {'float32', 'float64'}, optional
+        Float data type of the result images. Default is given by
+        `~gammapy.utils.dtype.get_default_float_dtype`.
 
     Returns
     -------
@@ -294,10 +301,10 @@ def compute_ts_map(counts, background, exposure, kernel, mask=None, flux=None,
 
     wcs = counts.wcs.deepcopy()
 
-    # Parse data type
-    counts = counts.data.astype(float)
-    background = background.data.astype(float)
-    exposure = exposure.data.astype(float)
+    # Parse data type, the input data is only copied if it isn't float64 already
+    counts = np.asarray(counts.data, dtype=float)
+    background = np.asarray(background.data, dtype=float)
+    exposure = np.asarray(exposure.data, dtype=float)
     assert counts.shape == background.shape
     assert counts.shape == exposure.shape
 
@@ -309,7 +316,7 @@ def compute_ts_map(counts, background, exposure, kernel, mask=None, flux=None,
         log.warning('There are pixels in the data, that have exposure, but '
                     'zero background, which can cause the ts computation to '
                     'fail. Setting exposure of this pixels to zero.')
-        exposure[mask_] = 0
+        exposure = np.where(mask_, 0, exposure)
 
     if (flux is None and method != 'root brentq') or threshold is not None:
         from scipy.signal import fftconvolve
@@ -342,23 +349,24 @@ def compute_ts_map(counts, background, exposure, kernel, mask=None, flux=None,
         pool.close()
         pool.join()
     else:
-        results = map(wrap, positions)
+        results = list(map(wrap, positions))
 
     assert positions, ("Positions are empty: possibly kernel " +
                        "{} is larger than counts {}".format(kernel.shape, counts.shape))
 
     # Set TS values at given positions
     j, i = zip(*positions)
-    ts = np.ones(counts.shape) * np.nan
-    amplitudes = np.ones(counts.shape) * np.nan
-    niter = np.ones(counts.shape) * np.nan
+    dtype = _float_dtype(dtype)
+    ts = np.full(counts.shape, np.nan, dtype=dtype)
+    amplitudes = np.full(counts.shape, np.nan, dtype=dtype)
+    niter = np.full(counts.shape, np.nan, dtype=dtype)
     ts[j, i] = [_[0] for _ in results]
     amplitudes[j, i] = [_[1] for _ in results]
     niter[j, i] = [_[2] for _ in results]
 
     # Handle negative TS values
     with np.errstate(invalid='ignore', divide='ignore'):
-        sqrt_ts = np.where(ts > 0, np.sqrt(ts), -np.sqrt(-ts))
+        sqrt_ts = np.where(ts > 0, np.sqrt(ts), -np.sqrt(-ts)).astype(dtype, copy=False)
 
     return SkyImageCollection(ts=ts, sqrt_ts=sqrt_ts, amplitude=amplitudes, wcs=wcs,
                               niter=niter, meta={'runtime': np.round(time() - t_0, 2)})
@@ -59,3 +59,30 @@ def test_compute_lima_on_off_map():
     # Set boundary to NaN in reference image
     maps.significance.data[np.isnan(result_lima.significance)] = np.nan
     assert_allclose(result_lima.significance, maps.significance, atol=1E-5)
+
+
+@requires_dependency('scipy')
+def test_compute_lima_map_float32():
+    np.random.seed(0)
+    background = 10 * np.ones((100, 100))
+    counts = np.random.poisson(background)
+    exposure = 1e10 * np.ones((100, 100))
+    kernel = Tophat2DKernel(5)
+
+    result_64 = compute_lima_map(counts, background, kernel, exposure, dtype='float64')
+    result_32 = compute_lima_map(counts, background, kernel, exposure, dtype='float32')
+
+    for name in ['significance', 'counts', 'background', 'excess', 'flux']:
+        assert result_32[name].data.dtype == np.float32
+        desired = result_64[name].data
+        assert_allclose(result_32[name].data, desired, rtol=1e-5, atol=1e-5 * np.nanmax(np.abs(desired)))
+
+    n_off = np.random.poisson(5 * background)
+    a_on, a_off = np.ones((100, 100)), 5 * np.ones((100, 100))
+    result_64 = compute_lima_on_off_map(counts, n_off, a_on, a_off, kernel, dtype='float64')
+    result_32 = compute_lima_on_off_map(counts, n_off, a_on, a_off, kernel, dtype='float32')
+
+    for name in ['significance', 'n_on', 'background', 'excess', 'alpha']:
+        assert result_32[name].data.dtype == np.float32
+        desired = result_64[name].data
+        assert_allclose(result_32[name].data, desired, rtol=1e-5, atol=1e-5 * np.nanmax(np.abs(desired)))
@@ -2,7 +2,6 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
 from numpy.testing import assert_allclose
-from astropy.tests.helper import pytest
 from astropy.convolution import Gaussian2DKernel
 from ...utils.testing import requires_dependency
 from ...detect import matched_filter
@@ -31,7 +30,6 @@ def test_center():
     assert_allclose(significance, 2.6212048333735858)
 
 
-@pytest.mark.xfail
 @requires_dependency('scipy')
 def test_image():
     # Test dataset parameters
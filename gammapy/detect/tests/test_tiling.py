@@ -0,0 +1,80 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+from numpy.testing import assert_allclose
+from astropy.convolution import Tophat2DKernel, Gaussian2DKernel
+from ...utils.testing import requires_dependency
+from ...image import SkyImage
+from ..lima import compute_lima_map
+from ..test_statistics import compute_ts_map
+from ..kernel import KernelBackgroundEstimatorData, KernelBackgroundEstimator
+from ..tiling import (compute_lima_map_tiled, compute_ts_map_tiled,
+                      kernel_background_estimate_tiled)
+
+
+@requires_dependency('scipy')
+def test_compute_lima_map_tiled():
+    random_state = np.random.RandomState(0)
+    counts = SkyImage.empty(nxpix=50, nypix=40)
+    counts.data = random_state.poisson(2, counts.data.shape).astype(float)
+    background = SkyImage.empty_like(counts, fill=2)
+    kernel = Tophat2DKernel(4)
+
+    desired = compute_lima_map(counts.data, background.data, kernel)
+    actual = compute_lima_map_tiled(counts, background, kernel, tile_shape=(15, 20))
+
+    for name in ['significance', 'counts', 'background', 'excess']:
+        assert_allclose(actual[name].data, desired[name].data)
+
+
+@requires_dependency('scipy')
+def test_compute_ts_map_tiled():
+    random_state = np.random.RandomState(0)
+    # The last tile column is narrower than the kernel
+    counts = SkyImage.empty(nxpix=43, nypix=30)
+    counts.data = random_state.poisson(2, counts.data.shape).astype(float)
+    counts.data[12:15, 30:33] += 20
+    background = SkyImage.empty_like(counts, fill=2)
+    exposure = SkyImage.empty_like(counts, fill=1e12)
+    # No exposure in the first tile columns
+    exposure.data[:, :20] = 0
+    kernel = Gaussian2DKernel(1)
+
+    desired = compute_ts_map(counts, background, exposure, kernel, parallel=False)
+    actual = compute_ts_map_tiled(counts, background, exposure, kernel,
+                                  tile_shape=(10, 10), parallel=False)
+
+    for name in ['ts', 'sqrt_ts', 'amplitude', 'niter']:
+        assert_allclose(actual[name].data, desired[name].data)
+    assert np.isnan(actual['ts'].data[:, :16]).all()
+    assert np.isfinite(actual['ts'].data[4:-4, 20:-4]).all()
+
+
+@requires_dependency('scipy')
+def test_kernel_background_estimate_tiled():
+    random_state = np.random.RandomState(0)
+    counts = SkyImage.empty(nxpix=43, nypix=30)
+    counts.data = random_state.poisson(2, counts.data.shape).astype(float)
+    counts.data[12:15, 30:33] += 20
+    # Tile without any counts
+    counts.data[:10, :10] = 0
+    source_kernel = np.ones((3, 3))
+    background_kernel = np.ones((5, 5))
+
+    data = KernelBackgroundEstimatorData(counts=counts.data.copy(),
+                                         header=counts.wcs.to_header())
+    kbe = KernelBackgroundEstimator(images=data, source_kernel=source_kernel,
+                                    background_kernel=background_kernel,
+                                    significance_threshold=4,
+                                    mask_dilation_radius=1)
+    mask, background = kbe.run(max_iterations=3)
+
+    actual = kernel_background_estimate_tiled(counts, source_kernel, background_kernel,
+                                              significance_threshold=4,
+                                              mask_dilation_radius=1,
+                                              max_iterations=3, tile_shape=(10, 10))
+
+    assert_allclose(actual['mask'].data, mask)
+    assert_allclose(actual['background'].data, background)
+    assert_allclose(actual['significance'].data, kbe._data[-1].significance)
+    assert not actual['mask'].data[13, 31]
@@ -0,0 +1,228 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Tiled versions of source detection and background estimation methods.
+
+These are adapters to `~gammapy.image.process_image_tiles`, which allow to
+process survey-scale images with bounded memory and on multiple cores.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from functools import partial
+import numpy as np
+from astropy.io import fits
+from ..utils.dtype import _float_dtype
+from ..image import SkyImageCollection, process_image_tiles
+from .lima import compute_lima_map, compute_lima_on_off_map
+from .test_statistics import compute_ts_map
+from .kernel import KernelBackgroundEstimatorData, KernelBackgroundEstimator
+
+__all__ = [
+    'compute_lima_map_tiled',
+    'compute_lima_on_off_map_tiled',
+    'compute_ts_map_tiled',
+    'kernel_background_estimate_tiled',
+]
+
+
+def _kernel_halo(kernel):
+    """Halo width in pixels needed for a given kernel."""
+    return max(np.shape(kernel)) // 2 + 1
+
+
+def _lima_tile(images, kernel):
+    exposure = images['exposure'].data if 'exposure' in images else None
+    return compute_lima_map(images['counts'].data, images['background'].data,
+                            kernel, exposure=exposure)
+
+
+def _lima_on_off_tile(images, kernel):
+    exposure = images['exposure'].data if 'exposure' in images else None
+    return compute_lima_on_off_map(images['n_on'].data, images['n_off'].data,
+                                   images['a_on'].data, images['a_off'].data,
+                                   kernel, exposure=exposure)
+
+
+def _ts_tile(images, kernel, **kwargs):
+    # `compute_ts_map` only fits pixels with exposure and background, at least
+    # half a kernel away from the edge. Tiles without such pixels (e.g. tiles
+    # without exposure or tiles smaller than the kernel) are filled with NaN.
+    exposure = images['exposure'].data
+    background = images['background'].data
+    ny, nx = exposure.shape
+    hy, hx = kernel.shape[0] // 2, kernel.shape[1] // 2
+    valid = (exposure > 0) & (background != 0)
+    if not valid[hy:ny - hy, hx:nx - hx].any():
+        dtype = _float_dtype(kwargs.get('dtype'))
+        return dict((name, np.full((ny, nx), np.nan, dtype=dtype))
+                    for name in ['ts', 'sqrt_ts', 'amplitude', 'niter'])
+
+    return compute_ts_map(images['counts'], images['background'],
+                          images['exposure'], kernel, **kwargs)
+
+
+def _kernel_background_tile(images, source_kernel, background_kernel,
+                            significance_threshold, mask_dilation_radius,
+                            max_iterations):
+    data = KernelBackgroundEstimatorData(counts=images['counts'].data)
+    wcs = images['counts'].wcs
+    data.header = wcs.to_header() if wcs is not None else fits.Header()
+    kbe = KernelBackgroundEstimator(images=data, source_kernel=source_kernel,
+                                    background_kernel=background_kernel,
+                                    significance_threshold=significance_threshold,
+                                    mask_dilation_radius=mask_dilation_radius)
+    mask, background = kbe.run(max_iterations=max_iterations)
+    return dict(mask=mask, background=background,
+                significance=kbe._data[-1].significance)
+
+
+def _make_images(**kwargs):
+    images = SkyImageCollection()
+    for name, image in kwargs.items():
+        if image is not None:
+            images[name] = image
+    return images
+
+
+def compute_lima_map_tiled(counts, background, kernel, exposure=None,
+                           tile_shape=(1000, 1000), parallel=False):
+    """
+    Compute Li&Ma significance and flux maps for known background in tiles.
+
+    Tiled version of `~gammapy.detect.compute_lima_map`, giving identical
+    results.
+
+    Parameters
+    ----------
+    counts, background, exposure : `~gammapy.image.SkyImage` or `~numpy.ndarray`
+        Count, background and (optional) exposure map
+    kernel : `astropy.convolution.Kernel2D`
+        Convolution kernel.
+    tile_shape : tuple
+        Shape of the tiles.
+    parallel : bool
+        Whether to process the tiles in parallel on multiple cores.
+
+    Returns
+    -------
+    images : `~gammapy.image.SkyImageCollection`
+        Bunch of result maps.
+    """
+    images = _make_images(counts=counts, background=background, exposure=exposure)
+    function = partial(_lima_tile, kernel=kernel)
+    return process_image_tiles(images, function, halo=_kernel_halo(kernel.array),
+                               tile_shape=tile_shape, parallel=parallel)
+
+
+def compute_lima_on_off_map_tiled(n_on, n_off, a_on, a_off, kernel,
+                                  exposure=None, tile_shape=(1000, 1000),
+                                  parallel=False):
+    """
+    Compute Li&Ma significance and flux maps for on-off observations in tiles.
+
+    Tiled version of `~gammapy.detect.compute_lima_on_off_map`, giving
+    identical results.
+
+    Parameters
+    ----------
+    n_on, n_off, a_on, a_off, exposure : `~gammapy.image.SkyImage` or `~numpy.ndarray`
+        Input maps, see `~gammapy.detect.compute_lima_on_off_map`.
+    kernel : `astropy.convolution.Kernel2D`
+        Convolution kernel.
+    tile_shape : tuple
+        Shape of the tiles.
+    parallel : bool
+        Whether to process the tiles in parallel on multiple cores.
+
+    Returns
+    -------
+    images : `~gammapy.image.SkyImageCollection`
+        Bunch of result maps.
+    """
+    images = _make_images(n_on=n_on, n_off=n_off, a_on=a_on, a_off=a_off,
+                          exposure=exposure)
+    function = partial(_lima_on_off_tile, kernel=kernel)
+    return process_image_tiles(images, function, halo=_kernel_halo(kernel.array),
+                               tile_shape=tile_shape, parallel=parallel)
+
+
+def compute_ts_map_tiled(counts, background, exposure, kernel,
+                         tile_shape=(500, 500), **kwargs):
+    """
+    Compute TS map in tiles.
+
+    Tiled version of `~gammapy.detect.compute_ts_map`, giving identical
+    results. The tiles are processed one after the other, the computation
+    within a tile is parallelised by `~gammapy.detect.compute_ts_map`.
+    Tiles without any pixel to fit, e.g. without exposure, are set to NaN.
+
+    Parameters
+    ----------
+    counts, background, exposure : `~gammapy.image.SkyImage`
+        Count, background and exposure image.
+    kernel : `astropy.convolution.Kernel2D`
+        Source model kernel.
+    tile_shape : tuple
+        Shape of the tiles.
+    kwargs : dict
+        Keyword arguments passed to `~gammapy.detect.compute_ts_map`.
+
+    Returns
+    -------
+    images : `~gammapy.image.SkyImageCollection`
+        Images (ts, sqrt_ts, amplitude, niter)
+    """
+    images = _make_images(counts=counts, background=background, exposure=exposure)
+    function = partial(_ts_tile, kernel=kernel, **kwargs)
+    return process_image_tiles(images, function, halo=_kernel_halo(kernel.array),
+                               tile_shape=tile_shape, parallel=False)
+
+
+def kernel_background_estimate_tiled(counts, source_kernel, background_kernel,
+                                     significance_threshold, mask_dilation_radius,
+                                     max_iterations=10, halo=None,
+                                     tile_shape=(1000, 1000), parallel=False):
+    """
+    Run `~gammapy.detect.KernelBackgroundEstimator` in tiles.
+
+    Every iteration of the estimator enlarges the region of influence of a
+    pixel by the kernel sizes and mask dilation radius, so the default halo
+    is chosen such that the tiled result is identical to processing the
+    whole image at once. A smaller halo can be given to save memory and
+    computing time at the cost of small differences at the tile borders.
+
+    Parameters
+    ----------
+    counts : `~gammapy.image.SkyImage` or `~numpy.ndarray`
+        Counts image.
+    source_kernel, background_kernel : `~numpy.ndarray`
+        Source and background kernel, see
+        `~gammapy.detect.KernelBackgroundEstimator`.
+    significance_threshold : float
+        Significance threshold above which regions are excluded.
+    mask_dilation_radius : float
+        Amount by which mask is dilated with each iteration.
+    max_iterations : int
+        Number of iterations.
+    halo : int, optional
+        Halo width in pixels.
+    tile_shape : tuple
+        Shape of the tiles.
+    parallel : bool
+        Whether to process the tiles in parallel on multiple cores.
+
+    Returns
+    -------
+    images : `~gammapy.image.SkyImageCollection`
+        Images (mask, background, significance)
+    """
+    if halo is None:
+        step = (_kernel_halo(source_kernel) + _kernel_halo(background_kernel) +
+                int(np.ceil(mask_dilation_radius)))
+        halo = (max_iterations + 1) * step
+
+    images = _make_images(counts=counts)
+    function = partial(_kernel_background_tile, source_kernel=source_kernel,
+                       background_kernel=background_kernel,
+                       significance_threshold=significance_threshold,
+                       mask_dilation_radius=mask_dilation_radius,
+                       max_iterations=max_iterations)
+    return process_image_tiles(images, function, halo=halo,
+                               tile_shape=tile_shape, parallel=parallel)
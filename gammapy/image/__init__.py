@@ -8,4 +8,6 @@ from .catalog import *
 from .mask import *
 from .core import *
 from .lists import *
+from .tiling import *
+from .reprojection import *
 
@@ -12,17 +12,21 @@ from astropy.coordinates import SkyCoord, Angle
 from astropy.coordinates.angle_utilities import angular_separation
 from astropy.units import Quantity, Unit
 from astropy.nddata.utils import Cutout2D
-from regions import PixCoord, PixelRegion, SkyRegion
+from regions import (PixCoord, PixelRegion, SkyRegion, CircleSkyRegion,
+                     RectanglePixelRegion)
 from astropy.wcs import WCS, WcsError
 from astropy.wcs.utils import (pixel_to_skycoord, skycoord_to_pixel,
-                               proj_plane_pixel_scales)
+                               proj_plane_pixel_scales, wcs_to_celestial_frame)
 from ..extern.bunch import Bunch
 from ..utils.scripts import make_path
+from ..utils.cache import LRUCache
+from ..utils.dtype import _float_dtype
 from ..utils.wcs import get_resampled_wcs
 from ..image.utils import make_header, _bin_events_in_cube
+from .reprojection import ReprojectionPlan
 from ..data import EventList
 
-__all__ = ['SkyImage', 'SkyImageCollection']
+__all__ = ['SkyImage', 'SkyImageCollection', 'clear_geometry_cache']
 
 log = logging.getLogger(__name__)
 
@@ -30,6 +34,138 @@ _DEFAULT_WCS_ORIGIN = 0
 _DEFAULT_WCS_MODE = 'all'
 
 
+class _SkyImageGeometry(object):
+    """
+    Cached pixel coordinate grids for a given WCS and image shape.
+
+    All quantities are computed lazily on first access and stored as
+    read-only arrays, so that they can be shared safely between all images
+    with identical geometry. Use `_get_geometry` to obtain instances.
+
+    The size of the stored arrays is reported by ``nbytes`` and the shared
+    cache is trimmed to its byte budget whenever a new array is computed.
+
+    Parameters
+    ----------
+    wcs : `~astropy.wcs.WCS`
+        WCS transformation object.
+    shape : tuple
+        Image shape ``(ny, nx)``.
+    """
+
+    def __init__(self, wcs, shape):
+        self.wcs = wcs.deepcopy()
+        self.shape = tuple(shape)
+        self._cache = dict()
+
+    @property
+    def nbytes(self):
+        """Total size of the cached arrays in bytes."""
+        nbytes = 0
+        for value in self._cache.values():
+            if isinstance(value, tuple):
+                nbytes += sum(getattr(_, 'nbytes', 0) for _ in value)
+            else:
+                nbytes += value.nbytes
+        return nbytes
+
+    def _store(self, key, value):
+        self._cache[key] = value
+        _GEOMETRY_CACHE.trim()
+        return value
+
+    def _pixel_to_world(self, mode):
+        if mode == 'center':
+            y, x = np.indices(self.shape)
+        elif mode == 'edges':
+            y, x = np.indices((self.shape[0] + 1, self.shape[1] + 1))
+            y, x = y - 0.5, x - 0.5
+        else:
+            raise ValueError('Invalid mode to compute coordinates.')
+
+        coordinates = pixel_to_skycoord(xp=x, yp=y, wcs=self.wcs,
+                                        origin=_DEFAULT_WCS_ORIGIN,
+                                        mode=_DEFAULT_WCS_MODE)
+        lon = coordinates.spherical.lon.deg
+        lat = coordinates.spherical.lat.deg
+        lon.setflags(write=False)
+        lat.setflags(write=False)
+        return lon, lat, wcs_to_celestial_frame(self.wcs)
+
+    def lonlat(self, mode='center'):
+        """Longitude and latitude arrays in deg and the coordinate frame."""
+        key = ('lonlat', mode)
+        if key not in self._cache:
+            self._store(key, self._pixel_to_world(mode))
+        return self._cache[key]
+
+    def coordinates(self, mode='center'):
+        """Sky coordinates (`~astropy.coordinates.SkyCoord`) sharing the cached arrays."""
+        lon, lat, frame = self.lonlat(mode)
+        return SkyCoord(lon, lat, unit='deg', frame=frame, copy=False)
+
+    @property
+    def unit_vectors(self):
+        """Cartesian unit vectors of the pixel centers, shape ``(3, ny, nx)``."""
+        if 'unit_vectors' not in self._cache:
+            lon, lat, _ = self.lonlat('center')
+            lon, lat = np.radians(lon), np.radians(lat)
+            cos_lat = np.cos(lat)
+            vectors = np.array([cos_lat * np.cos(lon),
+                                cos_lat * np.sin(lon),
+                                np.sin(lat)])
+            vectors.setflags(write=False)
+            self._store('unit_vectors', vectors)
+        return self._cache['unit_vectors']
+
+    @property
+    def solid_angle(self):
+        """Pixel solid angle array in sr."""
+        if 'solid_angle' not in self._cache:
+            lon, lat, _ = self.lonlat('edges')
+            lon, lat = np.radians(lon), np.radians(lat)
+
+            # Compute solid angle using the approximation that it's
+            # the product between angular separation of pixel corners.
+            # First index is "y", second index is "x"
+            ylo_xlo = lon[:-1, :-1], lat[:-1, :-1]
+            ylo_xhi = lon[:-1, 1:], lat[:-1, 1:]
+            yhi_xlo = lon[1:, :-1], lat[1:, :-1]
+
+            dx = angular_separation(*(ylo_xlo + ylo_xhi))
+            dy = angular_separation(*(ylo_xlo + yhi_xlo))
+            omega = np.asarray(dx * dy)
+            omega.setflags(write=False)
+            self._store('solid_angle', omega)
+        return self._cache['solid_angle']
+
+
+# Shared pixel geometries, bounded by number and by the total size of the arrays
+_GEOMETRY_CACHE = LRUCache(maxsize=16, maxbytes=512 * 1024 ** 2)
+
+
+def clear_geometry_cache():
+    """Clear the cache of pixel coordinate and solid angle grids.
+
+    `SkyImage` and `~gammapy.cube.SkyCube` share the coordinate and solid
+    angle arrays of images with identical WCS and shape. The cache holds at
+    most 512 MB of arrays; call this function to release them earlier.
+    """
+    _GEOMETRY_CACHE.clear()
+
+
+def _get_geometry(wcs, shape):
+    """
+    Get shared `_SkyImageGeometry` for a given WCS and shape.
+
+    Geometries are looked up by WCS header and shape in a module level LRU
+    cache, so that repeated calls for the same geometry (e.g. for many
+    observations on the same reference image) don't recompute coordinates.
+    """
+    key = (wcs.to_header_string(relax=True), tuple(shape))
+    return _GEOMETRY_CACHE.get_or_compute(key, lambda: _SkyImageGeometry(wcs, shape))
+
+
 class SkyImage(object):
     """
     Sky image.
@@ -83,19 +219,22 @@ class SkyImage(object):
         )
 
     @classmethod
-    def read(cls, filename, **kwargs):
+    def read(cls, filename, memmap=None, **kwargs):
         """Read image from FITS file.
 
         Parameters
         ----------
         filename : str
             FITS file name
+        memmap : bool, optional
+            Whether to memory map the data, so that it is only read from disk
+            when accessed. By default the `astropy.io.fits` default is used.
+            Use ``memmap=False`` to load the data into memory.
         **kwargs : dict
             Keyword arguments passed `~astropy.io.fits.getdata`.
         """
         filename = str(make_path(filename))
-        data = fits.getdata(filename, **kwargs)
-        header = fits.getheader(filename, **kwargs)
+        data, header = fits.getdata(filename, header=True, memmap=memmap, **kwargs)
         image_hdu = fits.ImageHDU(data, header)
         return cls.from_image_hdu(image_hdu)
 
@@ -142,7 +281,7 @@ class SkyImage(object):
     @classmethod
     def empty(cls, name=None, nxpix=200, nypix=200, binsz=0.02, xref=0, yref=0,
               fill=0, proj='CAR', coordsys='GAL', xrefpix=None, yrefpix=None,
-              dtype='float64', unit=None, meta=None):
+              dtype=None, unit=None, meta=None):
         """
         Create an empty image from scratch.
 
@@ -178,7 +317,8 @@ class SkyImage(object):
         yrefpix: float, optional
             Coordinate system reference pixel for y axis. Default is None.
         dtype : str, optional
-            Data type, default is float32
+            Data type, default is given by
+            `~gammapy.utils.dtype.get_default_float_dtype`.
         unit : str
             Data unit.
         meta : `~collections.OrderedDict`
@@ -191,12 +331,13 @@ class SkyImage(object):
         """
         header = make_header(nxpix, nypix, binsz, xref, yref,
                              proj, coordsys, xrefpix, yrefpix)
+        dtype = _float_dtype() if dtype is None else dtype
         data = fill * np.ones((nypix, nxpix), dtype=dtype)
         wcs = WCS(header)
         return cls(name=name, data=data, wcs=wcs, unit=unit, meta=header)
 
     @classmethod
-    def empty_like(cls, image, name=None, unit=None, fill=0, meta=None):
+    def empty_like(cls, image, name=None, unit=None, fill=0, meta=None, dtype=None):
         """
         Create an empty image like the given image.
 
@@ -214,6 +355,8 @@ class SkyImage(object):
             String specifying the data units.
         meta : `~collections.OrderedDict`
             Dictionary to store meta data.
+        dtype : str, optional
+            Data type, default is the data type of the given image.
         """
         if isinstance(image, SkyImage):
             wcs = image.wcs.copy()
@@ -222,7 +365,7 @@ class SkyImage(object):
         else:
             raise TypeError("Can't create image from type {}".format(type(image)))
 
-        data = fill * np.ones_like(image.data)
+        data = fill * np.ones_like(image.data, dtype=dtype)
 
         return cls(name, data, wcs, unit, meta=wcs.to_header())
 
@@ -239,7 +382,8 @@ class SkyImage(object):
         if isinstance(value, EventList):
             counts = _bin_events_in_cube(value, self.wcs, self.data.shape,
                                          origin=_DEFAULT_WCS_ORIGIN).sum(axis=0)
-            self.data = counts.value
+            dtype = self.data.dtype if self.data.dtype.kind == 'f' else _float_dtype()
+            self.data = counts.value.astype(dtype, copy=False)
             self.unit = 'ct'
         elif np.isscalar(value):
             self.data.fill(value)
@@ -301,9 +445,12 @@ class SkyImage(object):
         coordinates : `~astropy.coordinates.SkyCoord`
             Position on the sky.
         """
-        pixcoord = self.coordinates_pix(mode=mode)
-        coordinates = self.wcs_pixel_to_skycoord(xp=pixcoord.x, yp=pixcoord.y)
-        return coordinates
+        return self._geometry.coordinates(mode=mode)
+
+    @property
+    def _geometry(self):
+        """Shared, cached pixel geometry (`_SkyImageGeometry`)."""
+        return _get_geometry(self.wcs, self.data.shape)
 
     def contains(self, position):
         """
@@ -367,28 +514,32 @@ class SkyImage(object):
 
     def _get_boundaries(self, image_ref, image, wcs_check):
         """
-        Get boundary coordinates of one image in the pixel coordinate system
-        of another reference image.
-        """
-        ymax, xmax = image.data.shape
-        ymax_ref, xmax_ref = image_ref.data.shape
-
-        # transform boundaries in world coordinates
-        bounds = image.wcs.wcs_pix2world([0, xmax], [0, ymax], _DEFAULT_WCS_ORIGIN)
+        Get the pixel ranges of the overlap of one image with a reference image.
 
-        # transform to pixel coordinats in the reference image
-        bounds_ref = image_ref.wcs.wcs_world2pix(bounds[0], bounds[1], _DEFAULT_WCS_ORIGIN)
+        Returns the ranges ``(xlo, xhi, ylo, yhi)`` in the reference image and
+        in the image. The position of the image in the reference image is
+        computed from its first pixels only, so that this also works for
+        all-sky images, where the pixel after the last one wraps around.
+        """
+        ny, nx = image.data.shape
+        ny_ref, nx_ref = image_ref.data.shape
 
-        # round to nearest integer and clip at the boundaries
-        xlo, xhi = np.rint(np.clip(bounds_ref[0], 0, xmax_ref))
-        ylo, yhi = np.rint(np.clip(bounds_ref[1], 0, ymax_ref))
+        # transform the first pixels to pixel coordinates in the reference image
+        lon, lat = image.wcs.wcs_pix2world([0, 1], [0, 1], _DEFAULT_WCS_ORIGIN)
+        x, y = image_ref.wcs.wcs_world2pix(lon, lat, _DEFAULT_WCS_ORIGIN)
 
         if wcs_check:
-            if not np.allclose(bounds_ref, np.rint(bounds_ref)):
+            aligned = np.allclose([x, y], np.rint([x, y]))
+            aligned &= np.allclose([x[1] - x[0], y[1] - y[0]], 1)
+            if not aligned:
                 raise WcsError('World coordinate systems not aligned. Try to call'
                                ' .reproject() on one of the maps first.')
 
-        return xlo, xhi, ylo, yhi
+        x0, y0 = int(np.rint(x[0])), int(np.rint(y[0]))
+        xlo, xhi = min(max(x0, 0), nx_ref), max(min(x0 + nx, nx_ref), 0)
+        ylo, yhi = min(max(y0, 0), ny_ref), max(min(y0 + ny, ny_ref), 0)
+        xhi, yhi = max(xhi, xlo), max(yhi, ylo)
+        return (xlo, xhi, ylo, yhi), (xlo - x0, xhi - x0, ylo - y0, yhi - y0)
 
     def paste(self, image, method='sum', wcs_check=True):
         """
@@ -408,8 +559,9 @@ class SkyImage(object):
             Check if both WCS are aligned. Raises `~astropy.wcs.WcsError` if not.
             Disable for performance critical computations.
         """
-        xlo, xhi, ylo, yhi = self._get_boundaries(self, image, wcs_check)
-        xlo_c, xhi_c, ylo_c, yhi_c = self._get_boundaries(image, self, wcs_check)
+        bounds, bounds_image = self._get_boundaries(self, image, wcs_check)
+        xlo, xhi, ylo, yhi = bounds
+        xlo_c, xhi_c, ylo_c, yhi_c = bounds_image
 
         if method == 'sum':
             self.data[ylo:yhi, xlo:xhi] += image.data[ylo_c:yhi_c, xlo_c:xhi_c]
@@ -622,22 +774,7 @@ class SkyImage(object):
         """
         Solid angle image (2-dim `~astropy.units.Quantity` in `sr`).
         """
-
-        coordinates = self.coordinates(mode='edges')
-        lon = coordinates.data.lon.radian
-        lat = coordinates.data.lat.radian
-
-        # Compute solid angle using the approximation that it's
-        # the product between angular separation of pixel corners.
-        # First index is "y", second index is "x"
-        ylo_xlo = lon[:-1, :-1], lat[:-1, :-1]
-        ylo_xhi = lon[:-1, 1:], lat[:-1, 1:]
-        yhi_xlo = lon[1:, :-1], lat[1:, :-1]
-
-        dx = angular_separation(*(ylo_xlo + ylo_xhi))
-        dy = angular_separation(*(ylo_xlo + yhi_xlo))
-        omega = Quantity(dx * dy, 'sr')
-        return omega
+        return Quantity(self._geometry.solid_angle, 'sr')
 
     def lookup(self, position, interpolation=None):
         """
@@ -721,6 +858,10 @@ class SkyImage(object):
         """
         Reproject image to given reference.
 
+        The pixel mapping for a given pair of image geometries is cached, see
+        `~gammapy.image.ReprojectionPlan`, so reprojecting many images with
+        the same geometry is fast.
+
         Parameters
         ----------
         reference : `~astropy.io.fits.Header`, or `~gammapy.image.SkyImage`
@@ -740,8 +881,6 @@ class SkyImage(object):
             Skymap reprojected onto ``reference``.
         """
 
-        from reproject import reproject_interp, reproject_exact
-
         if isinstance(reference, SkyImage):
             wcs_reference = reference.wcs
             shape_out = reference.data.shape
@@ -752,15 +891,24 @@ class SkyImage(object):
             raise TypeError("Invalid reference map must be either instance"
                             "of `Header`, `WCS` or `SkyImage`.")
 
-        if mode == 'interp':
-            out = reproject_interp((self.data, self.wcs), wcs_reference,
-                                   shape_out=shape_out, *args, **kwargs)
-        elif mode == 'exact':
-            out = reproject_exact((self.data, self.wcs), wcs_reference,
-                                  shape_out=shape_out, *args, **kwargs)
-        else:
+        if mode not in ['interp', 'exact']:
             raise TypeError("Invalid reprojection mode, either choose 'interp' or 'exact'")
 
+        if args or set(kwargs) - set(['order']):
+            # Options not supported by the cached reprojection plans
+            from reproject import reproject_interp, reproject_exact
+            if mode == 'interp':
+                out = reproject_interp((self.data, self.wcs), wcs_reference,
+                                       shape_out=shape_out, *args, **kwargs)
+            else:
+                out = reproject_exact((self.data, self.wcs), wcs_reference,
+                                      shape_out=shape_out, *args, **kwargs)
+        else:
+            plan = ReprojectionPlan.get(self.wcs, self.data.shape, wcs_reference,
+                                        shape_out, mode=mode,
+                                        order=kwargs.get('order', 'bilinear'))
+            out = plan.apply(self.data)
+
         return SkyImage(name=self.name, data=out[0], wcs=wcs_reference,
                         unit=self.unit, meta=self.meta)
 
@@ -1010,17 +1158,160 @@ class SkyImage(object):
         """
         from .mask import SkyMask
 
+        data = np.zeros(self.data.shape, dtype=bool)
+        slices = self._region_slices(region)
+        if slices is not None:
+            data[slices] = self._region_contains(region, slices)
+
+        return SkyMask(data=data, wcs=self.wcs)
+
+    def region_labels(self, regions):
+        """Create a label image for a list of regions.
+
+        Only the pixels within the bounding box of every region are tested,
+        so this is fast also for many small regions in a large image, e.g.
+        to create an exclusion mask for a whole source catalog.
+
+        The label image is:
+
+        - ``i + 1`` for pixels inside ``regions[i]``. For overlapping regions
+          the label of the last region is used.
+        - ``0`` for pixels outside all regions
+
+        Parameters
+        ----------
+        regions : list of `~regions.PixelRegion` or `~regions.SkyRegion`
+            Regions on the sky, defined in pixel or sky coordinates.
+
+        Returns
+        -------
+        labels : `~gammapy.image.SkyImage`
+            Integer label image.
+
+        Examples
+        --------
+        >>> from gammapy.image import SkyImage
+        >>> from regions import CirclePixelRegion, RectanglePixelRegion, PixCoord
+        >>> regions = [CirclePixelRegion(center=PixCoord(x=1, y=1), radius=1.1),
+        ...            RectanglePixelRegion(center=PixCoord(x=3.5, y=2), width=2, height=3)]
+        >>> image = SkyImage.empty(nxpix=6, nypix=4)
+        >>> labels = image.region_labels(regions)
+        >>> print(labels.data)
+        [[0 1 0 0 0 0]
+         [1 1 1 2 2 0]
+         [0 1 0 2 2 0]
+         [0 0 0 2 2 0]]
+        """
+        data = np.zeros(self.data.shape, dtype=int)
+        for label, region in enumerate(regions, start=1):
+            slices = self._region_slices(region)
+            if slices is None:
+                continue
+            contained = self._region_contains(region, slices)
+            data[slices][contained] = label
+
+        return SkyImage(name='labels', data=data, wcs=self.wcs)
+
+    def _region_slices(self, region, margin=1):
+        """Slices of the image containing the pixel bounding box of a region.
+
+        For `~regions.CircleSkyRegion` the bounding box is computed from
+        points on the circle, other sky regions are tested on the whole
+        image. A margin of ``margin`` pixels is added. Returns `None` if the
+        region does not overlap with the image.
+        """
+        ny, nx = self.data.shape
+
         if isinstance(region, PixelRegion):
-            coords = self.coordinates_pix()
+            try:
+                bbox = region.bounding_box
+            except (AttributeError, NotImplementedError):
+                # Test all pixels, if no bounding box is available
+                return slice(0, ny), slice(0, nx)
+            xmin, xmax, ymin, ymax = bbox.ixmin, bbox.ixmax, bbox.iymin, bbox.iymax
+        elif isinstance(region, CircleSkyRegion):
+            bbox = self._sky_circle_bounding_box(region.center, region.radius)
+            if bbox is None:
+                return slice(0, ny), slice(0, nx)
+            xmin, xmax, ymin, ymax = bbox
         elif isinstance(region, SkyRegion):
-            coords = self.coordinates()
+            # The pixel bounding box of a sky region can be much larger than
+            # the one of its pixel region, e.g. at high latitudes
+            return slice(0, ny), slice(0, nx)
         else:
             raise TypeError("Invalid region type, must be instance of "
                             "'regions.PixelRegion' or 'regions.SkyRegion'")
 
-        data = region.contains(coords)
+        xmin, xmax = max(xmin - margin, 0), min(xmax + margin, nx)
+        ymin, ymax = max(ymin - margin, 0), min(ymax + margin, ny)
+        if xmin >= xmax or ymin >= ymax:
+            return None
+        return slice(ymin, ymax), slice(xmin, xmax)
+
+    def _sky_circle_bounding_box(self, center, radius, n_points=360):
+        """Pixel bounding box ``(xmin, xmax, ymin, ymax)`` of a circle on the sky.
+
+        The bounding box is computed from points on the circle. For circles
+        crossing a horizontal discontinuity of the projection, e.g. the
+        longitude wrap of an all-sky image, the bounding box spans the whole
+        image width. `None` is returned if it can't be computed this way: if
+        the circle contains a pole of the image coordinate system, crosses
+        another discontinuity or parts of it can't be projected.
+        """
+        frame = wcs_to_celestial_frame(self.wcs)
+        center = center.transform_to(frame)
+        radius = Angle(radius).rad
+        lon, lat = center.spherical.lon.rad, center.spherical.lat.rad
+        if np.pi / 2 - abs(lat) <= radius:
+            return None
+
+        # Points on the circle, at position angles ``phi`` from the center
+        phi = np.linspace(0, 2 * np.pi, n_points, endpoint=False)
+        lat_circle = np.arcsin(np.sin(lat) * np.cos(radius) +
+                               np.cos(lat) * np.sin(radius) * np.cos(phi))
+        lon_circle = lon + np.arctan2(np.sin(phi) * np.sin(radius) * np.cos(lat),
+                                      np.cos(radius) - np.sin(lat) * np.sin(lat_circle))
+        x, y = self.wcs.wcs_world2pix(np.degrees(lon_circle), np.degrees(lat_circle), 0)
+        if not (np.isfinite(x).all() and np.isfinite(y).all()):
+            return None
+
+        xmin, xmax = int(np.floor(x.min() + 0.5)), int(np.floor(x.max() + 0.5)) + 1
+        ymin, ymax = int(np.floor(y.min() + 0.5)), int(np.floor(y.max() + 0.5)) + 1
+
+        # Neighbouring points on opposite sides of a discontinuity
+        ny, nx = self.data.shape
+        step_x, step_y = np.roll(x, -1) - x, np.roll(y, -1) - y
+        jump = np.hypot(step_x, step_y) > max(nx, ny) / 2
+        if jump.any():
+            if (np.abs(step_y[jump]) > ny / 2).any():
+                return None
+            xmin, xmax = 0, nx
 
-        return SkyMask(data=data, wcs=self.wcs)
+        return xmin, xmax, ymin, ymax
+
+    def _region_contains(self, region, slices):
+        """Test which pixels in ``slices`` are contained in a region."""
+        if isinstance(region, PixelRegion):
+            y, x = np.mgrid[slices]
+            if isinstance(region, RectanglePixelRegion):
+                return _rectangle_contains(region, x, y)
+            coords = PixCoord(x, y)
+        else:
+            coords = self.coordinates()[slices]
+        return region.contains(coords)
+
+
+def _rectangle_contains(region, x, y):
+    """Test which pixel coordinates are contained in a rectangle pixel region.
+
+    Containment of `~regions.RectanglePixelRegion` is computed here, because
+    it is not implemented in all versions of ``regions``.
+    """
+    angle = Angle(region.angle).rad
+    dx, dy = x - region.center.x, y - region.center.y
+    dx, dy = (dx * np.cos(angle) + dy * np.sin(angle),
+              -dx * np.sin(angle) + dy * np.cos(angle))
+    return (np.abs(dx) < region.width / 2.) & (np.abs(dy) < region.height / 2.)
 
 
 class SkyImageCollection(Bunch):
@@ -1063,12 +1354,32 @@ class SkyImageCollection(Bunch):
         """
         if isinstance(item, np.ndarray):
             item = SkyImage(name=key, data=item, wcs=self.wcs)
-        if isinstance(item, SkyImage):
+        if isinstance(item, (SkyImage, _LazySkyImage)):
             self._map_names.append(key)
         super(SkyImageCollection, self).__setitem__(key, item)
 
+    def __getitem__(self, key):
+        """
+        Overwrite __getitem__ operator to read lazily loaded images on first
+        access.
+        """
+        item = super(SkyImageCollection, self).__getitem__(key)
+        if isinstance(item, _LazySkyImage):
+            item = item.load()
+            super(SkyImageCollection, self).__setitem__(key, item)
+        return item
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
     @classmethod
-    def read(cls, filename):
+    def read(cls, filename, lazy=False, memmap=None):
         """
         Create collection of images from Fits file.
 
@@ -1076,19 +1387,32 @@ class SkyImageCollection(Bunch):
         ----------
         filename : str
             Fits file name.
+        lazy : bool
+            Only read the headers and read the image data of a HDU on first
+            access of the corresponding image.
+        memmap : bool, optional
+            Whether to memory map the image data, see `SkyImage.read`.
         """
-        hdulist = fits.open(str(make_path(filename)))
+        filename = str(make_path(filename))
         kwargs = {}
         _map_names = []  # list of map names to save order in fits file
 
-        for hdu in hdulist:
-            image = SkyImage.from_image_hdu(hdu)
+        with fits.open(filename, memmap=memmap) as hdulist:
+            for idx, hdu in enumerate(hdulist):
+                if lazy:
+                    header = hdu.header
+                    name = header.get('HDUNAME', header.get('EXTNAME'))
+                    image = _LazySkyImage(filename, idx, memmap=memmap)
+                else:
+                    image = SkyImage.from_image_hdu(hdu)
+                    name = image.name
+
+                # This forces lower case map names, but only on the collection object
+                # When writing to fits again the image.name attribute is used.
+                name = name.lower()
+                kwargs[name] = image
+                _map_names.append(name)
 
-            # This forces lower case map names, but only on the collection object
-            # When writing to fits again the image.name attribute is used.
-            name = image.name.lower()
-            kwargs[name] = image
-            _map_names.append(name)
         _ = cls(**kwargs)
         _._map_names = _map_names
         return _
@@ -1097,25 +1421,46 @@ class SkyImageCollection(Bunch):
         """
         Write Bunch of maps to Fits file.
 
+        The images are written one by one, so that only one image HDU is
+        held in memory at a time.
+
         Parameters
         ----------
         filename : str
             Fits file name.
         header : `~astropy.io.fits.Header`
             Reference header to be used for all maps.
+        **kwargs : dict
+            Keyword arguments passed to `~astropy.io.fits.PrimaryHDU.writeto`
+            for the first image.
         """
-        hdulist = fits.HDUList()
+        filename = str(make_path(filename))
+        names = [name for name in self.get('_map_names', sorted(self))
+                 if isinstance(self[name], SkyImage)]
+
         for name in self.get('_map_names', sorted(self)):
-            if isinstance(self[name], SkyImage):
-                hdu = self[name].to_image_hdu()
+            if name not in names:
+                log.warn("Can't save {} to file, not a image.".format(name))
 
-                # For now add common collection meta info to the single map headers
+        hdulist = None
+        for name in names:
+            hdu = self[name].to_image_hdu()
+
+            # For now add common collection meta info to the single map headers
+            if self.meta:
                 hdu.header.update(self.meta)
-                hdu.name = name
-                hdulist.append(hdu)
+            hdu.name = name
+
+            if hdulist is None:
+                hdu.writeto(filename, **kwargs)
+                hdulist = fits.open(filename, mode='append')
             else:
-                log.warn("Can't save {} to file, not a image.".format(name))
-        hdulist.writeto(filename, **kwargs)
+                hdulist.append(fits.ImageHDU(data=hdu.data, header=hdu.header,
+                                             name=name))
+                hdulist.flush()
+
+        if hdulist is not None:
+            hdulist.close()
 
     def info(self):
         """
@@ -1132,3 +1477,20 @@ class SkyImageCollection(Bunch):
             info += self[name].__str__()
             info += '\n'
         return info
+
+
+class _LazySkyImage(object):
+    """
+    Placeholder for an image HDU, that is only read on first access.
+
+    Used by `SkyImageCollection.read` with ``lazy=True``.
+    """
+
+    def __init__(self, filename, hdu, memmap=None):
+        self.filename = filename
+        self.hdu = hdu
+        self.memmap = memmap
+
+    def load(self):
+        """Read the image (`SkyImage`)."""
+        return SkyImage.read(self.filename, ext=self.hdu, memmap=self.memmap)
@@ -1,9 +1,8 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
-from astropy.coordinates import Latitude, Longitude, Angle
+from astropy.coordinates import Latitude, Longitude, Angle, SkyCoord
 from astropy.utils import lazyproperty
-from ..image import lon_lat_circle_mask
 from .core import SkyImage
 
 __all__ = [
@@ -234,13 +233,13 @@ def make_tevcat_exclusion_mask():
     # TODO: make this a method SkyMask.from_catalog()?
     from gammapy.catalog import load_catalog_tevcat
 
+    from regions import CircleSkyRegion
+
     tevcat = load_catalog_tevcat()
     all_sky_exclusion = SkyMask.empty(nxpix=3600, nypix=1800, binsz=0.1,
                                       fill=1, dtype='int')
-    val_lon, val_lat = all_sky_exclusion.coordinates()
-    lons = Longitude(val_lon, 'deg')
-    lats = Latitude(val_lat, 'deg')
 
+    regions = []
     for source in tevcat:
         lon = Longitude(source['coord_gal_lon'], 'deg')
         lat = Latitude(source['coord_gal_lat'], 'deg')
@@ -251,7 +250,10 @@ def make_tevcat_exclusion_mask():
         else:
             rad = x if x > y else y
 
-        mask = lon_lat_circle_mask(lons, lats, lon, lat, rad)
-        all_sky_exclusion.data[mask] = 0
+        center = SkyCoord(lon, lat, frame='galactic')
+        regions.append(CircleSkyRegion(center=center, radius=rad))
+
+    labels = all_sky_exclusion.region_labels(regions)
+    all_sky_exclusion.data[labels.data > 0] = 0
 
     return all_sky_exclusion
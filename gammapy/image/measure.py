@@ -4,11 +4,13 @@
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
 from astropy.units import Quantity
+from astropy.coordinates import Angle
 
 __all__ = [
     'measure_containment_fraction',
     'measure_containment_radius',
     'measure_image_moments',
+    'measure_labeled_image_moments',
     'measure_labeled_regions',
     'measure_containment',
     'measure_curve_of_growth'
@@ -125,6 +127,83 @@ def measure_image_moments(image):
     return A, x_cms, y_cms, x_sigma, y_sigma, np.sqrt(x_sigma * y_sigma)
 
 
+def measure_labeled_image_moments(image, labels):
+    """
+    Compute flux, moments, bounding box and area of all labeled regions.
+
+    Like `measure_image_moments`, but for every region of a label image at
+    once. All quantities are computed in one vectorised pass with
+    `numpy.bincount` on the label ids, so this is fast also for label
+    images with many thousands of regions. NaN values are ignored.
+
+    Parameters
+    ----------
+    image : `gammapy.image.SkyImage`
+        Image to measure on.
+    labels : `~numpy.ndarray`
+        Label image of integer type. Regions are labeled ``1, ..., n``,
+        pixels with label ``0`` are ignored.
+
+    Returns
+    -------
+    table : `~astropy.table.Table`
+        Table with one row per label and the following columns:
+
+        * ``NUMBER`` : label id
+        * ``SUM`` : total flux
+        * ``X_CMS``, ``Y_CMS`` : center of mass
+        * ``X_SIGMA``, ``Y_SIGMA``, ``SIGMA`` : second moments and
+          ``sqrt(X_SIGMA * Y_SIGMA)``
+        * ``XMIN``, ``XMAX``, ``YMIN``, ``YMAX`` : bounding box in
+          pixels (maximum inclusive)
+        * ``AREA`` : area in pixels
+    """
+    from scipy.ndimage import find_objects
+    from astropy.table import Table
+
+    x, y = _wrapped_coordinates(image)
+    data = Quantity(image.data)
+    labels = np.asarray(labels)
+    n_labels = max(int(labels.max()), 0)
+    index = np.arange(1, n_labels + 1)
+
+    # Only use labeled pixels with finite values
+    valid = (labels > 0) & np.isfinite(data.value)
+    label = labels[valid]
+    weights = data.value[valid]
+    x, y = x.deg[valid], y.deg[valid]
+
+    def labeled_sum(values=None):
+        return np.bincount(label, weights=values, minlength=n_labels + 1)[1:]
+
+    total = labeled_sum(weights)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_cms = labeled_sum(weights * x) / total
+        y_cms = labeled_sum(weights * y) / total
+        x_var = labeled_sum(weights * (x - x_cms[label - 1]) ** 2) / total
+        y_var = labeled_sum(weights * (y - y_cms[label - 1]) ** 2) / total
+    x_sigma = np.sqrt(x_var)
+    y_sigma = np.sqrt(y_var)
+
+    area = np.bincount(labels.ravel(), minlength=n_labels + 1)[1:n_labels + 1]
+    xmin, xmax, ymin, ymax = _split_slices_labels(find_objects(labels, n_labels))
+
+    table = Table()
+    table['NUMBER'] = index
+    table['SUM'] = Quantity(total, data.unit)
+    table['X_CMS'] = Quantity(x_cms, 'deg')
+    table['Y_CMS'] = Quantity(y_cms, 'deg')
+    table['X_SIGMA'] = Quantity(x_sigma, 'deg')
+    table['Y_SIGMA'] = Quantity(y_sigma, 'deg')
+    table['SIGMA'] = Quantity(np.sqrt(x_sigma * y_sigma), 'deg')
+    table['XMIN'] = xmin
+    table['XMAX'] = xmax - 1
+    table['YMIN'] = ymin
+    table['YMAX'] = ymax - 1
+    table['AREA'] = area
+    return table
+
+
 def measure_containment(image, position, radius):
     """
     Measure containment in a given circle around the source position.
@@ -146,36 +225,29 @@ def measure_containment_radius(image, position, containment_fraction=0.8):
     """
     Measure containment radius of a source.
 
-
-
-    Uses `scipy.optimize.brentq`.
+    The pixels are sorted by separation from the source position once, the
+    containment radius is then looked up in the cumulative flux. Several
+    source positions and containment fractions can be given at once.
 
     Parameters
     ----------
     image :`gammapy.image.SkyImage`
         Image to measure on.
     position : `~astropy.coordinates.SkyCoord`
-        Source position on the sky.
-    containment_fraction : float (default 0.8)
-        Containment fraction
+        Source position(s) on the sky.
+    containment_fraction : float or array_like (default 0.8)
+        Containment fraction(s)
 
     Returns
     -------
-    containment_radius :
-        Containment radius (pix)
+    containment_radius : `~astropy.coordinates.Angle`
+        Containment radius with shape ``position.shape + containment_fraction.shape``.
+        NaN where the containment fraction is not reached, which can happen
+        for images with negative pixel values.
     """
-    from scipy.optimize import brentq
-
-    separation = image.coordinates().separation(position)
-
-    # Normalize image
-    data = image.data / image.data[np.isfinite(image.data)].sum()
-
-    def func(r):
-        return measure_containment_fraction(data, r, separation.value) - containment_fraction
-
-    containment_radius = brentq(func, a=0, b=separation.max().value)
-    return Quantity(containment_radius, separation.unit)
+    profiles = [_RadialFluxProfile(image, _) for _ in _iter_positions(position)]
+    radii = [_.containment_radius(containment_fraction) for _ in profiles]
+    return Angle(radii).reshape(position.shape + np.shape(containment_fraction))
 
 
 def measure_containment_fraction(image, radius, separation):
@@ -207,14 +279,16 @@ def measure_curve_of_growth(image, position, radius_max=None, radius_n=10):
     Measure the curve of growth for a given source position.
 
     The curve of growth is determined by measuring the flux in a circle around
-    the source and radius of this circle is increased
+    the source and radius of this circle is increased. The pixels are sorted
+    by separation once and the flux for all radii is looked up in the
+    cumulative flux.
 
     Parameters
     ----------
-    image : `astropy.io.fits.ImageHDU`
+    image : `~gammapy.image.SkyImage`
         Image to measure on.
     position : `~astropy.coordinates.SkyCoord`
-        Source position on the sky.
+        Source position(s) on the sky.
     radius_max : `~astropy.units.Quantity`
         Maximal radius, up to which the containment is measured (default 0.2 deg).
     radius_n : int
@@ -225,14 +299,74 @@ def measure_curve_of_growth(image, position, radius_max=None, radius_n=10):
     radii : `~astropy.units.Quantity`
         Radii where the containment was measured.
     containment : `~astropy.units.Quantity`
-        Corresponding contained flux.
+        Corresponding contained flux, with shape ``position.shape + radii.shape``.
     """
     radius_max = radius_max or Quantity(0.2, 'deg')
-    containment = []
     radii = Quantity(np.linspace(0, radius_max.value, radius_n), radius_max.unit)
-    for radius in radii:
-        containment.append(measure_containment(image, position, radius))
-    return radii, Quantity(containment)
+    profiles = [_RadialFluxProfile(image, _) for _ in _iter_positions(position)]
+    containment = Quantity([_.containment(radii) for _ in profiles])
+    return radii, containment.reshape(position.shape + radii.shape)
+
+
+def _iter_positions(position):
+    """Iterate over the positions of a scalar or array `~astropy.coordinates.SkyCoord`."""
+    if position.isscalar:
+        return [position]
+    return position.ravel()
+
+
+class _RadialFluxProfile(object):
+    """Cumulative flux of an image as a function of separation from a position.
+
+    The pixels are sorted by separation once, the flux within any radius
+    is then given by a lookup in the cumulative sum. Non-finite pixel
+    values are ignored.
+
+    Parameters
+    ----------
+    image : `~gammapy.image.SkyImage`
+        Image
+    position : `~astropy.coordinates.SkyCoord`
+        Center position
+    """
+
+    def __init__(self, image, position):
+        separation = image.coordinates().separation(position)
+        data = Quantity(image.data)
+
+        order = np.argsort(separation.value, axis=None, kind='mergesort')
+        values = data.value.ravel()[order]
+        values[~np.isfinite(values)] = 0
+
+        self.separation = Angle(separation.value.ravel()[order], separation.unit)
+        self.cumulative = Quantity(np.cumsum(values), data.unit)
+
+    def containment(self, radius):
+        """Flux within (excluding) ``radius``."""
+        radius = Quantity(radius).to(self.separation.unit).value
+        idx = np.searchsorted(self.separation.value, radius, side='left')
+        cumulative = np.append(0, self.cumulative.value)
+        return Quantity(cumulative[idx], self.cumulative.unit)
+
+    def containment_radius(self, containment_fraction):
+        """Smallest radius containing a given fraction of the total flux.
+
+        With negative pixel values the cumulative flux is not monotonic, the
+        first radius where the fraction is reached is returned. NaN is
+        returned if the fraction is never reached.
+        """
+        total = self.cumulative.value[-1]
+        containment_fraction = np.asanyarray(containment_fraction, dtype=float)
+        if not total > 0:
+            return Angle(np.full(containment_fraction.shape, np.nan), self.separation.unit)
+
+        # The running maximum is sorted and reaches a given value at the same
+        # index as the cumulative flux does for the first time
+        fraction = np.maximum.accumulate(self.cumulative.value / total)
+        idx = np.searchsorted(fraction, containment_fraction, side='left')
+        reached = idx < len(fraction)
+        radius = self.separation.value[np.where(reached, idx, 0)]
+        return Angle(np.where(reached, radius, np.nan), self.separation.unit)
 
 
 def _split_xys(pos):
@@ -255,10 +389,17 @@ def _split_slices(slices):
     return xmin, xmax, ymin, ymax
 
 
+def _split_slices_labels(slices):
+    """Like `_split_slices`, but labels not present in the image give -1."""
+    slices = [_ if _ is not None else (slice(-1, 0), slice(-1, 0)) for _ in slices]
+    if not slices:
+        empty = np.array([], dtype=int)
+        return empty, empty, empty, empty
+    return _split_slices(slices)
+
+
 def _measure_area(labels):
     """Measure the area in pix of each segment."""
     nsegments = labels.max()
-    area = np.zeros(nsegments)
-    for i in range(nsegments):
-        area[i] = (labels == i + 1).sum()
-    return area
+    area = np.bincount(labels.ravel(), minlength=nsegments + 1)[1:nsegments + 1]
+    return area.astype(float)
@@ -53,72 +53,86 @@ def compute_binning(data, n_bins, method='equal width', eps=1e-10):
     return bin_edges
 
 
+def _n_profiles(array):
+    """Number of profiles for a 2D image or a 3D stack of images."""
+    return array.shape[0] if array.ndim == 3 else 1
+
+
 class FluxProfile(object):
     """Flux profile.
 
     Note: over- and underflow is ignored and not stored in the profile
 
-    Note: this is implemented by creating bin labels and storing the
-    input 2D data in 1D `pandas.DataFrame` tables.
-    The 1D profile is also stored as a `pandas.DataFrame` and computed
-    using the fast and flexible pandas groupby and apply functions.
+    Note: this is implemented by computing integer bin labels for all
+    pixels once, the profile quantities for all bins are then computed
+    in one pass with `numpy.bincount`.
+
+    Several profiles with the same binning, e.g. GLON profiles in several
+    GLAT slices, can be computed at once by passing a stack of label images
+    or masks with shape ``(n_profiles, ny, nx)``. The profile table then
+    contains a ``profile`` column with the profile index.
 
-    * TODO: take mask into account everywhere
     * TODO: separate FluxProfile.profile into a separate ProfileStack or HistogramStack class?
     * TODO: add ``solid_angle`` to input arrays.
 
     Parameters
     ----------
     x_image : array_like
-        Label image (2-dimensional)
+        Label image (2-dimensional) or stack of label images (3-dimensional)
     x_edges : array_like
         Defines binning in ``x`` (could be GLON, GLAT, DIST, ...)
     counts, background, exposure : array_like
         Input images (2-dimensional)
     mask : array_like
-        possibility to mask pixels (i.e. ignore in computations)
+        possibility to mask pixels (i.e. ignore in computations). Pixels where
+        the mask is ``False`` are ignored. Can be a stack of masks
+        (3-dimensional) to compute several profiles.
     """
 
     def __init__(self, x_image, x_edges, counts, background, exposure, mask=None):
-        import pandas as pd
         # Make sure inputs are numpy arrays
         x_edges = np.asanyarray(x_edges)
         x_image = np.asanyarray(x_image)
         counts = np.asanyarray(counts)
         background = np.asanyarray(background)
         exposure = np.asanyarray(exposure)
-        if mask:
-            mask = np.asanyarray(mask)
 
-        assert (x_image.shape == counts.shape == background.shape ==
-                exposure.shape == mask.shape)
+        assert counts.shape == background.shape == exposure.shape == x_image.shape[-2:]
 
         # Remember the shape of the 2D input arrays
-        self.shape = x_image.shape
-
-        # Store all input data as 1D vectors in a pandas.DataFrame
-        d = pd.DataFrame(index=np.arange(x_image.size))
-        d['x'] = x_image.flat
-        # By default np.digitize uses 0 as the underflow bin.
-        # Here we ignore under- and overflow, thus the -1
-        d['label'] = np.digitize(d['x'], x_edges) - 1
-        d['counts'] = counts.flat
-        d['background'] = background.flat
-        d['exposure'] = exposure.flat
-        if mask:
-            d['mask'] = mask.flat
-        else:
-            d['mask'] = np.ones_like(d['x'])
-        self.data = d
+        self.shape = counts.shape
+
+        if mask is None:
+            mask = np.ones(self.shape, dtype=bool)
+        mask = np.asanyarray(mask, dtype=bool)
+
+        self.stacked = x_image.ndim == 3 or mask.ndim == 3
+        self.n_profiles = max(_n_profiles(x_image), _n_profiles(mask))
+        shape = (self.n_profiles,) + self.shape
+        x_image = np.broadcast_to(x_image, shape)
+        mask = np.broadcast_to(mask, shape)
+
+        # By default np.digitize uses 0 as the underflow bin and
+        # len(x_edges) as the overflow bin. Here we ignore under- and
+        # overflow, thus the -1. Masked pixels get label -1 as well.
+        labels = np.digitize(x_image.ravel(), x_edges) - 1
+        labels[~mask.ravel()] = -1
+        self.labels = labels.reshape(shape)
+
+        self.data = dict(counts=counts, background=background, exposure=exposure)
 
         self.bins = np.arange(len(x_edges) + 1)
 
-        # Store all per-profile bin info in a pandas.DataFrame
-        p = pd.DataFrame(index=np.arange(x_edges.size - 1))
-        p['x_lo'] = x_edges[:-1]
-        p['x_hi'] = x_edges[1:]
-        p['x_center'] = 0.5 * (p['x_hi'] + p['x_lo'])
-        p['x_width'] = p['x_hi'] - p['x_lo']
+        # Store all per-profile bin info in a table
+        p = Table()
+        if self.stacked:
+            p['profile'] = np.repeat(np.arange(self.n_profiles), x_edges.size - 1)
+        x_lo = np.tile(x_edges[:-1], self.n_profiles)
+        x_hi = np.tile(x_edges[1:], self.n_profiles)
+        p['x_lo'] = x_lo
+        p['x_hi'] = x_hi
+        p['x_center'] = 0.5 * (x_hi + x_lo)
+        p['x_width'] = x_hi - x_lo
         self.profile = p
 
         # The x_edges array is longer by one than the profile arrays,
@@ -130,39 +144,35 @@ class FluxProfile(object):
 
         TODO: call `~gammapy.stats.compute_total_stats` instead.
 
-        Note: the current implementation is very inefficienct in speed and memory.
-        There are various fast implementations, but none is flexible enough to
-        allow combining many input quantities (counts, background, exposure) in a
-        flexlible way:
-        - `numpy.histogram`
-        - `scipy.ndimage.measurements.labeled_comprehension` and special cases
-
-        pandas DataFrame groupby followed by apply is flexible enough, I think:
-
-        http://pandas.pydata.org/pandas-docs/dev/groupby.html
-
         Returns
         -------
-        results : dict
-            Dictionary of profile measurements, also stored in ``self.profile``.
+        results : `~astropy.table.Table`
+            Table of profile measurements, also stored in ``self.profile``.
 
         See also
         --------
         gammapy.stats.compute_total_stats
         """
-        # Shortcuts to access class info needed in this method
-        d = self.data
-        # Here the pandas magic happens: we group pixels by label
-        g = d.groupby('label')
         p = self.profile
+        n_bins = self.x_edges.size - 1
+        n_total = self.n_profiles * n_bins
+
+        # Flat index of the profile bin for every pixel, computed once and
+        # used for all quantities. Masked pixels and under- and overflow
+        # are dropped.
+        labels = self.labels.reshape(self.n_profiles, -1)
+        valid = (labels >= 0) & (labels < n_bins)
+        flat_idx = (labels + n_bins * np.arange(self.n_profiles)[:, np.newaxis])[valid]
 
         # Compute number of entries in each profile bin
-        p['n_entries'] = g['x'].aggregate(len)
+        p['n_entries'] = np.bincount(flat_idx, minlength=n_total)
         for name in ['counts', 'background', 'exposure']:
-            p['{0}'.format(name)] = g[name].sum()
-            # p['{0}_mean'.format(name)] = p['{0}_sum'.format(name)] / p['n_entries']
+            weights = np.broadcast_to(self.data[name].ravel(), labels.shape)[valid]
+            p[name] = np.bincount(flat_idx, weights=weights, minlength=n_total)
+
         p['excess'] = p['counts'] - p['background']
-        p['flux'] = p['excess'] / p['exposure']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            p['flux'] = p['excess'] / p['exposure']
 
         return p
 
@@ -176,11 +186,13 @@ class FluxProfile(object):
         import matplotlib.pyplot as plt
         if ylabel is None:
             ylabel = which
-        p = self.profile
-        x = p['x_center']
-        xerr = 0.5 * p['x_width']
-        y = p[which]
-        plt.errorbar(x, y, xerr=xerr, fmt='o')
+        n_bins = self.x_edges.size - 1
+        for idx in range(self.n_profiles):
+            p = self.profile[idx * n_bins:(idx + 1) * n_bins]
+            x = p['x_center']
+            xerr = 0.5 * p['x_width']
+            y = p[which]
+            plt.errorbar(x, y, xerr=xerr, fmt='o')
         plt.xlabel(xlabel)
         plt.ylabel(ylabel)
         plt.grid()
@@ -242,61 +254,45 @@ def image_profile(profile_axis, image, lats, lons, binsz, counts=None,
         boundaries, profile values and errors.
     """
 
+    from .utils import _bincount_histogram
+
     coordinates = SkyImage.from_image_hdu(image).coordinates()
     lon = coordinates.data.lon.wrap_at('180d').degree
     lat = coordinates.data.lat.degree
     mask_init = (lats[0] <= lat) & (lat < lats[1])
     mask_bounds = mask_init & (lons[0] <= lon) & (lon < lons[1])
-    if mask != None:
+    if mask is not None:
         mask = mask_bounds & mask
     else:
         mask = mask_bounds
 
     # Need to preserve shape here so use multiply
     cut_image = image.data * mask
-    if counts != None:
+    if counts is not None:
         cut_counts = counts.data * mask
-    values = []
-    count_vals = []
 
     if profile_axis == 'lat':
-
         bins = np.arange((lats[1] - lats[0]) / binsz, dtype=int)
-        glats_min = lats[0] + bins[:-1] * binsz
-        glats_max = lats[0] + bins[1:] * binsz
-
-        # Table is required here to avoid rounding problems with floats
-        bounds = Table([glats_min, glats_max], names=('GLAT_MIN', 'GLAT_MAX'))
-        for bin in bins[:-1]:
-            lat_mask = (bounds['GLAT_MIN'][bin] <= lat) & (lat < bounds['GLAT_MAX'][bin])
-            lat_band = cut_image[lat_mask]
-            values.append(lat_band.sum())
-            if counts != None:
-                count_band = cut_counts[lat_mask]
-                count_vals.append(count_band.sum())
-            else:
-                count_vals.append(0)
-
+        edges = lats[0] + bins * binsz
+        x = lat
     elif profile_axis == 'lon':
-
         bins = np.arange((lons[1] - lons[0]) / binsz, dtype=int)
-        glons_min = lons[0] + bins[:-1] * binsz
-        glons_max = lons[0] + bins[1:] * binsz
-
-        # Table is required here to avoid rounding problems with floats
-        bounds = Table([glons_min, glons_max], names=('GLON_MIN', 'GLON_MAX'))
-        for bin in bins[:-1]:
-            lon_mask = (bounds['GLON_MIN'][bin] <= lon) & (lon < bounds['GLON_MAX'][bin])
-            lon_band = cut_image[lon_mask]
-            values.append(lon_band.sum())
-            if counts != None:
-                count_band = cut_counts[lon_mask]
-                count_vals.append(count_band.sum())
-            else:
-                count_vals.append(0)
+        edges = lons[0] + bins * binsz
+        x = lon
+
+    # Label pixels by profile bin, bins are [edges[i], edges[i + 1]) and
+    # pixels outside the bins get the label -1 or n_bins
+    n_bins = len(edges) - 1
+    labels = np.searchsorted(edges, x, side='right') - 1
+    labels[labels == n_bins] = -1
+    values = _bincount_histogram([labels], (n_bins,), weights=cut_image)
+    if counts is not None:
+        count_vals = _bincount_histogram([labels], (n_bins,), weights=cut_counts)
+    else:
+        count_vals = np.zeros(n_bins)
 
     if errors == True:
-        if counts != None:
+        if counts is not None:
             rel_errors = 1. / np.sqrt(count_vals)
             error_vals = values * rel_errors
         else:
@@ -305,17 +301,13 @@ def image_profile(profile_axis, image, lats, lons, binsz, counts=None,
         error_vals = np.zeros_like(values)
 
     if profile_axis == 'lat':
-        table = Table([Quantity(glats_min, 'deg'),
-                       Quantity(glats_max, 'deg'),
-                       values,
-                       error_vals],
-                      names=('GLAT_MIN', 'GLAT_MAX', 'BIN_VALUE', 'BIN_ERR'))
-
+        names = ('GLAT_MIN', 'GLAT_MAX', 'BIN_VALUE', 'BIN_ERR')
     elif profile_axis == 'lon':
-        table = Table([Quantity(glons_min, 'deg'),
-                       Quantity(glons_max, 'deg'),
-                       values,
-                       error_vals],
-                      names=('GLON_MIN', 'GLON_MAX', 'BIN_VALUE', 'BIN_ERR'))
+        names = ('GLON_MIN', 'GLON_MAX', 'BIN_VALUE', 'BIN_ERR')
 
+    table = Table([Quantity(edges[:-1], 'deg'),
+                   Quantity(edges[1:], 'deg'),
+                   values,
+                   error_vals],
+                  names=names)
     return table
@@ -0,0 +1,370 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Reusable reprojection plans for images with the same geometry."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import logging
+import numpy as np
+from astropy.coordinates import SkyCoord
+from astropy.wcs.utils import wcs_to_celestial_frame
+from ..utils.cache import LRUCache
+
+__all__ = [
+    'ReprojectionPlan',
+]
+
+# Interpolation orders, using the same names as `reproject.reproject_interp`
+_INTERPOLATION_ORDERS = {'nearest-neighbor': 0,
+                         'bilinear': 1,
+                         'biquadratic': 2,
+                         'bicubic': 3}
+
+# Reprojection plans, shared between all reprojections of the same geometry pair
+_REPROJECTION_PLAN_CACHE = LRUCache(maxsize=8)
+
+# Number of input / output pixel pairs passed to `compute_overlap` at once
+_OVERLAP_CHUNK_SIZE = 2 ** 20
+
+log = logging.getLogger(__name__)
+
+
+def _get_compute_overlap():
+    """Get the spherical polygon overlap function from reproject.
+
+    ``compute_overlap`` is not part of the public reproject API. It exists
+    as ``reproject.spherical_intersect.overlap.compute_overlap`` in reproject
+    0.1 to 0.4; ``None`` is returned if it can't be imported.
+    """
+    try:
+        from reproject.spherical_intersect.overlap import compute_overlap
+    except ImportError:
+        return None
+    return compute_overlap
+
+
+def _convert_world_coordinates(lon, lat, wcs_in, wcs_out):
+    """Convert world coordinates from the frame of ``wcs_in`` to ``wcs_out``."""
+    frame_in = wcs_to_celestial_frame(wcs_in)
+    frame_out = wcs_to_celestial_frame(wcs_out)
+    if frame_in.is_equivalent_frame(frame_out):
+        return lon, lat
+
+    coordinates = SkyCoord(lon, lat, unit='deg', frame=frame_in)
+    coordinates = coordinates.transform_to(frame_out)
+    return coordinates.spherical.lon.deg, coordinates.spherical.lat.deg
+
+
+def _pixel_corners(wcs, shape):
+    """World coordinates of the pixel corners, shape ``(ny + 1, nx + 1)``."""
+    y, x = np.indices((shape[0] + 1, shape[1] + 1), dtype=float) - 0.5
+    return wcs.wcs_pix2world(x, y, 0)
+
+
+def _edge_midpoints(lon, lat, axis):
+    """World coordinates of the midpoints of the pixel edges along an axis.
+
+    The midpoints are computed on the great circles between the corners.
+    """
+    lon, lat = np.radians(lon), np.radians(lat)
+    vectors = np.array([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+    if axis == 0:
+        x, y, z = vectors[:, :-1] + vectors[:, 1:]
+    else:
+        x, y, z = vectors[:, :, :-1] + vectors[:, :, 1:]
+    return np.degrees(np.arctan2(y, x)), np.degrees(np.arctan2(z, np.hypot(x, y)))
+
+
+def _is_discontinuous(x, y, x_mid, y_mid, axis):
+    """Whether pixel edges cross a discontinuity of the projection.
+
+    For a continuous projection the edge midpoint lies halfway between the
+    projected corners. At a discontinuity, e.g. the longitude wrap of an
+    all-sky image, it lies close to one of the corners instead.
+    """
+    if axis == 0:
+        x0, y0, x1, y1 = x[:-1], y[:-1], x[1:], y[1:]
+    else:
+        x0, y0, x1, y1 = x[:, :-1], y[:, :-1], x[:, 1:], y[:, 1:]
+    length = np.hypot(x1 - x0, y1 - y0)
+    distance = np.maximum(np.hypot(x_mid - x0, y_mid - y0),
+                          np.hypot(x_mid - x1, y_mid - y1))
+    with np.errstate(invalid='ignore'):
+        return ~(distance <= 0.75 * length + 1), length
+
+
+def _corner_polygons(lon, lat, j, i):
+    """Pixel corner polygons in radians, as expected by `compute_overlap`."""
+    idx_j = np.array([j, j, j + 1, j + 1]).T[:, ::-1]
+    idx_i = np.array([i, i + 1, i + 1, i]).T[:, ::-1]
+    # The overlap computation requires C-contiguous arrays
+    lon = np.ascontiguousarray(np.radians(lon[idx_j, idx_i]))
+    lat = np.ascontiguousarray(np.radians(lat[idx_j, idx_i]))
+    return lon, lat
+
+
+class ReprojectionPlan(object):
+    """
+    Reprojection from one image geometry to another.
+
+    The pixel-to-pixel mapping is computed once and can then be applied to
+    many images or cube slices with the same geometry. Reprojected values
+    are the same as for `reproject.reproject_exact` and, apart from the
+    treatment of the outermost input pixels, `reproject.reproject_interp`.
+
+    For ``mode='interp'`` the input pixel coordinates of the output pixel
+    centers are stored. For ``mode='exact'`` the spherical overlap areas of
+    input and output pixels are stored as a sparse matrix. This uses the
+    ``compute_overlap`` function of reproject 0.1 to 0.4, which is not part
+    of the public reproject API; if it's not available every image is
+    reprojected with `reproject.reproject_exact` instead.
+
+    Use `ReprojectionPlan.get` to re-use plans for the same geometry pair.
+
+    Parameters
+    ----------
+    wcs_in, wcs_out : `~astropy.wcs.WCS`
+        Celestial input and output WCS.
+    shape_in, shape_out : tuple
+        Input and output image shape.
+    mode : {'interp', 'exact'}
+        Reprojection mode.
+    order : int or str
+        Interpolation order for ``mode='interp'``, e.g. ``'bilinear'``.
+
+    Examples
+    --------
+    >>> from gammapy.image import SkyImage, ReprojectionPlan
+    >>> image = SkyImage.empty(nxpix=100, nypix=100, binsz=0.02)
+    >>> reference = SkyImage.empty(nxpix=50, nypix=50, binsz=0.03, coordsys='CEL',
+    ...                            xref=266.4, yref=-28.9)
+    >>> plan = ReprojectionPlan(image.wcs, image.data.shape,
+    ...                         reference.wcs, reference.data.shape)
+    >>> data, footprint = plan.apply(image.data)
+    """
+
+    def __init__(self, wcs_in, shape_in, wcs_out, shape_out, mode='interp',
+                 order='bilinear'):
+        self.wcs_in = wcs_in.celestial
+        self.wcs_out = wcs_out.celestial
+        self.shape_in = tuple(shape_in[-2:])
+        self.shape_out = tuple(shape_out[-2:])
+        self.mode = mode
+
+        if mode == 'interp':
+            self.order = _INTERPOLATION_ORDERS.get(order, order)
+            self._setup_interp()
+        elif mode == 'exact':
+            self._setup_exact()
+        else:
+            raise ValueError("Invalid reprojection mode, either choose 'interp' or 'exact'")
+
+    @classmethod
+    def get(cls, wcs_in, shape_in, wcs_out, shape_out, mode='interp',
+            order='bilinear'):
+        """
+        Get cached reprojection plan for a given geometry pair.
+
+        Same parameters as `ReprojectionPlan`. Plans are looked up by WCS
+        headers and shapes in a module level LRU cache.
+        """
+        key = (wcs_in.celestial.to_header_string(relax=True), tuple(shape_in[-2:]),
+               wcs_out.celestial.to_header_string(relax=True), tuple(shape_out[-2:]),
+               mode, order if mode == 'interp' else None)
+
+        def create():
+            return cls(wcs_in, shape_in, wcs_out, shape_out, mode=mode, order=order)
+
+        return _REPROJECTION_PLAN_CACHE.get_or_compute(key, create)
+
+    def _setup_interp(self):
+        ny_out, nx_out = self.shape_out
+        ny_in, nx_in = self.shape_in
+
+        # Position of output pixel centers in the input image
+        yp_out, xp_out = np.indices(self.shape_out, dtype=float)
+        lon, lat = self.wcs_out.wcs_pix2world(xp_out, yp_out, 0)
+        lon, lat = _convert_world_coordinates(lon, lat, self.wcs_out, self.wcs_in)
+        xp_in, yp_in = self.wcs_in.wcs_world2pix(lon, lat, 0)
+
+        # Check that coordinates round-trip, if not then set to NaN
+        lon, lat = _convert_world_coordinates(lon, lat, self.wcs_in, self.wcs_out)
+        xp_check, yp_check = self.wcs_out.wcs_world2pix(lon, lat, 0)
+        with np.errstate(invalid='ignore'):
+            reset = (np.abs(xp_out - xp_check) > 1) | (np.abs(yp_out - yp_check) > 1)
+        xp_in[reset] = np.nan
+        yp_in[reset] = np.nan
+
+        coordinates = np.array([yp_in.ravel(), xp_in.ravel()])
+        with np.errstate(invalid='ignore'):
+            outside = ((coordinates[0] < -0.5) | (coordinates[0] > ny_in - 0.5) |
+                       (coordinates[1] < -0.5) | (coordinates[1] > nx_in - 0.5))
+        outside |= ~np.isfinite(coordinates).all(axis=0)
+        coordinates[:, outside] = -1
+
+        # Only the bounding box of the requested coordinates is needed,
+        # plus one pixel padding for the interpolation. Spline interpolation
+        # of higher order depends on the whole image via the spline filter.
+        if outside.all():
+            self._subset = None
+        elif self.order > 1:
+            self._subset = (slice(None), slice(None))
+        else:
+            jmin, imin = np.floor(coordinates[:, ~outside].min(axis=1)).astype(int) - 1
+            jmax, imax = np.ceil(coordinates[:, ~outside].max(axis=1)).astype(int) + 2
+            jmin, imin = max(jmin, 0), max(imin, 0)
+            self._subset = (slice(jmin, min(jmax, ny_in)),
+                            slice(imin, min(imax, nx_in)))
+            coordinates[0] -= jmin
+            coordinates[1] -= imin
+
+        # Values are defined at the pixel centers, so the image is padded by
+        # one pixel to treat the outer half of the outer pixels correctly
+        self._coordinates = coordinates + 1
+        self._outside = outside
+
+    def _setup_exact(self):
+        compute_overlap = _get_compute_overlap()
+        if compute_overlap is None:
+            log.warning('reproject.spherical_intersect.overlap.compute_overlap is not '
+                        'available, using reproject.reproject_exact for every image.')
+            self._weights = None
+            return
+
+        from scipy.sparse import csr_matrix
+
+        ny_in, nx_in = self.shape_in
+        ny_out, nx_out = self.shape_out
+
+        lon_in, lat_in = _pixel_corners(self.wcs_in, self.shape_in)
+        lon_out, lat_out = _pixel_corners(self.wcs_out, self.shape_out)
+        lon_in, lat_in = _convert_world_coordinates(lon_in, lat_in,
+                                                    self.wcs_in, self.wcs_out)
+        xp_inout, yp_inout = self.wcs_out.wcs_world2pix(lon_in, lat_in, 0)
+
+        # Input pixel edges crossing a discontinuity of the output projection
+        # have projected corners on opposite sides of the output image
+        edges_crossing, edges_length = [], []
+        for axis in [0, 1]:
+            lon_mid, lat_mid = _edge_midpoints(lon_in, lat_in, axis)
+            x_mid, y_mid = self.wcs_out.wcs_world2pix(lon_mid, lat_mid, 0)
+            crossing, length = _is_discontinuous(xp_inout, yp_inout, x_mid, y_mid, axis)
+            edges_crossing.append(crossing)
+            edges_length.append(np.where(crossing, 0, length))
+
+        j, i = [_.ravel() for _ in np.indices(self.shape_in)]
+        corners_x = np.array([xp_inout[j, i], xp_inout[j, i + 1],
+                              xp_inout[j + 1, i + 1], xp_inout[j + 1, i]])
+        corners_y = np.array([yp_inout[j, i], yp_inout[j, i + 1],
+                              yp_inout[j + 1, i + 1], yp_inout[j + 1, i]])
+
+        valid = np.isfinite(corners_x).all(axis=0) & np.isfinite(corners_y).all(axis=0)
+        crossing = (edges_crossing[0][j, i] | edges_crossing[0][j, i + 1] |
+                    edges_crossing[1][j, i] | edges_crossing[1][j + 1, i])
+
+        # Output pixels covered by a continuous input pixel: bounding box of
+        # the projected corners
+        regular = valid & ~crossing
+        xmin = np.maximum((corners_x[:, regular].min(axis=0) + 0.5).astype(int), 0)
+        xmax = np.minimum((corners_x[:, regular].max(axis=0) + 0.5).astype(int), nx_out - 1)
+        ymin = np.maximum((corners_y[:, regular].min(axis=0) + 0.5).astype(int), 0)
+        ymax = np.minimum((corners_y[:, regular].max(axis=0) + 0.5).astype(int), ny_out - 1)
+        nx_span = np.maximum(xmax - xmin + 1, 0)
+        n_pairs = nx_span * np.maximum(ymax - ymin + 1, 0)
+
+        pixel = np.repeat(np.arange(len(n_pairs)), n_pairs)
+        offset = np.arange(n_pairs.sum()) - np.repeat(np.cumsum(n_pairs) - n_pairs, n_pairs)
+        pairs_in = [np.flatnonzero(regular)[pixel]]
+        pairs_out = [(ymin[pixel] + offset // nx_span[pixel]) * nx_out +
+                     xmin[pixel] + offset % nx_span[pixel]]
+
+        # Input pixels crossing a discontinuity are split into pieces, every
+        # piece contains at least one corner and is not larger than the longest
+        # continuous edge. So only output pixels in a box of that size around
+        # each corner are considered, which bounds the number of pixel pairs
+        # e.g. for the pixels at the longitude wrap of an all-sky image.
+        for idx in np.flatnonzero(valid & crossing):
+            jc, ic = j[idx], i[idx]
+            radius = 1 + int(np.ceil(max(edges_length[0][jc, ic], edges_length[0][jc, ic + 1],
+                                         edges_length[1][jc, ic], edges_length[1][jc + 1, ic])))
+            candidates = []
+            for x, y in zip(corners_x[:, idx], corners_y[:, idx]):
+                x, y = int(x + 0.5), int(y + 0.5)
+                jj, ii = np.mgrid[max(y - radius, 0):min(y + radius, ny_out - 1) + 1,
+                                  max(x - radius, 0):min(x + radius, nx_out - 1) + 1]
+                candidates.append((jj * nx_out + ii).ravel())
+            candidates = np.unique(np.concatenate(candidates))
+            pairs_in.append(np.full(len(candidates), idx, dtype=int))
+            pairs_out.append(candidates)
+
+        pairs_in, pairs_out = np.concatenate(pairs_in), np.concatenate(pairs_out)
+
+        values = np.empty(len(pairs_in))
+        for start in range(0, len(pairs_in), _OVERLAP_CHUNK_SIZE):
+            chunk = slice(start, start + _OVERLAP_CHUNK_SIZE)
+            jj, ii = np.divmod(pairs_out[chunk], nx_out)
+            ilon, ilat = _corner_polygons(lon_in, lat_in, j[pairs_in[chunk]], i[pairs_in[chunk]])
+            olon, olat = _corner_polygons(lon_out, lat_out, jj, ii)
+            overlap = compute_overlap(ilon, ilat, olon, olat)[0]
+            original = compute_overlap(olon, olat, olon, olat)[0]
+            values[chunk] = overlap / original
+
+        shape = (ny_out * nx_out, ny_in * nx_in)
+        self._weights = csr_matrix((values, (pairs_out, pairs_in)), shape=shape)
+        self._footprint = np.asarray(self._weights.sum(axis=1)).reshape(self.shape_out)
+
+    def _apply_interp(self, array):
+        from scipy.ndimage import map_coordinates
+
+        if self._subset is None:
+            return np.nan * np.ones(self.shape_out)
+
+        array = np.pad(array[self._subset], 1, mode='edge')
+        data = map_coordinates(array, self._coordinates, order=self.order,
+                               cval=np.nan, mode='constant')
+        data[self._outside] = np.nan
+        return data.reshape(self.shape_out)
+
+    def _apply_reproject_exact(self, array):
+        from reproject import reproject_exact
+        return reproject_exact((array, self.wcs_in), self.wcs_out,
+                               shape_out=self.shape_out, parallel=False)
+
+    def apply(self, array):
+        """
+        Reproject data.
+
+        Parameters
+        ----------
+        array : `~numpy.ndarray`
+            Image or cube with the input image shape as last two dimensions.
+            Cubes are reprojected slice by slice, for ``mode='exact'`` all
+            slices are reprojected with a single sparse matrix product.
+
+        Returns
+        -------
+        data, footprint : `~numpy.ndarray`
+            Reprojected data and footprint, like returned by
+            `reproject.reproject_interp` and `reproject.reproject_exact`.
+        """
+        array = np.asarray(array)
+        if array.shape[-2:] != self.shape_in:
+            raise ValueError('Array shape {} does not match plan input shape {}'
+                             ''.format(array.shape, self.shape_in))
+
+        slices = np.asarray(array.reshape((-1,) + self.shape_in), dtype=float)
+        shape = array.shape[:-2] + self.shape_out
+
+        if self.mode == 'interp':
+            data = np.array([self._apply_interp(_) for _ in slices]).reshape(shape)
+            return data, (~np.isnan(data)).astype(float)
+
+        if self._weights is None:
+            results = [self._apply_reproject_exact(_) for _ in slices]
+            data = np.array([_[0] for _ in results]).reshape(shape)
+            footprint = np.array([_[1] for _ in results]).reshape(shape)
+            return data, footprint
+
+        values = slices.reshape(len(slices), -1).T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            data = self._weights.dot(values).T.reshape((-1,) + self.shape_out)
+            data /= self._footprint
+        data = data.reshape(shape)
+        return data, self._footprint * np.ones_like(data)
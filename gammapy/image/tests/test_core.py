@@ -9,11 +9,12 @@ from astropy.io import fits
 from astropy.units import Quantity
 from astropy.tests.helper import pytest, assert_quantity_allclose
 from astropy.wcs import WcsError
-from regions import PixCoord, CirclePixelRegion, CircleSkyRegion
+from regions import PixCoord, CirclePixelRegion, CircleSkyRegion, RectanglePixelRegion
 from ...utils.testing import requires_dependency, requires_data
 from ...data import DataStore
 from ...datasets import load_poisson_stats_image
-from ..core import SkyImage
+from ..core import (SkyImage, SkyImageCollection, clear_geometry_cache, _get_geometry,
+                    _LazySkyImage)
 
 
 class TestImage:
@@ -393,3 +394,93 @@ def test_region_mask():
     sky_region = region.to_sky(wcs=mask.wcs)
     actual = mask.region_mask(sky_region)
     assert_equal(actual.data, expected)
+
+
+def test_region_labels():
+    image = SkyImage.empty(nxpix=6, nypix=4)
+    regions = [CirclePixelRegion(center=PixCoord(x=1, y=1), radius=1.1),
+               RectanglePixelRegion(center=PixCoord(x=3.5, y=2), width=2, height=3)]
+    labels = image.region_labels(regions)
+    expected = [
+        [0, 1, 0, 0, 0, 0],
+        [1, 1, 1, 2, 2, 0],
+        [0, 1, 0, 2, 2, 0],
+        [0, 0, 0, 2, 2, 0],
+    ]
+    assert_equal(labels.data, expected)
+
+    # Sky regions and regions outside the image
+    sky_region = regions[0].to_sky(wcs=image.wcs)
+    outside = CirclePixelRegion(center=PixCoord(x=20, y=20), radius=2)
+    labels = image.region_labels([outside, sky_region])
+    assert_equal(labels.data, 2 * image.region_mask(regions[0]).data)
+
+
+@pytest.mark.parametrize(('lon', 'lat', 'frame'), [
+    (30, 60, 'galactic'), (-20, -75, 'galactic'), (0, 89, 'galactic'),
+    (179.5, 10, 'galactic'), (100, 30, 'icrs'),
+])
+def test_region_mask_sky_circle_allsky(lon, lat, frame):
+    # Sky circles at high latitude, containing the pole, at the longitude
+    # wrap and in another frame than the image
+    image = SkyImage.empty(nxpix=360, nypix=180, binsz=1)
+    center = SkyCoord(lon, lat, unit='deg', frame=frame)
+    region = CircleSkyRegion(center=center, radius=Angle(5, 'deg'))
+
+    actual = image.region_mask(region)
+    expected = image.coordinates().separation(center) < Angle(5, 'deg')
+    assert expected.sum() > 0
+    assert_equal(actual.data, expected)
+
+
+def test_geometry_cache():
+    image = SkyImage.empty(nxpix=5, nypix=4, binsz=0.1)
+    other = SkyImage.empty_like(image, fill=1)
+
+    geometry = _get_geometry(image.wcs, image.data.shape)
+    assert image._geometry is geometry
+    assert other._geometry is geometry
+
+    # Different shape gives a different geometry
+    assert _get_geometry(image.wcs, (3, 3)) is not geometry
+
+    pixcoord = image.coordinates_pix()
+    desired = image.wcs_pixel_to_skycoord(xp=pixcoord.x, yp=pixcoord.y)
+    actual = image.coordinates()
+    assert_allclose(actual.data.lon.deg, desired.data.lon.deg)
+    assert_allclose(actual.data.lat.deg, desired.data.lat.deg)
+    assert actual.frame.name == 'galactic'
+
+    vectors = geometry.unit_vectors
+    assert vectors.shape == (3, 4, 5)
+    assert_allclose(vectors[:, 0, 0], desired[0, 0].cartesian.xyz.value)
+
+    # Returned solid angle is a copy of the cached array
+    solid_angle = image.solid_angle()
+    solid_angle *= 2
+    assert_allclose(image.solid_angle(), solid_angle / 2)
+
+    assert geometry.nbytes == 2 * 8 * 20 + 2 * 8 * 30 + 3 * 8 * 20 + 8 * 20
+    clear_geometry_cache()
+    assert _get_geometry(image.wcs, image.data.shape) is not geometry
+
+
+def test_image_collection_lazy_read(tmpdir):
+    images = SkyImageCollection(meta={'TELESCOP': 'HESS'})
+    images['counts'] = SkyImage.empty(nxpix=3, nypix=2, fill=1)
+    images['exposure'] = SkyImage.empty(nxpix=3, nypix=2, fill=2)
+    filename = str(tmpdir / 'images.fits')
+    images.write(filename)
+
+    actual = SkyImageCollection.read(filename, lazy=True)
+    assert isinstance(dict.__getitem__(actual, 'counts'), _LazySkyImage)
+    assert isinstance(dict.__getitem__(actual, 'exposure'), _LazySkyImage)
+
+    assert_allclose(actual.exposure.data, 2)
+    assert isinstance(dict.__getitem__(actual, 'exposure'), SkyImage)
+    assert isinstance(dict.__getitem__(actual, 'counts'), _LazySkyImage)
+    assert actual['exposure'].meta['TELESCOP'] == 'HESS'
+
+    image = SkyImage.read(filename, ext=1, memmap=False)
+    assert image.name == 'EXPOSURE'
+    assert_allclose(image.data, 2)
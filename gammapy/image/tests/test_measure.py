@@ -1,12 +1,14 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
 import numpy as np
+from numpy.testing import assert_allclose
 from astropy.units import Quantity
 from astropy.modeling.models import Gaussian2D
 from astropy.tests.helper import assert_quantity_allclose
 from astropy.coordinates import SkyCoord
 from ...utils.testing import requires_dependency
 from ...image import (measure_labeled_regions,
+                      measure_labeled_image_moments,
                       measure_containment_radius,
                       measure_image_moments,
                       measure_containment,
@@ -52,6 +54,29 @@ def test_measure():
     # TODO: check output!
 
 
+@requires_dependency('scipy')
+def test_measure_labeled_image_moments():
+    labels = np.zeros(GAUSSIAN_IMAGE.data.shape, dtype=int)
+    labels[90:110, 80:120] = 1
+    labels[:50, :30] = 3
+    table = measure_labeled_image_moments(GAUSSIAN_IMAGE, labels)
+
+    assert_allclose(table['NUMBER'], [1, 2, 3])
+    assert_allclose(table['AREA'], [800, 0, 1500])
+    assert_allclose(table['XMIN'], [80, -1, 0])
+    assert_allclose(table['XMAX'], [119, -1, 29])
+    assert_allclose(table['YMIN'], [90, -1, 0])
+    assert_allclose(table['YMAX'], [109, -1, 49])
+
+    for idx in [1, 3]:
+        image = GAUSSIAN_IMAGE.copy()
+        image.data = np.where(labels == idx, image.data, np.nan) * image.data.unit
+        moments = measure_image_moments(image)
+        row = table[idx - 1]
+        for name, ref in zip(['SUM', 'X_CMS', 'Y_CMS', 'X_SIGMA', 'Y_SIGMA', 'SIGMA'], moments):
+            assert_allclose(row[name], ref.value, rtol=1e-10)
+
+
 def test_measure_image_moments():
     """Test measure_image_moments function"""
     moments = measure_image_moments(GAUSSIAN_IMAGE)
@@ -92,3 +117,32 @@ def test_measure_curve_of_growth():
     sigma = Quantity(0.2, 'deg')
     containment_ana = Quantity(1 - np.exp(-0.5 * (radius / sigma) ** 2).value, 'cm-2 s-1')
     assert_quantity_allclose(containment, containment_ana, rtol=0.1)
+
+
+def test_measure_containment_radius_batch():
+    """Test measure_containment_radius and measure_curve_of_growth for several positions"""
+    position = SkyCoord([0, 0.1], [0, 0.1], frame='galactic', unit='deg')
+    rad = measure_containment_radius(GAUSSIAN_IMAGE, position, [0.5, 0.8])
+    assert rad.shape == (2, 2)
+    ref = Quantity(0.2 * np.sqrt(2 * np.log(5)), 'deg')
+    assert_quantity_allclose(rad[0, 1], ref, rtol=0.01)
+    assert rad[1, 1] > rad[0, 1]
+
+    radius, containment = measure_curve_of_growth(GAUSSIAN_IMAGE, position, Quantity(0.6, 'deg'))
+    assert containment.shape == (2, 10)
+    for idx in [0, 1]:
+        ref = measure_containment(GAUSSIAN_IMAGE, position[idx], radius[5])
+        assert_quantity_allclose(containment[idx, 5], ref)
+
+
+def test_measure_containment_radius_negative():
+    """Cumulative flux is not monotonic for images with negative pixels"""
+    image = SkyImage.empty(nxpix=11, nypix=11, binsz=1)
+    image.data[5, 5] = 1
+    image.data[5, 6] = -1
+    image.data[5, 7] = 1.5
+    position = SkyCoord(0, 0, frame='galactic', unit='deg')
+
+    rad = measure_containment_radius(image, position, [0.5, 0.8, 1.1])
+    assert_allclose(rad[:2].deg, [0, 2], atol=1e-6)
+    assert np.isnan(rad[2])
@@ -8,6 +8,7 @@ from ...image import (
     SkyImage,
     compute_binning,
     image_profile,
+    FluxProfile,
 )
 
 
@@ -22,6 +23,30 @@ def test_compute_binning():
     assert_allclose(bin_edges, [1, 2, 2.66666667, 4])
 
 
+def test_flux_profile():
+    x_image = np.array([[0.5, 1.5, 2.5], [0.5, 1.5, 3.5]])
+    counts = np.array([[1., 2, 3], [4, 5, 6]])
+    background = 0.5 * np.ones_like(counts)
+    exposure = 2 * np.ones_like(counts)
+    mask = np.array([[True, True, True], [False, True, True]])
+
+    profile = FluxProfile(x_image, [0, 1, 2, 3], counts, background, exposure, mask)
+    p = profile.compute()
+    assert_allclose(p['x_center'], [0.5, 1.5, 2.5])
+    assert_allclose(p['n_entries'], [1, 2, 1])
+    assert_allclose(p['counts'], [1, 7, 3])
+    assert_allclose(p['excess'], [0.5, 6, 2.5])
+    assert_allclose(p['flux'], [0.25, 1.5, 1.25])
+
+    # Several profiles at once, e.g. in two rows of the image
+    masks = np.array([[[1, 1, 1], [0, 0, 0]], [[0, 0, 0], [1, 1, 1]]])
+    profile = FluxProfile(x_image, [0, 1, 2, 3], counts, background, exposure, masks)
+    p = profile.compute()
+    assert_allclose(p['profile'], [0, 0, 0, 1, 1, 1])
+    assert_allclose(p['counts'], [1, 2, 3, 4, 5, 0])
+    assert_allclose(p['n_entries'], [1, 1, 1, 1, 1, 0])
+
+
 @requires_data('gammapy-extra')
 def test_image_lat_profile():
     """Tests GLAT profile with image of 1s of known size and shape."""
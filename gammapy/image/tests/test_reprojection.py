@@ -0,0 +1,89 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
+from ...utils.testing import requires_dependency
+from ..core import SkyImage
+from ..reprojection import ReprojectionPlan
+
+
+def make_images():
+    random_state = np.random.RandomState(0)
+    image = SkyImage.empty(nxpix=60, nypix=50, binsz=0.05)
+    image.data = random_state.uniform(size=image.data.shape)
+    reference = SkyImage.empty(nxpix=40, nypix=45, binsz=0.04, coordsys='CEL',
+                               xref=266.4, yref=-28.9)
+    return image, reference
+
+
+@requires_dependency('scipy')
+@requires_dependency('reproject')
+def test_reprojection_plan_interp():
+    from reproject import reproject_interp
+    image, reference = make_images()
+
+    plan = ReprojectionPlan.get(image.wcs, image.data.shape, reference.wcs,
+                                reference.data.shape, order='bilinear')
+    assert ReprojectionPlan.get(image.wcs, image.data.shape, reference.wcs,
+                                reference.data.shape, order='bilinear') is plan
+
+    actual, footprint = plan.apply(image.data)
+    desired = reproject_interp((image.data, image.wcs), reference.wcs,
+                               shape_out=reference.data.shape)[0]
+    assert_allclose(actual, desired)
+    assert_equal(footprint, 1)
+
+    # Cubes are reprojected slice by slice
+    cube = np.array([image.data, 2 * image.data])
+    actual = plan.apply(cube)[0]
+    assert actual.shape == (2, 45, 40)
+    assert_allclose(actual[1], 2 * desired)
+
+
+@requires_dependency('scipy')
+@requires_dependency('reproject')
+def test_reprojection_plan_exact():
+    from reproject import reproject_exact
+    image, reference = make_images()
+
+    actual = image.reproject(reference, mode='exact')
+    desired = reproject_exact((image.data, image.wcs), reference.wcs,
+                              shape_out=reference.data.shape, parallel=False)[0]
+    assert_allclose(actual.data, desired)
+
+
+@requires_dependency('scipy')
+@requires_dependency('reproject')
+def test_reprojection_plan_exact_allsky():
+    from reproject import reproject_exact
+    random_state = np.random.RandomState(0)
+    image = SkyImage.empty(nxpix=72, nypix=36, binsz=5)
+    image.data = random_state.uniform(size=image.data.shape)
+    # Input pixels at the longitude wrap of the reference image cross a
+    # discontinuity of the output projection
+    reference = SkyImage.empty(nxpix=60, nypix=30, binsz=5.5, xref=100, yref=10)
+
+    plan = ReprojectionPlan(image.wcs, image.data.shape, reference.wcs,
+                            reference.data.shape, mode='exact')
+    actual, footprint = plan.apply(image.data)
+    desired = reproject_exact((image.data, image.wcs), reference.wcs,
+                              shape_out=reference.data.shape, parallel=False)
+    assert_allclose(actual, desired[0])
+    assert_allclose(footprint, desired[1], atol=1e-10)
+
+
+@requires_dependency('scipy')
+@requires_dependency('reproject')
+def test_reprojection_plan_exact_fallback(monkeypatch):
+    from reproject import reproject_exact
+    from .. import reprojection
+    image, reference = make_images()
+    monkeypatch.setattr(reprojection, '_get_compute_overlap', lambda: None)
+
+    plan = ReprojectionPlan(image.wcs, image.data.shape, reference.wcs,
+                            reference.data.shape, mode='exact')
+    actual, footprint = plan.apply(np.array([image.data, 2 * image.data]))
+    desired = reproject_exact((image.data, image.wcs), reference.wcs,
+                              shape_out=reference.data.shape, parallel=False)
+    assert_allclose(actual[1], 2 * desired[0])
+    assert_allclose(footprint[0], desired[1])
@@ -0,0 +1,40 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+from numpy.testing import assert_allclose
+from ...utils.testing import requires_dependency
+from ..core import SkyImage, SkyImageCollection
+from ..utils import ring_correlate
+from ..tiling import process_image_tiles, _tile_slices
+
+
+def _ring_tile(images):
+    return dict(ring=ring_correlate(images['counts'].data, 3, 5),
+                lon=images['counts'].coordinates().data.lon.deg)
+
+
+def test_tile_slices():
+    slices = _tile_slices((10, 7), (4, 4), halo=2)
+    assert len(slices) == 6
+    outer, core, inner = slices[4]
+    assert outer == (slice(6, 10), slice(0, 6))
+    assert core == (slice(8, 10), slice(0, 4))
+    assert inner == (slice(2, 4), slice(0, 4))
+
+
+@requires_dependency('scipy')
+def test_process_image_tiles():
+    random_state = np.random.RandomState(0)
+    counts = SkyImage.empty(nxpix=37, nypix=23)
+    counts.data = random_state.poisson(1, counts.data.shape).astype(float)
+    images = SkyImageCollection(counts=counts, wcs=counts.wcs)
+
+    result = process_image_tiles(images, _ring_tile, halo=5, tile_shape=(10, 15))
+
+    assert_allclose(result['ring'].data, ring_correlate(counts.data, 3, 5))
+    # Tile WCS are shifted correctly
+    assert_allclose(result['lon'].data, counts.coordinates().data.lon.deg)
+
+    result = process_image_tiles(images, _ring_tile, halo=5, tile_shape=(10, 15),
+                                 parallel=True)
+    assert_allclose(result['ring'].data, ring_correlate(counts.data, 3, 5))
@@ -14,6 +14,10 @@ from ...cube import SkyCube
 from ...image import (
     binary_disk,
     binary_ring,
+    disk_correlate,
+    ring_correlate,
+    atrous_image,
+    atrous_levels,
     make_header,
     images_to_cube,
     block_reduce_hdu,
@@ -21,6 +25,7 @@ from ...image import (
     lon_lat_rectangle_mask,
     SkyImage,
     SkyImageList)
+from ..utils import _bincount_histogram
 
 
 def test_binary_disk():
@@ -41,6 +46,57 @@ def test_binary_ring():
     assert_equal(actual, desired)
 
 
+@requires_dependency('scipy')
+@pytest.mark.parametrize('mode', ['constant', 'reflect', 'mirror', 'nearest', 'wrap'])
+def test_ring_correlate_fft(mode):
+    random_state = np.random.RandomState(seed=0)
+    image = random_state.uniform(size=(300, 200))
+
+    desired = ring_correlate(image, 5, 8, mode=mode, method='direct')
+    actual = ring_correlate(image, 5, 8, mode=mode, method='fft')
+    assert_allclose(actual, desired)
+
+    desired = disk_correlate(image, 4, mode=mode, method='direct')
+    actual = disk_correlate(image, 4, mode=mode, method='fft')
+    assert_allclose(actual, desired)
+
+
+@requires_dependency('scipy')
+def test_ring_correlate_fft_counts():
+    random_state = np.random.RandomState(seed=0)
+    image = random_state.poisson(lam=2, size=(500, 40))
+
+    desired = ring_correlate(image, 10, 20, method='direct')
+    actual = ring_correlate(image, 10, 20, method='fft')
+    assert actual.dtype == image.dtype
+    assert_equal(actual, desired)
+
+    with pytest.raises(ValueError):
+        ring_correlate(image, 10, 20, method='spam')
+
+
+@requires_dependency('scipy')
+def test_atrous_image():
+    random_state = np.random.RandomState(seed=0)
+    image = random_state.poisson(lam=2, size=(100, 80))
+
+    desired = atrous_image(image, n_levels=4, method='direct')
+    assert len(desired) == 5
+    assert_allclose(np.sum(desired, axis=0), image)
+
+    actual = atrous_image(image, n_levels=4, method='fft')
+    assert_allclose(actual, desired, atol=1e-10)
+
+    actual = list(atrous_levels(image, n_levels=4, dtype='float32'))
+    assert actual[0].dtype == np.float32
+    assert_allclose(actual, desired, atol=1e-5)
+
+    # Constant images only have a residual
+    actual = atrous_image(np.ones((50, 50)), n_levels=3)
+    assert_allclose(actual[0], 0, atol=1e-12)
+    assert_allclose(actual[-1], 1)
+
+
 @pytest.mark.xfail
 def test_process_image_pixels():
     """Check the example how to implement convolution given in the docstring"""
@@ -69,6 +125,56 @@ def test_process_image_pixels():
     assert_allclose(actual, desired)
 
 
+def _sum_windows(images, kernel):
+    return dict(image=np.sum(images['image'] * kernel, axis=(-2, -1)),
+                norm=np.sum(kernel, axis=(-2, -1)))
+
+
+def test_process_image_windows():
+    from ..utils import process_image_pixels, process_image_windows
+
+    def sum_function(images, kernel):
+        return dict(image=np.sum(images['image'] * kernel), norm=np.sum(kernel))
+
+    random_state = np.random.RandomState(seed=0)
+    image = random_state.uniform(size=(7, 10))
+    kernel = random_state.uniform(size=(3, 5))
+
+    desired = dict(image=np.empty_like(image), norm=np.empty_like(image))
+    process_image_pixels(dict(image=image), kernel, desired, sum_function)
+
+    actual = process_image_windows(dict(image=image), kernel, _sum_windows,
+                                   block_size=3)
+    assert_allclose(actual['image'], desired['image'])
+    assert_allclose(actual['norm'], desired['norm'])
+
+    with pytest.raises(ValueError):
+        process_image_windows(dict(image=image), np.ones((2, 3)), _sum_windows)
+
+
+def test_process_image_windows_memory_budget(monkeypatch):
+    from .. import utils
+    from ..utils import process_image_windows
+
+    random_state = np.random.RandomState(seed=0)
+    image = random_state.uniform(size=(7, 10))
+    kernel = random_state.uniform(size=(3, 5))
+    desired = process_image_windows(dict(image=image), kernel, _sum_windows,
+                                     block_size=7)
+
+    # Budget for two rows of kernel windows
+    monkeypatch.setattr(utils, '_WINDOW_BLOCK_MAX_BYTES', 2 * 8 * 10 * 3 * 5)
+    calls = []
+
+    def sum_windows(images, kernel):
+        calls.append(kernel.shape)
+        return _sum_windows(images, kernel)
+
+    actual = process_image_windows(dict(image=image), kernel, sum_windows)
+    assert [shape[0] for shape in calls] == [2, 2, 2, 1]
+    assert_allclose(actual['image'], desired['image'])
+
+
 @requires_dependency('skimage')
 class TestBlockReduceHDU():
     def setup_class(self):
@@ -141,6 +247,20 @@ def test_wcs_histogram2d():
     assert image.data[0, 1] == 2
 
 
+def test_bincount_histogram():
+    random_state = np.random.RandomState(0)
+    yy = random_state.uniform(-2, 6, 1000)
+    xx = random_state.uniform(-2, 8, 1000)
+    weights = random_state.uniform(0, 1, 1000)
+    # Pixel edges, last edge is inclusive
+    yy[:10], xx[10:20] = -0.5, 6.5
+
+    actual = _bincount_histogram([yy, xx], (4, 7), weights=weights)
+    bins = np.arange(5) - 0.5, np.arange(8) - 0.5
+    desired = np.histogramdd([yy, xx], bins, weights=weights)[0]
+    assert_allclose(actual, desired)
+
+
 @requires_data('gammapy-extra')
 def test_lon_lat_rectangle_mask():
     counts = SkyImage.from_image_hdu(FermiGalacticCenter.counts())
@@ -0,0 +1,197 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Tiled processing of large images."""
+from __future__ import absolute_import, division, print_function, unicode_literals
+import logging
+from collections import OrderedDict
+import numpy as np
+from .core import SkyImage, SkyImageCollection
+
+__all__ = [
+    'process_image_tiles',
+]
+
+log = logging.getLogger(__name__)
+
+
+def _tile_slices(shape, tile_shape, halo):
+    """Compute slices for overlapping image tiles.
+
+    Parameters
+    ----------
+    shape : tuple
+        Image shape
+    tile_shape : tuple
+        Shape of the tile cores
+    halo : int
+        Halo width in pixels added to the tile cores on every side
+
+    Returns
+    -------
+    slices : list of tuple
+        For every tile a tuple ``(outer, core, inner)``, where ``outer`` are
+        the slices of the tile including the halo in the image, ``core`` the
+        slices of the tile core in the image and ``inner`` the slices of the
+        tile core in the tile.
+    """
+    slices = []
+    ranges = []
+    for n_pixels, n_tile in zip(shape, tile_shape):
+        axis_slices = []
+        for lo in range(0, n_pixels, n_tile):
+            hi = min(lo + n_tile, n_pixels)
+            outer_lo = max(lo - halo, 0)
+            outer_hi = min(hi + halo, n_pixels)
+            axis_slices.append((slice(outer_lo, outer_hi), slice(lo, hi),
+                                slice(lo - outer_lo, hi - outer_lo)))
+        ranges.append(axis_slices)
+
+    for y_outer, y_core, y_inner in ranges[0]:
+        for x_outer, x_core, x_inner in ranges[1]:
+            slices.append(((y_outer, x_outer), (y_core, x_core), (y_inner, x_inner)))
+    return slices
+
+
+def _process_tile(args):
+    """Process a single tile for `process_image_tiles`.
+
+    Module level function taking a single tuple argument, so that it can be
+    used with `multiprocessing.Pool.imap`.
+    """
+    function, images = args
+    return function(images)
+
+
+def process_image_tiles(images, function, halo, tile_shape=(1000, 1000),
+                        parallel=False):
+    """Process large images in overlapping tiles.
+
+    The images are split into tiles, each extended by a halo of ``halo``
+    pixels on every side (clipped at the image boundary). ``function`` is
+    called for every tile and the tile cores of the results are stitched
+    back together.
+
+    If ``function`` only uses pixels within ``halo`` of a given output pixel
+    (e.g. a correlation with a kernel of radius ``halo``), the result is
+    identical to processing the whole image at once, while the memory usage
+    is bounded by the tile size.
+
+    Parameters
+    ----------
+    images : `~gammapy.image.SkyImageCollection` or dict
+        Input images, all of the same shape. Values can be
+        `~gammapy.image.SkyImage` objects or arrays.
+    function : function
+        Function called as ``function(tile_images)``, where ``tile_images``
+        is a `~gammapy.image.SkyImageCollection` of the tile cutouts with
+        correctly shifted WCS. It must return a dict-like object of arrays or
+        `~gammapy.image.SkyImage` objects with the same shape as the tile.
+        For ``parallel=True`` it must be picklable, e.g. a module level
+        function or a `functools.partial` of it.
+    halo : int
+        Halo width in pixels, typically the kernel radius.
+    tile_shape : tuple
+        Shape ``(ny, nx)`` of the tile cores.
+    parallel : bool
+        Whether to process the tiles in parallel on multiple cores.
+
+    Returns
+    -------
+    result : `~gammapy.image.SkyImageCollection`
+        Stitched result images.
+
+    Examples
+    --------
+    Ring-correlate a large counts image in tiles of 500 x 500 pixels::
+
+        from gammapy.image import process_image_tiles, ring_correlate
+
+        def ring_counts(images):
+            return dict(ring_counts=ring_correlate(images['counts'].data, 20, 30))
+
+        result = process_image_tiles(images, ring_counts, halo=30,
+                                     tile_shape=(500, 500))
+    """
+    names = [name for name in images if _is_image(images[name])]
+    data = dict((name, _image_data(images[name])) for name in names)
+    wcs = _first_wcs(images, names)
+    shape = data[names[0]].shape
+
+    halo = int(np.ceil(halo))
+    slices = _tile_slices(shape, tile_shape, halo)
+    log.info('Processing {0} tiles of shape {1}'.format(len(slices), tile_shape))
+
+    meta = getattr(images, 'meta', None)
+    tasks = (_tile_task(function, names, data, wcs, outer) for outer, _, _ in slices)
+
+    if parallel:
+        from multiprocessing import Pool, cpu_count
+        log.info('Using {0} cores to process image tiles.'.format(cpu_count()))
+        pool = Pool()
+        try:
+            results = pool.imap(_process_tile, tasks)
+            out = _stitch_tiles(results, slices, shape, wcs, meta)
+        except BaseException:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+    else:
+        results = (_process_tile(task) for task in tasks)
+        out = _stitch_tiles(results, slices, shape, wcs, meta)
+
+    return out
+
+
+def _tile_task(function, names, data, wcs, outer):
+    """Task with the tile cutouts of the images for `_process_tile`."""
+    tile_wcs = wcs[outer] if wcs is not None else None
+    tile_images = SkyImageCollection(wcs=tile_wcs)
+    for name in names:
+        tile_images[name] = SkyImage(name=name, data=data[name][outer],
+                                     wcs=tile_wcs)
+    return function, tile_images
+
+
+def _stitch_tiles(results, slices, shape, wcs, meta):
+    """Stitch the tile cores of the results into full images.
+
+    The results are stitched one at a time as they arrive, the output arrays
+    are allocated when the first result is available.
+    """
+    stitched, units = OrderedDict(), {}
+    for (_, core, inner), result in zip(slices, results):
+        names = [name for name in result if _is_image(result[name])]
+        if not stitched:
+            for name in names:
+                dtype = _image_data(result[name]).dtype
+                stitched[name] = np.empty(shape, dtype=dtype)
+                units[name] = getattr(result[name], 'unit', None)
+        for name in names:
+            stitched[name][core] = _image_data(result[name])[inner]
+
+    out = SkyImageCollection(wcs=wcs, meta=meta)
+    for name in stitched:
+        out[name] = SkyImage(name=name, data=stitched[name], wcs=wcs, unit=units[name])
+    return out
+
+
+def _is_image(value):
+    return isinstance(value, (SkyImage, np.ndarray))
+
+
+def _image_data(value):
+    if isinstance(value, SkyImage):
+        value = value.data
+    return np.asarray(value)
+
+
+def _first_wcs(images, names):
+    wcs = getattr(images, 'wcs', None)
+    if wcs is None:
+        for name in names:
+            wcs = getattr(images[name], 'wcs', None)
+            if wcs is not None:
+                break
+    return wcs
@@ -9,6 +9,8 @@ from astropy.io import fits
 from astropy.wcs import WCS
 from ..utils.wcs import get_wcs_ctype
 from ..utils.energy import EnergyBounds
+from ..utils.cache import LRUCache
+from ..utils.dtype import _float_dtype
 # TODO:
 # Remove this when/if https://github.com/astropy/astropy/issues/4429 is fixed
 from astropy.utils.exceptions import AstropyDeprecationWarning
@@ -17,6 +19,7 @@ from astropy.utils.exceptions import AstropyDeprecationWarning
 __all__ = [
     'atrous_hdu',
     'atrous_image',
+    'atrous_levels',
     'bin_events_in_image',
     'binary_disk',
     'binary_ring',
@@ -29,6 +32,7 @@ __all__ = [
     'lon_lat_circle_mask',
     'make_header',
     'process_image_pixels',
+    'process_image_windows',
     'ring_correlate',
     'threshold',
     'wcs_histogram2d',
@@ -36,6 +40,29 @@ __all__ = [
 
 log = logging.getLogger(__name__)
 
+# Kernel size (number of pixels) above which `disk_correlate` and
+# `ring_correlate` switch to the FFT backend for ``method='auto'``
+_FFT_KERNEL_SIZE_THRESHOLD = 1000
+
+# Memory budget (bytes) for one temporary array of kernel windows
+# in `process_image_windows`, used to choose the number of rows per block
+_WINDOW_BLOCK_MAX_BYTES = 64 * 1024 ** 2
+
+# Minimum FFT tile size used for the overlap-add method
+_FFT_MIN_TILE_SIZE = 256
+
+# Kernel FFTs, shared between all images correlated with the same kernel
+_KERNEL_FFT_CACHE = LRUCache(maxsize=32)
+
+# Constant coordinate rotation matrices, computed on first use
+_ROTATION_MATRIX_CACHE = LRUCache(maxsize=4)
+
+# Mapping of `scipy.ndimage` boundary modes to `numpy.pad` modes
+_NDIMAGE_TO_PAD_MODE = {'reflect': 'symmetric',
+                        'mirror': 'reflect',
+                        'nearest': 'edge',
+                        'wrap': 'wrap'}
+
 
 def _get_structure_indices(radius):
     """Get arrays of indices for a symmetric structure.
@@ -110,7 +137,104 @@ def binary_ring(r_in, r_out):
     return mask1 & mask2
 
 
-def disk_correlate(image, radius, mode='constant'):
+def _next_power_of_two(n):
+    return int(2 ** np.ceil(np.log2(n)))
+
+
+def _kernel_fft(kernel, fft_shape):
+    """Get FFT of a kernel zero-padded to ``fft_shape``, using the kernel FFT cache."""
+    key = (kernel.shape, kernel.dtype.str, kernel.tobytes(), fft_shape)
+
+    def compute():
+        return np.fft.rfft2(kernel, s=fft_shape)
+
+    return _KERNEL_FFT_CACHE.get_or_compute(key, compute)
+
+
+def _fft_correlate(image, kernel, mode='constant'):
+    """Correlate image with a symmetric kernel via tiled FFT overlap-add.
+
+    The image is split into tiles, each tile is convolved with the kernel
+    in Fourier space and the results are added into the output array.
+    The FFT size only depends on the kernel size, so memory usage stays
+    bounded for large images and the kernel FFT can be re-used for all tiles
+    and all images correlated with the same kernel.
+
+    Parameters
+    ----------
+    image : `~numpy.ndarray`
+        Image to be correlated.
+    kernel : `~numpy.ndarray`
+        Point symmetric kernel with odd shape.
+    mode : {'reflect','constant','nearest','mirror', 'wrap'}, optional
+        Boundary handling, same meaning as for `scipy.ndimage.convolve`.
+
+    Returns
+    -------
+    correlated : `~numpy.ndarray`
+        Correlated image, same shape and dtype as the input image.
+    """
+    image = np.asanyarray(image)
+    kernel = np.asanyarray(kernel, dtype=float)
+    ky, kx = kernel.shape
+    if (ky % 2 == 0) or (kx % 2 == 0):
+        raise ValueError('Kernel shape must have odd dimensions')
+    hy, hx = ky // 2, kx // 2
+
+    if mode == 'constant':
+        data = image
+    elif mode in _NDIMAGE_TO_PAD_MODE:
+        pad_mode = str(_NDIMAGE_TO_PAD_MODE[mode])
+        data = np.pad(image, ((hy, hy), (hx, hx)), mode=pad_mode)
+    else:
+        raise ValueError('Invalid mode: {}'.format(mode))
+
+    ny, nx = data.shape
+    fft_shape = (
+        min(_next_power_of_two(max(4 * ky, _FFT_MIN_TILE_SIZE)), _next_power_of_two(ny + ky - 1)),
+        min(_next_power_of_two(max(4 * kx, _FFT_MIN_TILE_SIZE)), _next_power_of_two(nx + kx - 1)),
+    )
+    tile_y, tile_x = fft_shape[0] - ky + 1, fft_shape[1] - kx + 1
+    kernel_fft = _kernel_fft(kernel, fft_shape)
+
+    out = np.zeros((ny + ky - 1, nx + kx - 1))
+    for y0 in range(0, ny, tile_y):
+        for x0 in range(0, nx, tile_x):
+            tile = data[y0:y0 + tile_y, x0:x0 + tile_x]
+            ty, tx = tile.shape
+            tile_fft = np.fft.rfft2(tile, s=fft_shape)
+            tile_fft *= kernel_fft
+            conv = np.fft.irfft2(tile_fft, s=fft_shape)
+            out[y0:y0 + ty + ky - 1, x0:x0 + tx + kx - 1] += conv[:ty + ky - 1, :tx + kx - 1]
+
+    if mode == 'constant':
+        out = out[hy:hy + ny, hx:hx + nx]
+    else:
+        out = out[2 * hy:ny, 2 * hx:nx]
+
+    if image.dtype.kind in 'biu':
+        out = np.rint(out)
+    return out.astype(image.dtype, copy=False)
+
+
+def _correlate(image, structure, mode, method):
+    """Correlate image with structure, choosing the direct or FFT backend."""
+    if method == 'auto':
+        if structure.size > _FFT_KERNEL_SIZE_THRESHOLD:
+            method = 'fft'
+        else:
+            method = 'direct'
+
+    if method == 'direct':
+        from scipy.ndimage import convolve
+        return convolve(image, structure, mode=mode)
+    elif method == 'fft':
+        return _fft_correlate(image, structure, mode=mode)
+    else:
+        raise ValueError('Invalid method: {}'.format(method))
+
+
+def disk_correlate(image, radius, mode='constant', method='auto'):
     """Correlate image with binary disk kernel.
 
     Parameters
@@ -123,6 +247,12 @@ def disk_correlate(image, radius, mode='constant'):
         the mode parameter determines how the array borders are handled.
         For 'constant' mode, values beyond borders are set to be cval.
         Default is 'constant'.
+    method : {'auto', 'direct', 'fft'}, optional
+        Use direct convolution (`scipy.ndimage.convolve`) or a tiled FFT
+        overlap-add method, whose cost doesn't grow with the kernel size.
+        The FFT method doesn't support NaN values in the image.
+        For 'auto' the FFT method is used for kernels larger than
+        1000 pixels. Default is 'auto'.
 
     Returns
     -------
@@ -130,12 +260,11 @@ def disk_correlate(image, radius, mode='constant'):
         The result of convolution of image with disk of given radius.
 
     """
-    from scipy.ndimage import convolve
     structure = binary_disk(radius)
-    return convolve(image, structure, mode=mode)
+    return _correlate(image, structure, mode, method)
 
 
-def ring_correlate(image, r_in, r_out, mode='constant'):
+def ring_correlate(image, r_in, r_out, mode='constant', method='auto'):
     """Correlate image with binary ring kernel.
 
     Parameters
@@ -150,38 +279,114 @@ def ring_correlate(image, r_in, r_out, mode='constant'):
         the mode parameter determines how the array borders are handled.
         For 'constant' mode, values beyond borders are set to be cval.
         Default is 'constant'.
+    method : {'auto', 'direct', 'fft'}, optional
+        Use direct convolution (`scipy.ndimage.convolve`) or a tiled FFT
+        overlap-add method, whose cost doesn't grow with the kernel size.
+        The FFT method doesn't support NaN values in the image.
+        For 'auto' the FFT method is used for kernels larger than
+        1000 pixels. Default is 'auto'.
 
     Returns
     -------
     convolve : `~numpy.ndarray`
         The result of convolution of image with ring of given inner and outer radii.
     """
-    from scipy.ndimage import convolve
     structure = binary_ring(r_in, r_out)
-    return convolve(image, structure, mode=mode)
+    return _correlate(image, structure, mode, method)
+
+
+# B3 spline scaling function used for the a trous wavelet transform
+_ATROUS_KERNEL = np.array([1. / 16, 1. / 4, 3. / 8, 1. / 4, 1. / 16])
+
+
+def _atrous_kernel(level):
+    """A trous kernel for a given level, i.e. with ``2 ** level - 1`` holes."""
+    step = 2 ** level
+    kernel = np.zeros(4 * step + 1)
+    kernel[::step] = _ATROUS_KERNEL
+    return kernel
+
+
+def _atrous_smooth(image, level, method):
+    """Smooth image with the a trous kernel of a given level."""
+    kernel = _atrous_kernel(level)
+    if method == 'auto':
+        method = 'fft' if kernel.size ** 2 > _FFT_KERNEL_SIZE_THRESHOLD else 'direct'
+
+    if method == 'direct':
+        from scipy.ndimage import convolve1d
+        smoothed = convolve1d(image, kernel, axis=0, mode='mirror')
+        return convolve1d(smoothed, kernel, axis=1, mode='mirror')
+    elif method == 'fft':
+        return _fft_correlate(image, np.outer(kernel, kernel), mode='mirror')
+    else:
+        raise ValueError('Invalid method: {}'.format(method))
 
 
-def atrous_image(image, n_levels):
+def atrous_levels(image, n_levels, method='auto', dtype=None):
+    """Compute a trous transform for a given image, level by level.
+
+    Generator version of `atrous_image`, yielding the wavelet levels one at
+    a time and the residual image last, so that only two images are kept
+    in memory at any time.
+
+    Parameters
+    ----------
+    image : 2D array
+        Input image
+    n_levels : integer
+        Number of wavelet scales.
+    method : {'auto', 'direct', 'fft'}, optional
+        Use direct separable convolution (`scipy.ndimage.convolve1d`) or the
+        FFT overlap-add method with cached kernel FFTs. For 'auto' the FFT
+        method is used for levels with large kernels.
+    dtype : {'float32', 'float64'}, optional
+        Float data type of the computation and the output images.
+        Default is given by `~gammapy.utils.dtype.get_default_float_dtype`.
+
+    Yields
+    ------
+    image : 2D array
+        Wavelet transformed image for levels ``0, ..., n_levels - 1``,
+        followed by the residual image.
+    """
+    approx = np.array(image, dtype=_float_dtype(dtype))
+    for level in range(n_levels):
+        smoothed = _atrous_smooth(approx, level, method)
+        # The previous approximation isn't needed any more, so the wavelet
+        # coefficients are computed in place
+        approx -= smoothed
+        yield approx
+        approx = smoothed
+    yield approx
+
+
+def atrous_image(image, n_levels, method='auto', dtype=None):
     """Compute a trous transform for a given image.
 
+    Uses the B3 spline scaling function and mirror boundary conditions.
+    The sum of all returned images is equal to the input image.
+
     Parameters
     ----------
     image : 2D array
         Input image
     n_levels : integer
         Number of wavelet scales.
+    method : {'auto', 'direct', 'fft'}, optional
+        Convolution method, see `atrous_levels`.
+    dtype : {'float32', 'float64'}, optional
+        Float data type of the computation and the output images.
 
     Returns
     -------
     images : list of 2D arrays
-        Wavelet transformed images.
+        Wavelet transformed images, ``n_levels`` levels and the residual image.
     """
-    # https://code.google.com/p/image-funcut/
-    from imfun import atrous
-    return atrous.decompose2d(image, level=n_levels)
+    return list(atrous_levels(image, n_levels, method=method, dtype=dtype))
 
 
-def atrous_hdu(hdu, n_levels):
+def atrous_hdu(hdu, n_levels, method='auto', dtype=None):
     """Compute a trous transform for a given FITS HDU.
 
     Parameters
@@ -190,6 +395,10 @@ def atrous_hdu(hdu, n_levels):
         Input image
     n_levels : integer
         Number of wavelet scales.
+    method : {'auto', 'direct', 'fft'}, optional
+        Convolution method, see `atrous_levels`.
+    dtype : {'float32', 'float64'}, optional
+        Float data type of the computation and the output images.
 
     Returns
     -------
@@ -198,11 +407,11 @@ def atrous_hdu(hdu, n_levels):
     """
     image = hdu.data
     log.info('Computing a trous transform for {0} levels ...'.format(n_levels))
-    images = atrous_image(image, n_levels)
     hdus = fits.HDUList()
 
-    for level, image in enumerate(images):
-        if level < len(images) - 1:
+    levels = atrous_levels(image, n_levels, method=method, dtype=dtype)
+    for level, image in enumerate(levels):
+        if level < n_levels:
             name = 'level_{0}'.format(level)
         else:
             name = 'residual'
@@ -278,14 +487,12 @@ def process_image_pixels(images, kernel, out, pixel_function):
             process_image_pixels(images, kernel, out, convolve_function)
             return out['image']
 
+    For a much faster, vectorised alternative see `process_image_windows`.
+
     * TODO: add different options to treat the edges
-    * TODO: implement multiprocessing version
-    * TODO: this function is similar to view_as_windows in scikit-image:
-            http://scikit-image.org/docs/dev/api/skimage.util.html#view-as-windows
-            Is this function needed or can everything be done with view_as_windows?
     """
     if isinstance(out, dict):
-        n0, n1 = out.values()[0].shape
+        n0, n1 = list(out.values())[0].shape
     else:
         n0, n1 = out.shape
 
@@ -293,7 +500,7 @@ def process_image_pixels(images, kernel, out, pixel_function):
     k0, k1 = kernel.shape
     if (k0 % 2 == 0) or (k1 % 2 == 0):
         raise ValueError('Kernel shape must have odd dimensions')
-    k0, k1 = (k0 - 1) / 2, (k1 - 1) / 2
+    k0, k1 = (k0 - 1) // 2, (k1 - 1) // 2
 
     # Loop over all pixels
     for i0 in range(0, n0):
@@ -331,6 +538,137 @@ def process_image_pixels(images, kernel, out, pixel_function):
                 out[i0, i1] = out_part
 
 
+def _sliding_windows(array, window_shape):
+    """Strided view of all windows of a given shape in a 2D array.
+
+    Returns a read-only view of shape ``(n0 - w0 + 1, n1 - w1 + 1, w0, w1)``,
+    no data is copied.
+    """
+    from numpy.lib.stride_tricks import as_strided
+    array = np.ascontiguousarray(array)
+    w0, w1 = window_shape
+    shape = (array.shape[0] - w0 + 1, array.shape[1] - w1 + 1, w0, w1)
+    windows = as_strided(array, shape=shape, strides=array.strides * 2)
+    windows.setflags(write=False)
+    return windows
+
+
+def _process_window_block(args):
+    """Process one row block for `process_image_windows`.
+
+    Module level function taking a single tuple argument, so that it can be
+    used with `multiprocessing.Pool.map`.
+    """
+    window_function, image_blocks, mask_block, kernel = args
+    image_windows = dict()
+    for name, block in image_blocks.items():
+        image_windows[name] = _sliding_windows(block, kernel.shape)
+    kernel_windows = _sliding_windows(mask_block, kernel.shape) * kernel
+    return window_function(image_windows, kernel_windows)
+
+
+def process_image_windows(images, kernel, window_function, block_size=None,
+                          parallel=False):
+    """Process images with a vectorised function on sliding kernel windows.
+
+    Vectorised replacement for `process_image_pixels`: instead of calling
+    a function for every pixel, ``window_function`` is called for blocks of
+    image rows and receives all kernel-shaped windows of that block at once,
+    as strided views without copying the image data.
+
+    Edge handling is the same as for `process_image_pixels`: windows are
+    truncated at the image boundary. Here this is achieved by setting the
+    kernel to zero for window entries outside of the image (the image values
+    there are zero as well), so functions that weight the image values with
+    the kernel give identical results.
+
+    Parameters
+    ----------
+    images : dict of arrays
+        Images needed to compute the output, all of the same shape
+    kernel : array
+        Kernel array, shape must be odd-valued
+    window_function : function
+        Function called as ``window_function(image_windows, kernel_windows)``,
+        where ``image_windows`` is a dict of arrays of shape
+        ``(n_rows, n1, k0, k1)`` and ``kernel_windows`` an array of the same
+        shape. It must return an array of shape ``(n_rows, n1)`` or a dict of
+        such arrays. For ``parallel=True`` it must be defined on module level,
+        so that it can be pickled.
+    block_size : int, optional
+        Number of image rows processed per call to ``window_function``. This
+        limits the memory used for the kernel windows. By default it is
+        chosen such that one float64 array of shape ``(n_rows, n1, k0, k1)``
+        fits into ``_WINDOW_BLOCK_MAX_BYTES``.
+    parallel : bool
+        Whether to process the row blocks in parallel on multiple cores.
+
+    Returns
+    -------
+    out : array or dict of arrays
+        Output image(s), depending on what ``window_function`` returns.
+
+    Examples
+    --------
+    Here is how to implement convolution with zero-padding at the edges::
+
+        import numpy as np
+        from gammapy.image import process_image_windows
+
+        def convolve_windows(images, kernel):
+            return np.sum(images['image'] * kernel, axis=(-2, -1))
+
+        image = np.random.uniform(size=(100, 100))
+        kernel = np.ones((5, 5))
+        out = process_image_windows(dict(image=image), kernel, convolve_windows)
+    """
+    kernel = np.asanyarray(kernel)
+    k0, k1 = kernel.shape
+    if (k0 % 2 == 0) or (k1 % 2 == 0):
+        raise ValueError('Kernel shape must have odd dimensions')
+    h0, h1 = k0 // 2, k1 // 2
+
+    pad_width = ((h0, h0), (h1, h1))
+    padded = dict()
+    for name, image in images.items():
+        padded[name] = np.pad(np.asanyarray(image), pad_width, mode='constant')
+
+    n0, n1 = np.asanyarray(list(images.values())[0]).shape
+    mask = np.zeros((n0 + 2 * h0, n1 + 2 * h1))
+    mask[h0:h0 + n0, h1:h1 + n1] = 1
+
+    if block_size is None:
+        # Bytes of one row of float64 kernel windows
+        row_bytes = 8 * n1 * k0 * k1
+        block_size = max(1, _WINDOW_BLOCK_MAX_BYTES // row_bytes)
+
+    tasks = []
+    for i0 in range(0, n0, block_size):
+        i1 = min(i0 + block_size, n0)
+        # Padded rows needed to compute output rows i0 to i1
+        rows = slice(i0, i1 + 2 * h0)
+        image_blocks = dict((name, image[rows]) for name, image in padded.items())
+        tasks.append((window_function, image_blocks, mask[rows], kernel))
+
+    if parallel:
+        from multiprocessing import Pool, cpu_count
+        log.info('Using {0} cores to process image windows.'.format(cpu_count()))
+        pool = Pool()
+        try:
+            results = pool.map(_process_window_block, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_process_window_block(task) for task in tasks]
+
+    if isinstance(results[0], dict):
+        return dict((name, np.concatenate([result[name] for result in results]))
+                    for name in results[0])
+    else:
+        return np.concatenate(results)
+
+
 def image_groupby(images, labels):
     """Group pixel by labels.
 
@@ -416,11 +754,8 @@ def wcs_histogram2d(header, lon, lat, weights=None):
 
     See also
     --------
-    numpy.histogramdd
+    numpy.bincount
     """
-    if weights is None:
-        weights = np.ones_like(lon)
-
     # Get pixel coordinates
     wcs = WCS(header)
     origin = 0  # convention for gammapy
@@ -429,8 +764,7 @@ def wcs_histogram2d(header, lon, lat, weights=None):
     # This was checked against the `ctskymap` ctool
     # http://cta.irap.omp.eu/ctools/
     shape = header['NAXIS2'], header['NAXIS1']
-    bins = np.arange(shape[0] + 1) - 0.5, np.arange(shape[1] + 1) - 0.5
-    data = np.histogramdd([yy, xx], bins, weights=weights)[0]
+    data = _bincount_histogram([yy, xx], shape, weights=weights)
 
     # return fits.ImageHDU(data, header, name='COUNTS')
     return fits.PrimaryHDU(data, header)
@@ -460,6 +794,47 @@ def bin_events_in_image(events, reference_image):
 
 
 
+def _icrs_to_galactic_matrix():
+    """Rotation matrix from ICRS to Galactic cartesian coordinates."""
+    def compute():
+        from astropy.coordinates import SkyCoord
+        # Images of the ICRS basis vectors are the matrix columns
+        basis = SkyCoord([0, 90, 0], [0, 0, 90], unit='deg', frame='icrs')
+        return basis.galactic.cartesian.xyz.value
+
+    return _ROTATION_MATRIX_CACHE.get_or_compute('icrs-galactic', compute)
+
+
+def _radec_to_galactic(ra, dec):
+    """Convert ICRS to Galactic coordinates (deg) with a rotation matrix.
+
+    Gives the same result as `~astropy.coordinates.SkyCoord`, but avoids
+    the overhead of the frame transformation machinery for large arrays.
+    """
+    ra, dec = np.radians(ra), np.radians(dec)
+    cos_dec = np.cos(dec)
+    xyz = np.array([cos_dec * np.cos(ra), cos_dec * np.sin(ra), np.sin(dec)])
+    x, y, z = np.dot(_icrs_to_galactic_matrix(), xyz.reshape(3, -1))
+    lon = np.degrees(np.arctan2(y, x)) % 360
+    lat = np.degrees(np.arcsin(np.clip(z, -1, 1)))
+    return lon.reshape(np.shape(ra)), lat.reshape(np.shape(ra))
+
+
+def _event_lonlat(events, wcs):
+    """Event sky coordinates (deg) in the coordinate system of a WCS.
+
+    For Galactic WCS the ``GLON`` and ``GLAT`` columns are used if present,
+    otherwise ``RA`` and ``DEC`` are converted.
+    """
+    if get_wcs_ctype(wcs) == 'galactic':
+        if 'GLON' in events.colnames and 'GLAT' in events.colnames:
+            return np.asarray(events['GLON']), np.asarray(events['GLAT'])
+        return _radec_to_galactic(np.asarray(events['RA'], dtype=float),
+                                  np.asarray(events['DEC'], dtype=float))
+    else:
+        return np.asarray(events['RA']), np.asarray(events['DEC'])
+
+
 def _bin_events_in_cube(events, wcs, shape, energies=None, origin=0):
     """Bin events in LON-LAT-Energy cube.
     Parameters
@@ -481,27 +856,102 @@ def _bin_events_in_cube(events, wcs, shape, energies=None, origin=0):
     data : `~numpy.ndarray`
         Counts cube.
     """
-    if get_wcs_ctype(wcs) == 'galactic':
-        galactic = events.galactic
-        lon, lat = galactic.l.deg, galactic.b.deg
-    else:
-        lon, lat = events['RA'], events['DEC']
-
+    lon, lat = _event_lonlat(events, wcs)
     xx, yy = wcs.wcs_world2pix(lon, lat, origin)
-    event_energies = events['ENERGY']
 
-    if energies is None:
-        emin = np.min(event_energies)
-        emax = np.max(event_energies)
-        energies = EnergyBounds.equal_log_spacing(emin, emax, nbins=1, unit='TeV')
-        shape = (2, ) + shape
-
-    zz = np.searchsorted(energies.value, event_energies.data)
     # Histogram pixel coordinates with appropriate binning.
     # This was checked against the `ctskymap` ctool
     # http://cta.irap.omp.eu/ctools/
-    bins = np.arange(shape[0]), np.arange(shape[1] + 1) - 0.5, np.arange(shape[2] + 1) - 0.5
-    return Quantity(np.histogramdd([zz, yy, xx], bins)[0], 'count')
+    if energies is None:
+        # Single energy bin from the minimum to the maximum event energy,
+        # which by construction contains all events
+        data = _bincount_histogram([yy, xx], shape)
+        return Quantity(data.reshape((1,) + tuple(shape)), 'count')
+
+    # Bin ``i`` covers ``[edges[i], edges[i + 1])``, the upper edge of the
+    # last bin is inclusive. Events outside the bounds are dropped.
+    edges = energies.value
+    energy = events['ENERGY'].data
+    n_energy_bins = shape[0] - 1
+    zz = np.searchsorted(edges, energy, side='right') - 1
+    zz = np.where(energy == edges[-1], n_energy_bins - 1, zz)
+    zz = np.where((zz >= 0) & (zz < n_energy_bins), zz, -1)
+
+    shape = (n_energy_bins,) + tuple(shape[1:])
+    data = _bincount_histogram([zz, yy, xx], shape)
+    return Quantity(data, 'count')
+
+
+def _pixel_to_index(x, n_pixels):
+    """Convert pixel coordinates to integer pixel indices.
+
+    Pixel ``i`` covers ``[i - 0.5, i + 0.5)``, the upper edge of the last
+    pixel is inclusive, like for the bins used with `numpy.histogramdd`.
+
+    Parameters
+    ----------
+    x : `~numpy.ndarray`
+        Pixel coordinates
+    n_pixels : int
+        Number of pixels along the axis
+
+    Returns
+    -------
+    idx : `~numpy.ndarray`
+        Integer pixel indices, -1 for coordinates outside the axis.
+    """
+    x = np.asarray(x, dtype=float)
+    with np.errstate(invalid='ignore'):
+        valid = (x >= -0.5) & (x <= n_pixels - 0.5)
+        idx = np.floor(x + 0.5)
+    idx = np.where(valid, np.minimum(idx, n_pixels - 1), -1)
+    return idx.astype(np.intp)
+
+
+def _bincount_histogram(coordinates, shape, weights=None):
+    """Histogram pixel coordinates using `numpy.bincount`.
+
+    Much faster than `numpy.histogramdd` for regular pixel bins, because
+    pixel coordinates are simply rounded and accumulated on the raveled
+    pixel indices.
+
+    Parameters
+    ----------
+    coordinates : list of `~numpy.ndarray`
+        Pixel coordinates for every axis in ``shape`` order. Integer arrays
+        are taken as pixel indices, where negative values mark entries
+        outside the histogram.
+    shape : tuple
+        Shape of the histogram
+    weights : `~numpy.ndarray`, optional
+        Weights
+
+    Returns
+    -------
+    data : `~numpy.ndarray`
+        Histogram (float array of given shape)
+    """
+    shape = tuple(shape)
+    indices = []
+    for coordinate, n_pixels in zip(coordinates, shape):
+        coordinate = np.asarray(coordinate)
+        if not np.issubdtype(coordinate.dtype, np.integer):
+            coordinate = _pixel_to_index(coordinate, n_pixels)
+        indices.append(coordinate.ravel())
+
+    mask = np.ones(indices[0].shape, dtype=bool)
+    for idx, n_pixels in zip(indices, shape):
+        mask &= (idx >= 0) & (idx < n_pixels)
+
+    indices = [idx[mask] for idx in indices]
+    flat_idx = np.ravel_multi_index(indices, shape)
+
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float).ravel()[mask]
+
+    size = int(np.prod(shape))
+    data = np.bincount(flat_idx, weights=weights, minlength=size)
+    return data.astype(float).reshape(shape)
 
 
 def threshold(array, threshold=5):
@@ -20,10 +20,11 @@ __all__ = [
 class EnergyDispersion(NDDataArray):
     """Energy dispersion matrix.
 
-    We use a dense matrix (`numpy.ndarray`) for the energy dispersion matrix.
-    An alternative would be to store a sparse matrix
-    (`scipy.sparse.csc_matrix`).  It's not clear which would be more efficient
-    for typical gamma-ray energy dispersion matrices.
+    The matrix can be given as a dense array or as a sparse matrix
+    (`scipy.sparse.csr_matrix`). Typical energy dispersion matrices are band
+    diagonal, so RMF files are read into a sparse matrix, which is also used
+    by `apply` and when writing. The dense matrix `data` is only computed
+    when needed, e.g. for interpolation with `evaluate`.
 
     The most common file format for energy dispersion matrices is the RMF
     (Redistribution Matrix File) format from X-ray astronomy:
@@ -31,7 +32,7 @@ class EnergyDispersion(NDDataArray):
 
     Parameters
     ----------
-    data : array_like
+    data : array_like, `~scipy.sparse.spmatrix`
         2-dim energy dispersion matrix (probability density).
     e_true : `~astropy.units.Quantity`, `~gammapy.utils.nddata.BinnedDataAxis`
         Bin edges of true energy axis
@@ -47,6 +48,9 @@ class EnergyDispersion(NDDataArray):
     interp_kwargs = dict(bounds_error=False, fill_value=0)
     """Interpolation kwargs"""
 
+    _data = None
+    _sparse = None
+
     @property
     def pdf_matrix(self):
         """PDF matrix `~numpy.ndarray`
@@ -56,6 +60,49 @@ class EnergyDispersion(NDDataArray):
         """
         return self.data
 
+    @property
+    def data(self):
+        """Energy dispersion matrix (`~astropy.units.Quantity`)
+
+        If the matrix was given in sparse form, the dense matrix is computed
+        on first access.
+        """
+        if self._data is None and self._sparse is not None:
+            self._data = Quantity(self._sparse.toarray())
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        """Set data
+
+        Parameters
+        ----------
+        data : `~astropy.units.Quantity`, array-like, `~scipy.sparse.spmatrix`
+            Energy dispersion matrix
+        """
+        if hasattr(data, 'tocsr'):
+            shape = tuple(axis.nbins for axis in self.axes)
+            if data.shape != shape:
+                raise ValueError('Data shape {} does not match axes shape {}'
+                                 ''.format(data.shape, shape))
+            self._interp_cache = None
+            self._data = None
+            self._sparse = data.tocsr()
+        else:
+            NDDataArray.data.fset(self, data)
+            self._sparse = None
+
+    @property
+    def pdf_matrix_sparse(self):
+        """PDF matrix as `~scipy.sparse.csr_matrix`
+
+        Cached, set `data` to update it.
+        """
+        if self._sparse is None:
+            from scipy.sparse import csr_matrix
+            self._sparse = csr_matrix(self.data.value)
+        return self._sparse
+
     @classmethod
     def from_gauss(cls, e_true, e_reco, sigma=0.2, pdf_threshold=1e-6):
         """Create Gaussian `EnergyDispersion` matrix.
@@ -106,19 +153,26 @@ class EnergyDispersion(NDDataArray):
         hdu_list : `~astropy.io.fits.HDUList`
             HDU list with ``MATRIX`` and ``EBOUNDS`` extensions.
         """
+        from scipy.sparse import csr_matrix
+
         data = hdu_list['MATRIX'].data
         header = hdu_list['MATRIX'].header
 
-        pdf_matrix = np.zeros([len(data), header['DETCHANS']], dtype=np.float64)
-
-        for i, l in enumerate(data):
-            if l.field('N_GRP'):
-                m_start = 0
-                for k in range(l.field('N_GRP')):
-                    pdf_matrix[i, l.field('F_CHAN')[k]: l.field(
-                        'F_CHAN')[k] + l.field('N_CHAN')[k]] = l.field(
-                        'MATRIX')[m_start:m_start + l.field('N_CHAN')[k]]
-                    m_start += l.field('N_CHAN')[k]
+        rows, cols, values = [], [], []
+        columns = [data.field(_) for _ in ['N_GRP', 'F_CHAN', 'N_CHAN', 'MATRIX']]
+        for i, (n_grp, f_chan, n_chan, matrix) in enumerate(zip(*columns)):
+            f_chan = np.atleast_1d(f_chan)[:n_grp].astype(int)
+            n_chan = np.atleast_1d(n_chan)[:n_grp].astype(int)
+            n_elements = n_chan.sum()
+            # Channel groups are stored one after the other in the matrix row
+            offset = np.repeat(f_chan - np.cumsum(n_chan) + n_chan, n_chan)
+            cols.append(offset + np.arange(n_elements))
+            rows.append(np.repeat(i, n_elements))
+            values.append(np.atleast_1d(matrix)[:n_elements])
+
+        values = np.concatenate(values).astype(np.float64)
+        idx = (np.concatenate(rows), np.concatenate(cols))
+        pdf_matrix = csr_matrix((values, idx), shape=(len(data), header['DETCHANS']))
 
         e_reco = EnergyBounds.from_ebounds(hdu_list['EBOUNDS'])
         e_true = EnergyBounds.from_rmf_matrix(hdu_list['MATRIX'])
@@ -182,30 +236,36 @@ class EnergyDispersion(NDDataArray):
         """
         table = Table()
 
-        rows = self.pdf_matrix.shape[0]
-        n_grp = []
+        pdf = self.pdf_matrix_sparse.copy()
+        pdf.eliminate_zeros()
+        pdf.sort_indices()
+        rows = pdf.shape[0]
+        row_idx = np.repeat(np.arange(rows), np.diff(pdf.indptr))
+
+        # Make RMF type matrix: a channel group starts at the first non-zero
+        # entry of a row and wherever the channels are not contiguous
+        start = np.ones(pdf.nnz, dtype=bool)
+        start[1:] = (np.diff(pdf.indices) != 1) | (np.diff(row_idx) != 0)
+        group_start = np.nonzero(start)[0]
+        group_size = np.diff(np.append(group_start, pdf.nnz))
+        n_grp = np.bincount(row_idx[group_start], minlength=rows)
+
+        group_split = np.cumsum(n_grp)[:-1]
+        f_chan_rows = np.split(pdf.indices[group_start], group_split)
+        n_chan_rows = np.split(group_size, group_split)
+        matrix_rows = np.split(pdf.data, pdf.indptr[1:-1])
+
         f_chan = np.ndarray(dtype=np.object, shape=rows)
         n_chan = np.ndarray(dtype=np.object, shape=rows)
         matrix = np.ndarray(dtype=np.object, shape=rows)
-
-        # Make RMF type matrix
-        for i, row in enumerate(self.data.value):
-            subsets = 1
-            pos = np.nonzero(row)[0]
-            borders = np.where(np.diff(pos) != 1)[0]
-            # add 1 to borders for correct behaviour of np.split
-            groups = np.asarray(np.split(pos, borders + 1))
-            n_grp_temp = groups.shape[0] if groups.size > 0 else 1
-            n_chan_temp = np.asarray([val.size for val in groups])
-            try:
-                f_chan_temp = np.asarray([val[0] for val in groups])
-            except(IndexError):
-                f_chan_temp = np.zeros(1)
-
-            n_grp.append(n_grp_temp)
-            f_chan[i] = f_chan_temp
-            n_chan[i] = n_chan_temp
-            matrix[i] = row[pos]
+        for i in range(rows):
+            # Empty rows are written as one group of zero channels
+            if n_grp[i] == 0:
+                f_chan[i], n_chan[i] = np.zeros(1, dtype=int), np.zeros(1, dtype=int)
+            else:
+                f_chan[i], n_chan[i] = f_chan_rows[i], n_chan_rows[i]
+            matrix[i] = matrix_rows[i]
+        n_grp[n_grp == 0] = 1
 
         table['ENERG_LO'] = self.e_true.data[:-1]
         table['ENERG_HI'] = self.e_true.data[1:]
@@ -284,7 +344,8 @@ class EnergyDispersion(NDDataArray):
 
         Computes the matrix product of ``data``
         (which typically is model flux or counts in true energy bins)
-        with the energy dispersion matrix.
+        with the energy dispersion matrix. Without ``e_reco`` the sparse
+        matrix `pdf_matrix_sparse` is used.
 
         Parameters
         ----------
@@ -301,9 +362,11 @@ class EnergyDispersion(NDDataArray):
             1-dim data array after multiplication with the energy dispersion matrix
         """
         if e_reco is None:
-            e_reco = self.e_reco.nodes
-        else:
-            e_reco = np.sqrt(e_reco[:-1] * e_reco[1:])
+            data = Quantity(data)
+            convolved = self.pdf_matrix_sparse.T.dot(data.value.T).T
+            return Quantity(convolved, data.unit)
+
+        e_reco = np.sqrt(e_reco[:-1] * e_reco[1:])
         edisp_pdf = self.evaluate(e_reco=e_reco)
         return np.dot(data, edisp_pdf)
 
@@ -589,8 +652,8 @@ class EnergyDispersion2D(object):
         e_true = self.energy if e_true is None else Energy(e_true)
         migra = self.migra if migra is None else migra
 
-        offset = offset.to('deg')
-        e_true = e_true.to('TeV')
+        offset = offset.to(self.offset.unit)
+        e_true = e_true.to(self.energy.unit)
 
         val = self._eval(offset=offset, e_true=e_true, migra=migra)
 
@@ -601,12 +664,11 @@ class EnergyDispersion2D(object):
         x = np.atleast_1d(offset.value)
         y = np.atleast_1d(migra)
         z = np.atleast_1d(np.log10(e_true.value))
-        in_shape = (x.size, y.size, z.size)
 
-        pts = [[xx, yy, zz] for xx in x for yy in y for zz in z]
+        pts = np.stack(np.meshgrid(x, y, z, indexing='ij'), axis=-1)
         val_array = self._linear(pts)
 
-        return val_array.reshape(in_shape).squeeze()
+        return val_array.squeeze()
 
     def to_energy_dispersion(self, offset, e_true=None, e_reco=None):
         """Detector response R(Delta E_reco, Delta E_true)
@@ -614,10 +676,13 @@ class EnergyDispersion2D(object):
         Probability to reconstruct an energy in a given true energy band
         in a given reconstructed energy band
 
+        The matrices for all true energies, and optionally many offsets, are
+        evaluated in a single interpolator call, see `get_response`.
+
         Parameters
         ----------
         offset : `~astropy.coordinates.Angle`
-            Offset
+            Offset, or array of offsets
         e_true : `~gammapy.utils.energy.EnergyBounds`, None
             True energy axis
         e_reco : `~gammapy.utils.energy.EnergyBounds`
@@ -625,21 +690,22 @@ class EnergyDispersion2D(object):
 
         Returns
         -------
-        edisp : `~gammapy.irf.EnergyDispersion`
-            Energy disperion matrix
+        edisp : `~gammapy.irf.EnergyDispersion` or list
+            Energy disperion matrix, a list of matrices if more than one
+            offset is given.
         """
         offset = Angle(offset)
         e_true = self.ebounds if e_true is None else EnergyBounds(e_true)
         e_reco = self.ebounds if e_reco is None else EnergyBounds(e_reco)
 
-        rm = []
+        rm = self._get_response(offset, e_true.log_centers, e_reco)
 
-        for energy in e_true.log_centers:
-            vec = self.get_response(offset=offset, e_true=energy, e_reco=e_reco)
-            rm.append(vec)
+        if offset.size == 1:
+            return EnergyDispersion(data=rm.reshape(rm.shape[-2:]),
+                                    e_true=e_true, e_reco=e_reco)
 
-        rm = np.asarray(rm)
-        return EnergyDispersion(data=rm, e_true=e_true, e_reco=e_reco)
+        rm = rm.reshape((-1,) + rm.shape[-2:])
+        return [EnergyDispersion(data=_, e_true=e_true, e_reco=e_reco) for _ in rm]
 
     def get_response(self, offset, e_true, e_reco=None):
         """Detector response R(Delta E_reco, E_true)
@@ -672,18 +738,47 @@ class EnergyDispersion2D(object):
                 self.migra_lo * e_true, self.migra_hi * e_true)
             migra = self.migra
 
+            val = self.evaluate(offset=offset, e_true=e_true, migra=migra)
+
+            # Multiply by migra bin width (~Integration)
+            rv = val * (e_reco.bands / e_true)
+            return rv.value
+
         # Translate given e_reco binning to migra at bin center
-        else:
-            e_reco = EnergyBounds(e_reco)
-            center = e_reco.log_centers
-            migra = center / e_true
+        return self._get_response(Angle(offset), e_true, e_reco).squeeze()
+
+    def _get_response(self, offset, e_true, e_reco):
+        """Response matrices for given offsets and true energies
 
-        val = self.evaluate(offset=offset, e_true=e_true, migra=migra)
+        All offset, true energy and migration nodes are evaluated in a single
+        interpolator call. The migration is taken at the log centers of the
+        reco energy bins and multiplied with the migration bin width.
+
+        Parameters
+        ----------
+        offset : `~astropy.coordinates.Angle`
+            Offsets, any shape
+        e_true : `~gammapy.utils.energy.Energy`
+            True energies
+        e_reco : `~gammapy.utils.energy.EnergyBounds`
+            Reconstructed energy axis
+
+        Returns
+        -------
+        rm : `~numpy.ndarray`
+            Response matrices, shape ``offset.shape + (e_true.size, e_reco.nbins)``
+        """
+        # The interpolator is set up in the units of the offset and energy axes
+        offset = offset.to(self.offset.unit).value
+        e_true = np.atleast_1d(Energy(e_true).to(self.energy.unit).value)[:, np.newaxis]
+        e_reco = EnergyBounds(e_reco).to(self.energy.unit)
 
-        # Multiply by migra bin width (~Integration)
-        rv = val * (e_reco.bands / e_true)
+        migra = e_reco.log_centers.value / e_true
+        offset = np.reshape(offset, np.shape(offset) + (1, 1))
+        pts = np.broadcast_arrays(offset, migra, np.log10(e_true))
+        val = self._linear(np.stack(pts, axis=-1))
 
-        return rv.value
+        return val * (e_reco.bands.value / e_true)
 
     def plot_migration(self, ax=None, offset=None, e_true=None,
                        migra=None, **kwargs):
@@ -10,7 +10,7 @@ from ..utils.array import array_stats_str
 from ..utils.fits import table_to_fits_table
 from ..utils.energy import Energy
 from ..utils.scripts import make_path
-from .psf_table import TablePSF, EnergyDependentTablePSF
+from .psf_table import TablePSF, EnergyDependentTablePSF, _containment_radius_table
 
 __all__ = [
     'PSF3D',
@@ -281,40 +281,44 @@ class PSF3D(object):
     def containment_radius(self, energy, theta=None, fraction=0.68, interp_kwargs=None):
         """Containment radius.
 
+        The PSF is evaluated on the ``(energy, theta, rad)`` grid at once and
+        the containment radii are computed from the cumulative integral along
+        the ``rad`` axis. Radii for PSFs with zero or NaN entries are NaN.
+
         Parameters
         ----------
         energy : `~astropy.units.Quantity`
             Energy
         theta : `~astropy.coordinates.Angle`
             Offset in the field of view. Default theta = 0 deg
-        fraction : float
+        fraction : array_like
             Containment fraction. Default fraction = 0.68
+        interp_kwargs : dict
+            Option for interpolation for `~scipy.interpolate.RegularGridInterpolator`
 
         Returns
         -------
         radius : `~astropy.units.Quantity`
-            Containment radius in deg
+            Containment radius in deg, with shape
+            ``(energy, theta) + fraction.shape``
         """
-
         # Defaults
-        theta = theta or Angle(0, 'deg')
-        if energy.ndim == 0:
-            energy = Quantity([energy.value], energy.unit)
-        if theta.ndim == 0:
-            theta = Quantity([theta.value], theta.unit)
-
-        unit = None
-        radius = np.zeros((energy.size, theta.size))
-        for e in range(energy.size):
-            for t in range(theta.size):
-                psf = self.to_table_psf(energy[e], theta[t], interp_kwargs)
-                if psf == None:
-                    radius[e, t] = np.nan
-                    continue
-                r = psf.containment_radius(fraction)
-                radius[e, t] = r.value
-                unit = r.unit
-        return Quantity(radius.squeeze(), unit)
+        if theta is None:
+            theta = Angle(0, 'deg')
+        energy = Quantity(energy, ndmin=1)
+        theta = Quantity(theta, ndmin=1)
+        fraction = np.asarray(fraction)
+
+        # Axes (rad, theta, energy) -> (energy, theta, rad)
+        psf_value = self.evaluate(energy.flatten(), theta.flatten(), interp_kwargs=interp_kwargs)
+        psf_value = psf_value.to('sr^-1').value.T
+        rad = self.rad_center().to('radian').value
+        radius = _containment_radius_table(rad, psf_value, fraction)
+
+        invalid = np.any((psf_value != psf_value) | (psf_value == 0), axis=-1)
+        radius[invalid] = np.nan
+
+        return Quantity(np.degrees(radius), 'deg')
 
     def plot_containment_vs_energy(self, fractions=[0.68, 0.95],
                                    thetas=Angle([0, 1], 'deg'), ax=None, **kwargs):
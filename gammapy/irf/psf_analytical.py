@@ -13,6 +13,7 @@ from ..utils.fits import table_to_fits_table
 from ..utils.scripts import make_path
 from ..irf import HESSMultiGaussPSF
 from . import EnergyDependentTablePSF
+from .psf_table import _interpolate_psf_parameters
 
 __all__ = ['EnergyDependentMultiGaussPSF']
 
@@ -21,7 +22,8 @@ class EnergyDependentMultiGaussPSF(object):
     """
     Triple Gauss analytical PSF depending on energy and theta.
 
-    To evaluate the PSF call the ``to_table_psf`` or ``psf_at_energy_and_theta`` methods.
+    To evaluate the PSF call the ``evaluate_psf``, ``to_table_psf`` or
+    ``psf_at_energy_and_theta`` methods.
 
     Parameters
     ----------
@@ -204,22 +206,105 @@ class EnergyDependentMultiGaussPSF(object):
         psf = HESSMultiGaussPSF(pars)
         return psf.to_MultiGauss2D(normalize=True)
 
-    def containment_radius(self, energy, theta, fraction=0.68):
-        """Compute containment for all energy and theta values"""
+    def evaluate_psf(self, energy, theta, rad, method='linear'):
+        """Evaluate the normalised PSF for arrays of energy, theta and rad.
+
+        The Gauss parameters are interpolated in ``log(energy)`` and ``theta``
+        on the grid of energy bin log centers and theta nodes, and the PSF is
+        evaluated for all points in one broadcasted call.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy
+        theta : `~astropy.coordinates.Angle`
+            Offset in the field of view
+        rad : `~astropy.coordinates.Angle`
+            Offset from PSF center
+        method : {'linear', 'nearest'}
+            Interpolation method for the Gauss parameters
+
+        Returns
+        -------
+        psf_value : `~astropy.units.Quantity`
+            PSF value dP / dOmega with the broadcast shape of the inputs
+        """
+        energy = Energy(energy).to('TeV').value
+        theta = Angle(theta).to('deg').value
+        rad = Angle(rad).to('deg').value
+        energy, theta, rad = np.broadcast_arrays(energy, theta, rad)
+
+        ebounds = EnergyBounds.from_lower_and_upper_bounds(self.energy_lo, self.energy_hi)
+        parameters = list(self.sigmas) + list(self.norms[1:])
+        sigma_1, sigma_2, sigma_3, ampl_2, ampl_3 = _interpolate_psf_parameters(
+            parameters, ebounds.log_centers.to('TeV').value, self.theta.to('deg').value,
+            energy, theta, method=method,
+        )
+
+        # The scale cancels in the normalisation, see `HESSMultiGaussPSF.to_MultiGauss2D`
+        numerator, integral = 0, 0
+        for amplitude, sigma in zip([1, ampl_2, ampl_3], [sigma_1, sigma_2, sigma_3]):
+            with np.errstate(invalid='ignore', divide='ignore'):
+                gauss = np.exp(-0.5 * rad ** 2 / sigma ** 2)
+            numerator += np.where(sigma > 0, amplitude * gauss, 0)
+            integral += 2 * np.pi * amplitude * sigma ** 2
+
+        return Quantity(numerator / integral, 'deg^-2')
+
+    def _nearest_parameters(self, energy, theta):
+        """Gauss parameters at the nearest energy and theta nodes.
+
+        Returns ``(sigmas, norms)`` arrays with shape ``(3, n_theta, n_energy)``,
+        where the norms are the integrals of the Gaussians as in
+        `~gammapy.irf.HESSMultiGaussPSF.to_MultiGauss2D`.
+        """
+        i = np.abs(self.energy_hi[:, np.newaxis] - energy).argmin(axis=0)
+        j = np.abs(self.theta[:, np.newaxis] - theta).argmin(axis=0)
+        idx = np.ix_(j, i)
+
+        sigmas = np.array([_[idx] for _ in self.sigmas], dtype=np.float64)
+        scale, ampl_2, ampl_3 = [np.asarray(_[idx], dtype=np.float64) for _ in self.norms]
+        norms = np.array([scale * 2 * a * s ** 2 for a, s in zip([1, ampl_2, ampl_3], sigmas)])
+        return sigmas, norms
+
+    def containment_radius(self, energy, theta, fraction=0.68, energy_first=False):
+        """Compute containment for all energy and theta values.
+
+        The PSF parameters at the nearest energy and theta nodes are used and
+        the radii are computed for all points at once with a vectorised
+        Newton solve.
+
+        .. note::
+
+            By default the result has the axis order ``(theta, energy)``,
+            which is kept for backwards compatibility. Use
+            ``energy_first=True`` to get the axis order ``(energy, theta)``
+            used by `~gammapy.irf.PSFKing.containment_radius` and
+            `~gammapy.irf.PSF3D.containment_radius`.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy
+        theta : `~astropy.coordinates.Angle`
+            Offset in the field of view
+        fraction : array_like
+            Containment fraction (range 0 .. 1)
+        energy_first : bool
+            Return the radii with the energy axis first.
+
+        Returns
+        -------
+        radius : `~astropy.coordinates.Angle`
+            Containment radius with shape ``(theta, energy) + fraction.shape``,
+            or ``(energy, theta) + fraction.shape`` if ``energy_first`` is set.
+        """
         energy = Energy(energy).flatten()
         theta = Angle(theta).flatten()
-        radius = np.empty((theta.size, energy.size))
-        for idx_energy in range(len(energy)):
-            for idx_theta in range(len(theta)):
-                try:
-                    psf = self.psf_at_energy_and_theta(energy[idx_energy], theta[idx_theta])
-                    radius[idx_theta, idx_energy] = psf.containment_radius(fraction)
-                except ValueError:
-                    log.debug("Computing containment failed for E = {0:.2f}"
-                              " and Theta={1:.2f}".format(energy[idx_energy], theta[idx_theta]))
-                    log.debug("Sigmas: {0} Norms: {1}".format(psf.sigmas, psf.norms))
-                    radius[idx_theta, idx_energy] = np.nan
-
+        sigmas, norms = self._nearest_parameters(energy, theta)
+        radius = _multi_gauss_containment_radius(sigmas, norms, fraction)
+        if energy_first:
+            radius = np.swapaxes(radius, 0, 1)
         return Angle(radius, 'deg')
 
     def plot_containment(self, fraction=0.68, ax=None, show_safe_energy=False,
@@ -246,7 +331,8 @@ class EnergyDependentMultiGaussPSF(object):
         # kwargs.setdefault('vmax', 0.2)
 
         # Set up and compute data
-        containment = self.containment_radius(self.energy_hi, self.theta, fraction)
+        containment = self.containment_radius(self.energy_hi, self.theta, fraction,
+                                              energy_first=True)
 
         extent = [
             self.theta[0].value, self.theta[-1].value,
@@ -254,7 +340,7 @@ class EnergyDependentMultiGaussPSF(object):
         ]
 
         # Plotting
-        ax.imshow(containment.T.value, extent=extent, **kwargs)
+        ax.imshow(containment.value, extent=extent, **kwargs)
 
         if show_safe_energy:
             # Log scale transformation for position of energy threshold
@@ -350,10 +436,11 @@ class EnergyDependentMultiGaussPSF(object):
         ss += 'Safe energy threshold hi: {0:6.3f}\n'.format(self.energy_thresh_hi)
 
         for fraction in fractions:
-            containment = self.containment_radius(energies, thetas, fraction)
+            containment = self.containment_radius(energies, thetas, fraction,
+                                                  energy_first=True)
             for i, energy in enumerate(energies):
                 for j, theta in enumerate(thetas):
-                    radius = containment[j, i]
+                    radius = containment[i, j]
                     ss += ("{0:2.0f}% containment radius at theta = {1} and "
                            "E = {2:4.1f}: {3:5.8f}\n"
                            "".format(100 * fraction, theta, energy, radius))
@@ -394,11 +481,60 @@ class EnergyDependentMultiGaussPSF(object):
         else:
             offset = Angle(np.arange(0, 1.5, 0.005), 'deg')
 
-        psf_value = Quantity(np.empty((energies.size, offset.size)), 'deg^-2')
-
-        for i, energy in enumerate(energies):
-            psf_gauss = self.psf_at_energy_and_theta(energy, theta)
-            psf_value[i] = Quantity(psf_gauss(offset, np.zeros_like(offset)), 'deg^-2')
+        psf_value = self.evaluate_psf(energies[:, np.newaxis], theta, offset)
 
         return EnergyDependentTablePSF(energy=energies, offset=offset,
                                        exposure=exposure, psf_value=psf_value)
+
+
+def _multi_gauss_containment_radius(sigmas, norms, fraction, n_iter=100):
+    r"""Containment radii of normalised sums of 2D Gaussians.
+
+    Solves ``MultiGauss2D(sigmas, norms).normalize().containment_fraction(radius) = fraction``
+    for arrays of parameters with Newton's method in :math:`\theta^2`. The
+    containment fraction is a concave function of :math:`\theta^2`, so the
+    iteration started at zero increases monotonically towards the solution.
+
+    Parameters
+    ----------
+    sigmas, norms : `~numpy.ndarray`
+        Widths and integrals of the Gaussians, shape ``(n_gauss, ...)``
+    fraction : array_like
+        Containment fraction (range 0 .. 1)
+    n_iter : int
+        Maximum number of iterations
+
+    Returns
+    -------
+    radius : `~numpy.ndarray`
+        Containment radius in units of ``sigmas``, shape ``sigmas.shape[1:] + fraction.shape``.
+        NaN where the fraction can't be reached.
+    """
+    fraction = np.asarray(fraction, dtype=np.float64)
+    sigmas = np.asarray(sigmas, dtype=np.float64)
+    norms = np.asarray(norms, dtype=np.float64)
+    shape = sigmas.shape[1:] + fraction.shape
+
+    # Axes (n_gauss, n_points, n_fraction)
+    sigma2 = sigmas.reshape(len(sigmas), -1, 1) ** 2
+    weights = norms.reshape(len(norms), -1, 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        weights = weights / np.nansum(weights, axis=0)
+    # Components with zero weight don't contribute
+    sigma2 = np.where(weights == 0, 1, sigma2)
+    f = fraction.reshape(1, -1)
+
+    valid = np.all(np.isfinite(weights) & np.isfinite(sigma2), axis=0) & (f < 1) & (f >= 0)
+    theta2 = np.zeros(valid.shape)
+    for _ in range(n_iter):
+        exp = np.exp(-theta2 / (2 * sigma2))
+        residual = f - np.sum(weights * (1 - exp), axis=0)
+        derivative = np.sum(weights * exp / (2 * sigma2), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            step = np.where(valid & (residual > 0), residual / derivative, 0)
+        theta2 += step
+        if np.all(step <= 1e-15 * theta2):
+            break
+
+    radius = np.where(valid, np.sqrt(theta2), np.nan)
+    return radius.reshape(shape)
@@ -16,12 +16,14 @@ by issueing center_psf()
 """
 from __future__ import absolute_import, division, print_function, unicode_literals
 import json
+import copy
 import numpy as np
 from astropy.convolution import Gaussian2DKernel
 from astropy.io import fits
 from astropy.stats import gaussian_fwhm_to_sigma, gaussian_sigma_to_fwhm
 from ..morphology import read_json
 from ..morphology import Gauss2DPDF, MultiGauss2D
+from ..utils.cache import LRUCache
 
 __all__ = [
     'GaussPSF',
@@ -31,6 +33,9 @@ __all__ = [
     'multi_gauss_psf_kernel',
 ]
 
+# Multi-Gauss PSF kernels, shared between all calls with the same parameters
+_MULTI_GAUSS_KERNEL_CACHE = LRUCache(maxsize=16)
+
 
 class GaussPSF(Gauss2DPDF):
     """Extension of Gauss2D PDF by PSF-specific functionality."""
@@ -329,6 +334,9 @@ def multi_gauss_psf_kernel(psf_parameters, BINSZ=0.02, NEW_BINSZ=0.02, **kwargs)
     amplitude at the center and the FWHM.
     See the example for the exact format.
 
+    Kernels are cached, repeated calls with the same parameters return a
+    copy of the cached kernel.
+
     Parameters
     ----------
     psf_parameters : dict
@@ -351,6 +359,18 @@ def multi_gauss_psf_kernel(psf_parameters, BINSZ=0.02, NEW_BINSZ=0.02, **kwargs)
     >>> psf_pars['psf3'] = dict(ampl=0.47, fwhm=5.16)
     >>> psf_kernel = multi_gauss_psf_kernel(psf_pars, x_size=51)
     """
+    pars = [sorted(psf_parameters['psf{0}'.format(ii)].items()) for ii in range(1, 4)]
+    key = (repr(pars), float(BINSZ), float(NEW_BINSZ), repr(sorted(kwargs.items())))
+
+    def compute():
+        return _multi_gauss_psf_kernel(psf_parameters, BINSZ, NEW_BINSZ, **kwargs)
+
+    # Return a copy, because kernels are modified in place, e.g. by `normalize`
+    return copy.deepcopy(_MULTI_GAUSS_KERNEL_CACHE.get_or_compute(key, compute))
+
+
+def _multi_gauss_psf_kernel(psf_parameters, BINSZ, NEW_BINSZ, **kwargs):
+    """Compute multi-Gauss PSF kernel, see `multi_gauss_psf_kernel`."""
     psf = None
     for ii in range(1, 4):
         # Convert sigma and amplitude
@@ -11,6 +11,7 @@ from ..utils.array import array_stats_str
 from ..utils.energy import Energy, EnergyBounds
 from ..utils.fits import table_to_fits_table
 from . import EnergyDependentTablePSF
+from .psf_table import _interpolate_psf_parameters
 
 __all__ = ['PSFKing']
 
@@ -211,6 +212,94 @@ class PSFKing(object):
         param["gamma"] = gamma
         return param
 
+    def evaluate_psf(self, energy, theta, rad, method='linear'):
+        """Evaluate the PSF for arrays of energy, theta and rad.
+
+        The King parameters are interpolated in ``log(energy)`` and ``theta``
+        on the (energy, offset) grid, and the PSF is evaluated for all points
+        in one broadcasted call.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy
+        theta : `~astropy.coordinates.Angle`
+            Offset in the field of view
+        rad : `~astropy.coordinates.Angle`
+            Offset from PSF center
+        method : {'linear', 'nearest'}
+            Interpolation method for the King parameters
+
+        Returns
+        -------
+        psf_value : `~astropy.units.Quantity`
+            PSF value dP / dOmega with the broadcast shape of the inputs
+        """
+        energy = Energy(energy).to('TeV').value
+        theta = Angle(theta).to('deg').value
+        rad = Angle(rad).to('deg').value
+
+        gamma, sigma = _interpolate_psf_parameters(
+            [self.gamma, self.sigma.deg], self.energy.to('TeV').value, self.offset.deg,
+            energy, theta, method=method,
+        )
+        return Quantity(self.evaluate_direct(rad, gamma, sigma), 'deg^-2')
+
+    def _nearest_parameters(self, energy, offset):
+        """King parameters ``(gamma, sigma)`` at the nearest energy and offset nodes.
+
+        Returns arrays with shape ``(n_energy, n_offset)``, sigma in deg.
+        """
+        i = np.abs(self.energy[:, np.newaxis] - energy).argmin(axis=0)
+        j = np.abs(self.offset[:, np.newaxis] - offset).argmin(axis=0)
+        idx = np.ix_(j, i)
+        gamma = np.asarray(self.gamma[idx], dtype=np.float64).T
+        sigma = np.asarray(self.sigma.deg[idx], dtype=np.float64).T
+        return gamma, sigma
+
+    def containment_radius(self, energy, offset, fraction=0.68):
+        r"""Containment radius for all energy and offset values.
+
+        Uses the PSF parameters at the nearest energy and offset nodes and
+        the analytical containment fraction of the King profile
+
+        .. math::
+            F(r) = 1 - \left(1 + \frac{r^2}{2 \gamma \sigma^2}\right)^{1 - \gamma}
+
+        .. note::
+
+            The result has the axis order ``(energy, offset)``, like
+            `~gammapy.irf.PSF3D.containment_radius` and
+            `~gammapy.irf.EnergyDependentMultiGaussPSF.containment_radius`
+            with ``energy_first=True``.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy
+        offset : `~astropy.coordinates.Angle`
+            Offset in the field of view
+        fraction : array_like
+            Containment fraction (range 0 .. 1)
+
+        Returns
+        -------
+        radius : `~astropy.coordinates.Angle`
+            Containment radius with shape ``(energy, offset) + fraction.shape``
+        """
+        energy = Energy(energy).flatten()
+        offset = Angle(offset).flatten()
+        fraction = np.asarray(fraction, dtype=np.float64)
+
+        gamma, sigma = self._nearest_parameters(energy, offset)
+        gamma = gamma.reshape(gamma.shape + (1,) * fraction.ndim)
+        sigma = sigma.reshape(sigma.shape + (1,) * fraction.ndim)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r2 = 2 * gamma * sigma ** 2 * ((1 - fraction) ** (1 / (1 - gamma)) - 1)
+            r2 = np.where((gamma > 1) & (fraction >= 0) & (fraction < 1), r2, np.nan)
+        return Angle(np.sqrt(r2), 'deg')
+
     def to_table_psf(self, theta=None, offset=None, exposure=None):
         """
         Convert king PSF in table PSF.
@@ -237,11 +326,7 @@ class PSFKing(object):
         # Defaults
         theta = theta or Angle(0, 'deg')
         offset = offset or Angle(np.arange(0, 1.5, 0.005), 'deg')
-        psf_value = Quantity(np.empty((len(energies), len(offset))), 'deg^-2')
-
-        for i, energy in enumerate(energies):
-            param_king = self.evaluate(energy, theta)
-            psf_value[i] = Quantity(self.evaluate_direct(offset, param_king["gamma"], param_king["sigma"]), 'deg^-2')
+        psf_value = self.evaluate_psf(energies[:, np.newaxis], theta, offset)
 
         return EnergyDependentTablePSF(energy=energies, offset=offset,
                                        exposure=exposure, psf_value=psf_value)
@@ -1,5 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import hashlib
+import os
 import numpy as np
 from astropy.io import fits
 from astropy.units import Quantity
@@ -8,6 +10,7 @@ from astropy.convolution.utils import discretize_oversample_2D
 from ..morphology import Gauss2DPDF
 from ..utils.array import array_stats_str
 from ..utils.energy import Energy
+from ..utils.cache import LRUCache
 
 __all__ = [
     'TablePSF',
@@ -19,6 +22,97 @@ __all__ = [
 DEFAULT_PSF_SPLINE_KWARGS = dict(k=1, s=0)
 
 
+def _containment_radius_table(offset, dp_domega, fraction):
+    r"""Containment radii for many tabulated PSFs at once.
+
+    Vectorised equivalent of ``TablePSF(offset, dp_domega).containment_radius(fraction)``
+    for the default linear splines: the containment fraction is the cumulative
+    trapezoidal integral of :math:`dP / d\theta` and radii are obtained by
+    linear interpolation (and extrapolation) of its inverse.
+
+    Parameters
+    ----------
+    offset : `~numpy.ndarray`
+        Offset array in radian, shape ``(n,)``
+    dp_domega : `~numpy.ndarray`
+        PSF values in sr^-1, shape ``(..., n)``
+    fraction : array_like
+        Containment fractions (range 0 .. 1)
+
+    Returns
+    -------
+    radius : `~numpy.ndarray`
+        Containment radii in radian, shape ``dp_domega.shape[:-1] + fraction.shape``
+    """
+    x = np.asarray(offset, dtype=float)
+    y = 2 * np.pi * x * np.asarray(dp_domega, dtype=float)
+    fraction = np.asarray(fraction, dtype=float)
+    shape = y.shape[:-1] + fraction.shape
+    y = y.reshape(-1, x.size)
+    n_psf, n_offset = y.shape
+
+    # Integral from zero offset, with the linear extrapolation of the first
+    # segment below the first node like for the `TablePSF` splines
+    slope = (y[:, 1] - y[:, 0]) / (x[1] - x[0])
+    start = y[:, 0] * x[0] - slope * x[0] ** 2 / 2
+    cdf = np.cumsum((y[:, 1:] + y[:, :-1]) / 2 * np.diff(x), axis=1)
+    cdf = np.column_stack([start, start[:, np.newaxis] + cdf])
+
+    # Only use the nodes where the integral is strictly increasing, see `TablePSF`
+    n_valid = (np.diff(cdf, axis=1) <= 0).argmax(axis=1)
+    n_valid[n_valid == 0] = n_offset
+    cdf_valid = np.where(np.arange(n_offset) < n_valid[:, np.newaxis], cdf, np.inf)
+
+    # Linear interpolation segment for every fraction
+    f = fraction.reshape(1, -1)
+    idx = (cdf_valid[:, np.newaxis, :] <= f[:, :, np.newaxis]).sum(axis=2) - 1
+    idx = np.clip(idx, 0, n_valid[:, np.newaxis] - 2)
+    rows = np.arange(n_psf)[:, np.newaxis]
+    x_lo, x_hi = x[idx], x[idx + 1]
+    cdf_lo, cdf_hi = cdf[rows, idx], cdf[rows, idx + 1]
+    radius = x_lo + (f - cdf_lo) * (x_hi - x_lo) / (cdf_hi - cdf_lo)
+    return radius.reshape(shape)
+
+
+def _interpolate_psf_parameters(parameters, energy_nodes, theta_nodes, energy, theta,
+                                method='linear'):
+    """Interpolate tabulated PSF parameters on the (energy, theta) grid.
+
+    The interpolation is done in ``log(energy)`` and ``theta``. Coordinates
+    outside the grid are clipped to the grid edges, so that the parameters
+    aren't extrapolated.
+
+    Parameters
+    ----------
+    parameters : list of `~numpy.ndarray`
+        Parameter tables with shape ``(n_theta, n_energy)``
+    energy_nodes, theta_nodes : `~numpy.ndarray`
+        Energy and theta nodes of the parameter tables
+    energy, theta : `~numpy.ndarray`
+        Energies and thetas (same units as the nodes), must be broadcastable
+    method : {'linear', 'nearest'}
+        Interpolation method, see `~scipy.interpolate.RegularGridInterpolator`
+
+    Returns
+    -------
+    values : list of `~numpy.ndarray`
+        Interpolated parameters with the broadcast shape of ``energy`` and ``theta``
+    """
+    from scipy.interpolate import RegularGridInterpolator
+
+    log_energy_nodes = np.log10(energy_nodes)
+    log_energy = np.clip(np.log10(energy), log_energy_nodes[0], log_energy_nodes[-1])
+    theta = np.clip(theta, theta_nodes[0], theta_nodes[-1])
+    log_energy, theta = np.broadcast_arrays(log_energy, theta)
+
+    values = np.stack([np.asarray(_, dtype=np.float64) for _ in parameters], axis=-1)
+    interpolator = RegularGridInterpolator((theta_nodes, log_energy_nodes), values,
+                                           method=method)
+    points = np.column_stack([theta.ravel(), log_energy.ravel()])
+    values = interpolator(points).reshape(theta.shape + (len(parameters),))
+    return [values[..., idx] for idx in range(len(parameters))]
+
+
 class TablePSF(object):
     r"""Radially-symmetric table PSF.
 
@@ -438,6 +532,9 @@ class EnergyDependentTablePSF(object):
         # Cache for TablePSF at each energy ... only computed when needed
         self._table_psf_cache = [None] * len(self.energy)
 
+        # Cache for convolution kernels in energy bands
+        self._kernel_cache = LRUCache(maxsize=32)
+
     @classmethod
     def from_fits(cls, hdu_list):
         """Create `EnergyDependentTablePSF` from ``gtpsf`` format HDU list.
@@ -602,6 +699,75 @@ class EnergyDependentTablePSF(object):
         # making a `TablePSF`.
         return TablePSF(self.offset, total_psf_value, **kwargs)
 
+    def kernel(self, energy_band, pixel_size, offset_max=None, spectral_index=2,
+               normalize=True, cache_dir=None):
+        """Convolution kernel of the average PSF in a given energy band (cached).
+
+        Calls `table_psf_in_energy_band` and `TablePSF.kernel`. Kernels are
+        kept in a least-recently-used cache on the PSF object, so repeated
+        calls with the same parameters, e.g. when convolving many model cubes,
+        don't recompute the oversampled kernel.
+
+        Parameters
+        ----------
+        energy_band : `~astropy.units.Quantity`
+            Energy band
+        pixel_size : `~astropy.coordinates.Angle`
+            Kernel pixel size
+        offset_max : `~astropy.coordinates.Angle`, optional
+            Kernel radius, default is the maximum PSF offset
+        spectral_index : float
+            Power law spectral index used to average the PSF in the band
+        normalize : bool
+            Normalize the kernel to unit sum
+        cache_dir : str, optional
+            Directory to store kernels on disk, so that they can be re-used
+            across sessions. Kernels are identified by a hash of the PSF data
+            and the kernel parameters.
+
+        Returns
+        -------
+        kernel : `~astropy.units.Quantity`
+            Kernel 2D image
+        """
+        energy_band = Quantity(energy_band).to('GeV')
+        pixel_size = Angle(pixel_size)
+        if offset_max is not None:
+            offset_max = Angle(offset_max)
+
+        key = (tuple(energy_band.value), float(spectral_index), pixel_size.deg,
+               None if offset_max is None else offset_max.deg, bool(normalize))
+
+        def compute():
+            if cache_dir is not None:
+                filename = os.path.join(str(cache_dir), 'psf_kernel_{}.npz'.format(
+                    self._kernel_cache_key(key)))
+                if os.path.exists(filename):
+                    with np.load(filename) as data:
+                        return Quantity(data['kernel'], str(data['unit']))
+
+            psf = self.table_psf_in_energy_band(energy_band, spectral_index)
+            kernel = psf.kernel(pixel_size, offset_max, normalize=normalize)
+
+            if cache_dir is not None:
+                # Write to a temporary file first, so that concurrent
+                # processes never read incomplete files
+                tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+                with open(tmp_filename, 'wb') as fh:
+                    np.savez(fh, kernel=kernel.value, unit=str(kernel.unit))
+                os.rename(tmp_filename, filename)
+            return kernel
+
+        return self._kernel_cache.get_or_compute(key, compute).copy()
+
+    def _kernel_cache_key(self, key):
+        """Hash identifying the PSF data and kernel parameters."""
+        sha = hashlib.sha1()
+        for array in [self.energy, self.offset, self.exposure, self.psf_value]:
+            sha.update(np.ascontiguousarray(array.value).tobytes())
+        sha.update(repr(key).encode('ascii'))
+        return sha.hexdigest()
+
     def containment_radius(self, energy, fraction, interp_kwargs=None):
         """Containment radius.
 
@@ -609,17 +775,24 @@ class EnergyDependentTablePSF(object):
         ----------
         energy : `~astropy.units.Quantity`
             Energy
-        fraction : float
-            Containment fraction in %
+        fraction : array_like
+            Containment fraction (range 0 .. 1)
+        interp_kwargs : dict
+            Option for interpolation for `~scipy.interpolate.RegularGridInterpolator`
 
         Returns
         -------
-        radius : `~astropy.units.Quantity`
-            Containment radius in deg
+        radius : `~astropy.coordinates.Angle`
+            Containment radius in deg, with shape ``energy.shape + fraction.shape``
         """
-        # TODO: useless at the moment ... support array inputs or remove!
-        psf = self.table_psf_at_energy(energy, interp_kwargs)
-        return psf.containment_radius(fraction)
+        energy = Quantity(energy)
+        fraction = np.asarray(fraction)
+
+        psf_value = self.evaluate(energy.flatten(), None, interp_kwargs)
+        radius = _containment_radius_table(self.offset.to('radian').value,
+                                           psf_value.to('sr^-1').value, fraction)
+        radius = radius.reshape(energy.shape + fraction.shape)
+        return Angle(radius, 'radian').to('deg')
 
     def integral(self, energy, offset_min, offset_max):
         """Containment fraction.
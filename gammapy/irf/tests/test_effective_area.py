@@ -107,6 +107,34 @@ def test_EffectiveAreaTable2D_generic():
     assert 'EffectiveAreaTable2D' in str(aeff)
 
 
+@requires_dependency('scipy')
+def test_EffectiveAreaTable2D_evaluate_grid():
+    from scipy.interpolate import RegularGridInterpolator
+    energy = np.logspace(0, 1, 5) * u.TeV
+    offset = [0.2, 0.5, 1.0] * u.deg
+    data = np.arange(12).reshape(4, 3) ** 2 * u.m * u.m
+    aeff = EffectiveAreaTable2D(offset=offset, energy=energy, data=data)
+
+    test_energy = np.logspace(-0.2, 1.2, 6) * u.TeV
+    test_offset = np.linspace(0.1, 1.1, 10).reshape(2, 5) * u.deg
+    points = [np.log10(aeff.energy.nodes.value), aeff.offset.nodes.value]
+    interpolator = RegularGridInterpolator(points, data.value, bounds_error=False)
+    xi = np.meshgrid(np.log10(test_energy.value), test_offset.value.ravel(),
+                     indexing='ij')
+
+    for method in ['linear', 'nearest']:
+        actual = aeff.evaluate(energy=test_energy, offset=test_offset, method=method)
+        desired = interpolator(np.stack(xi, axis=-1), method=method).reshape(6, 2, 5)
+        assert actual.shape == (6, 2, 5)
+        assert_allclose(actual.value, desired)
+
+        # Broadcast points give the same result as the grid
+        actual = aeff.evaluate(energy=test_energy[:, np.newaxis, np.newaxis],
+                               offset=test_offset, method=method, grid=False)
+        assert actual.shape == (6, 2, 5)
+        assert_allclose(actual.value, desired)
+
+
 @requires_dependency('scipy')
 @requires_dependency('matplotlib')
 @requires_data('gammapy-extra')
@@ -33,6 +33,29 @@ def test_EnergyDispersion():
     edisp.plot_bias()
 
 
+@requires_dependency('scipy')
+def test_EnergyDispersion_sparse(tmpdir):
+    e_true = np.logspace(-1, 2, 61) * u.TeV
+    e_reco = np.logspace(-1, 2, 41) * u.TeV
+    edisp = EnergyDispersion.from_gauss(e_true=e_true, e_reco=e_reco, sigma=0.1)
+    pdf_matrix = edisp.pdf_matrix.value
+
+    filename = str(tmpdir / 'rmf_test.fits')
+    edisp.write(filename)
+    edisp2 = EnergyDispersion.read(filename)
+
+    sparse = edisp2.pdf_matrix_sparse
+    assert sparse.nnz == np.count_nonzero(pdf_matrix)
+    assert_allclose(sparse.toarray(), pdf_matrix, rtol=1e-6)
+    assert_allclose(edisp2.pdf_matrix.value, pdf_matrix, rtol=1e-6)
+
+    data = np.arange(60.)
+    assert_allclose(edisp.apply(data), np.dot(data, pdf_matrix))
+
+    edisp2.data = sparse[:, ::-1]
+    assert_allclose(edisp2.pdf_matrix.value[:, ::-1], sparse.toarray())
+
+
 @requires_data('gammapy-extra')
 def test_EnergyDispersion_write(tmpdir):
     filename = gammapy_extra.filename(
@@ -92,3 +115,61 @@ def test_EnergyDispersion2D():
     e_val = np.sqrt(e_true[2] * e_true[3])
     desired = edisp.get_response(offset, e_val, e_reco)
     assert_equal(actual, desired)
+
+
+@requires_dependency('scipy')
+def test_EnergyDispersion2D_to_energy_dispersion():
+    e_bounds = EnergyBounds.equal_log_spacing(0.1, 100, 15, 'TeV')
+    migra = np.linspace(0, 3, 31)
+    offset = Angle([0, 1, 2], 'deg')
+    dispersion = np.random.RandomState(0).rand(2, 30, 15)
+    edisp = EnergyDispersion2D(e_bounds.lower_bounds, e_bounds.upper_bounds,
+                               migra[:-1], migra[1:], offset[:-1], offset[1:],
+                               dispersion)
+
+    e_true = EnergyBounds.equal_log_spacing(0.8, 5, 4, 'TeV')
+    e_reco = EnergyBounds.equal_log_spacing(500, 10000, 6, 'GeV')
+    rmfs = edisp.to_energy_dispersion(Angle([0.6, 1.2], 'deg'),
+                                      e_true=e_true, e_reco=e_reco)
+    assert len(rmfs) == 2
+
+    for rmf, offset in zip(rmfs, Angle([0.6, 1.2], 'deg')):
+        assert rmf.pdf_matrix.shape == (4, 6)
+        for idx, energy in enumerate(e_true.log_centers):
+            migra = (e_reco.log_centers / energy).to('').value
+            desired = edisp.evaluate(offset, energy, migra)
+            desired *= (e_reco.bands / energy).to('').value
+            assert_allclose(rmf.pdf_matrix[idx], desired)
+
+    rmf = edisp.to_energy_dispersion(Angle(1.2, 'deg'), e_true=e_true, e_reco=e_reco)
+    assert_allclose(rmf.pdf_matrix, rmfs[1].pdf_matrix)
+
+
+@requires_dependency('scipy')
+def test_EnergyDispersion2D_units():
+    e_bounds = EnergyBounds.equal_log_spacing(0.1, 100, 15, 'TeV')
+    migra = np.linspace(0, 3, 31)
+    offset = Angle([0, 1, 2], 'deg')
+    dispersion = np.random.RandomState(0).rand(2, 30, 15)
+    edisp = EnergyDispersion2D(e_bounds.lower_bounds, e_bounds.upper_bounds,
+                               migra[:-1], migra[1:], offset[:-1], offset[1:],
+                               dispersion)
+
+    # Same dispersion with energy axis in GeV and offset axis in arcmin
+    e_bounds_gev = e_bounds.to('GeV')
+    offset_arcmin = offset.to('arcmin')
+    edisp_gev = EnergyDispersion2D(e_bounds_gev.lower_bounds, e_bounds_gev.upper_bounds,
+                                   migra[:-1], migra[1:], offset_arcmin[:-1],
+                                   offset_arcmin[1:], dispersion)
+
+    e_true = EnergyBounds.equal_log_spacing(0.8, 5, 4, 'TeV')
+    e_reco = EnergyBounds.equal_log_spacing(500, 10000, 6, 'GeV')
+    offset = Angle([0.6, 1.2], 'deg')
+    actual = edisp_gev.to_energy_dispersion(offset, e_true=e_true, e_reco=e_reco)
+    desired = edisp.to_energy_dispersion(offset, e_true=e_true, e_reco=e_reco)
+    for rmf_actual, rmf_desired in zip(actual, desired):
+        assert_allclose(rmf_actual.pdf_matrix, rmf_desired.pdf_matrix)
+
+    actual = edisp_gev.evaluate(offset[0], e_true[1], migra=[0.8, 1.2])
+    desired = edisp.evaluate(offset[0], e_true[1], migra=[0.8, 1.2])
+    assert_allclose(actual, desired)
@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
 from astropy.tests.helper import assert_quantity_allclose
 from astropy.table import Table
 from astropy.units import Quantity
@@ -47,3 +48,31 @@ def test_PSF3D_write(tmpdir):
     assert_quantity_allclose(psf.rad_lo, psf2.rad_lo)
     assert_quantity_allclose(psf.rad_hi, psf2.rad_hi)
     assert_quantity_allclose(psf.psf_value, psf2.psf_value)
+
+
+@requires_dependency('scipy')
+def test_PSF3D_containment_radius():
+    energy = Energy(np.logspace(-1, 2, 7), 'TeV')
+    offset = Angle([0, 1, 2], 'deg')
+    rad = Angle(np.linspace(0, 0.6, 61), 'deg')
+    rad_center = (rad[1:] + rad[:-1]) / 2
+    sigma = Angle([[0.1, 0.12, 0.15], [0.08, 0.1, 0.12], [0.06, 0.08, 0.1],
+                   [0.05, 0.06, 0.08], [0.04, 0.05, 0.06], [0.04, 0.05, 0.06]], 'deg').T
+    psf_value = np.exp(-0.5 * (rad_center.deg[:, np.newaxis, np.newaxis] / sigma.deg) ** 2)
+    psf_value /= 2 * np.pi * sigma.radian ** 2
+    psf = PSF3D(energy[:-1], energy[1:], offset, rad[:-1], rad[1:],
+                Quantity(psf_value, 'sr^-1'))
+
+    energies = Energy([0.3, 1, 20], 'TeV')
+    thetas = Angle([0, 0.5, 1.5], 'deg')
+    radius = psf.containment_radius(energies, thetas, [0.68, 0.95])
+    assert radius.shape == (3, 3, 2)
+
+    for idx_energy, energy in enumerate(energies):
+        for idx_theta, theta in enumerate(thetas):
+            table_psf = psf.to_table_psf(energy, theta)
+            desired = table_psf.containment_radius([0.68, 0.95])
+            assert_quantity_allclose(radius[idx_energy, idx_theta], desired, rtol=1e-10)
+
+    actual = psf.containment_radius(Energy(1, 'TeV'), fraction=0.68)
+    assert actual.shape == (1, 1)
@@ -64,3 +64,65 @@ def test_to_table_psf(energy):
 
     # TODO: try to improve precision, so that rtol can be lowered
     assert_allclose(desired, actual.degree, rtol=0.03)
+
+
+@requires_dependency('scipy')
+def test_EnergyDependentMultiGaussPSF_containment_radius():
+    energy = Quantity(np.logspace(-1, 2, 5), 'TeV')
+    theta = Angle([0, 1, 2], 'deg')
+    shape = (3, 4)
+    sigmas = [np.full(shape, 0.05), np.linspace(0.05, 0.2, 12).reshape(shape),
+              np.full(shape, 0.3)]
+    norms = [np.full(shape, 100.), np.full(shape, 0.5), np.linspace(0, 0.1, 12).reshape(shape)]
+    psf = EnergyDependentMultiGaussPSF(energy[:-1], energy[1:], theta, sigmas, norms)
+
+    energies = Quantity([0.2, 1, 50], 'TeV')
+    thetas = Angle([0, 1.2], 'deg')
+    fractions = [0, 0.68, 0.95]
+    radius = psf.containment_radius(energies, thetas, fractions)
+    assert radius.shape == (2, 3, 3)
+
+    for idx_energy, energy in enumerate(energies):
+        for idx_theta, theta in enumerate(thetas):
+            multi_gauss = psf.psf_at_energy_and_theta(energy, theta)
+            desired = [multi_gauss.containment_radius(_) for _ in fractions]
+            assert_allclose(radius[idx_theta, idx_energy].deg, desired, rtol=1e-10)
+
+    radius_energy_first = psf.containment_radius(energies, thetas, fractions, energy_first=True)
+    assert radius_energy_first.shape == (3, 2, 3)
+    assert_allclose(radius_energy_first.deg, np.swapaxes(radius.deg, 0, 1))
+
+    radius = psf.containment_radius(energies, thetas, 1)
+    assert np.isnan(radius).all()
+
+
+@requires_dependency('scipy')
+def test_EnergyDependentMultiGaussPSF_evaluate_psf():
+    energy = Quantity([0.1, 1, 10, 100], 'TeV')
+    theta = Angle([0, 1], 'deg')
+    shape = (2, 3)
+    sigmas = [np.full(shape, 0.05), np.linspace(0.05, 0.2, 6).reshape(shape),
+              np.full(shape, 0.3)]
+    norms = [np.full(shape, 100.), np.full(shape, 0.5), np.linspace(0, 0.1, 6).reshape(shape)]
+    psf = EnergyDependentMultiGaussPSF(energy[:-1], energy[1:], theta, sigmas, norms)
+
+    rad = Angle(np.linspace(0, 0.5, 6), 'deg')
+    log_centers = np.sqrt(energy[:-1] * energy[1:])
+    actual = psf.evaluate_psf(log_centers[:, np.newaxis], Angle(1, 'deg'), rad)
+    assert actual.shape == (3, 6)
+
+    # At the energy bin log centers the parameters aren't interpolated
+    for idx, energy_hi in enumerate(energy[1:]):
+        multi_gauss = psf.psf_at_energy_and_theta(energy_hi, Angle(1, 'deg'))
+        desired = multi_gauss(rad.deg, np.zeros_like(rad.deg))
+        assert_allclose(actual[idx].to('deg^-2').value, desired)
+
+    table_psf = psf.to_table_psf(theta=Angle(1, 'deg'))
+    desired = psf.evaluate_psf(log_centers[0], Angle(1, 'deg'), table_psf.offset)
+    assert_allclose(table_psf.psf_value[0].to('sr^-1').value, desired.to('sr^-1').value)
+
+    # Parameters are interpolated in log(energy)
+    actual = psf.evaluate_psf(Quantity(1, 'TeV'), Angle(0, 'deg'), Angle(0, 'deg'))
+    lo = psf.evaluate_psf(Quantity(0.3, 'TeV'), Angle(0, 'deg'), Angle(0, 'deg'))
+    hi = psf.evaluate_psf(Quantity(3, 'TeV'), Angle(0, 'deg'), Angle(0, 'deg'))
+    assert lo < actual < hi or hi < actual < lo
@@ -73,3 +73,8 @@ def test_multi_gauss_psf_kernel():
 
     assert_allclose(psf_kernel.array[25, 25], 0.05047558713797154)
     assert_allclose(psf_kernel.array[23, 29], 0.003259483464443567)
+
+    # Cached kernel is not modified by changes to the returned kernel
+    psf_kernel.array[25, 25] = 0
+    psf_kernel = multi_gauss_psf_kernel(psf_data, x_size=51)
+    assert_allclose(psf_kernel.array[25, 25], 0.05047558713797154)
@@ -59,3 +59,45 @@ def test_psf_king_write(psf_king, tmpdir):
     assert_quantity_allclose(psf_king2.offset, psf_king.offset)
     assert_quantity_allclose(psf_king2.gamma, psf_king.gamma)
     assert_quantity_allclose(psf_king2.sigma, psf_king.sigma)
+
+
+def test_psf_king_containment_radius():
+    energy = Quantity([0.1, 1, 10], 'TeV')
+    gamma = np.array([[2, 3], [1.5, 2]])
+    sigma = Angle([[0.1, 0.05], [0.2, 0.1]], 'deg')
+    psf = PSFKing(energy[:-1], energy[1:], Angle([0, 1], 'deg'), gamma, sigma)
+
+    fractions = [0.5, 0.68, 0.95]
+    radius = psf.containment_radius(Quantity([0.2, 5, 8], 'TeV'), Angle([0, 0.9], 'deg'), fractions)
+    # Axis order is (energy, offset, fraction)
+    assert radius.shape == (3, 2, 3)
+
+    # Numerical integration of the King profile for E = 5 TeV and offset = 0.9 deg
+    rad = np.linspace(0, 10, 100001)
+    dp_dtheta = 2 * np.pi * rad * psf.evaluate_direct(rad, 2, 0.1)
+    cdf = np.cumsum(dp_dtheta) * (rad[1] - rad[0])
+    desired = np.interp(fractions, cdf, rad)
+    assert_quantity_allclose(radius[1, 1], Angle(desired, 'deg'), rtol=1e-3)
+
+
+def test_psf_king_evaluate_psf():
+    energy = Quantity([0.1, 1, 10], 'TeV')
+    gamma = np.array([[2, 3], [1.5, 2]])
+    sigma = Angle([[0.1, 0.05], [0.2, 0.1]], 'deg')
+    psf = PSFKing(energy[:-1], energy[1:], Angle([0, 1], 'deg'), gamma, sigma)
+
+    rad = Angle([0, 0.1, 0.5], 'deg')
+    energies = psf.energy[:, np.newaxis, np.newaxis]
+    thetas = Angle([0, 0.5, 1], 'deg')[:, np.newaxis]
+    actual = psf.evaluate_psf(energies, thetas, rad)
+    assert actual.shape == (2, 3, 3)
+
+    desired = psf.evaluate_direct(rad.deg, gamma[1, 0], sigma[1, 0].deg)
+    assert_quantity_allclose(actual[0, 2], Quantity(desired, 'deg^-2'))
+
+    # Offset interpolation between the nodes
+    desired = psf.evaluate_direct(rad.deg, 1.75, 0.15)
+    assert_quantity_allclose(actual[0, 1], Quantity(desired, 'deg^-2'))
+
+    table_psf = psf.to_table_psf(theta=Angle(1, 'deg'))
+    assert_quantity_allclose(table_psf.psf_value[1, 20], actual[1, 2, 1])
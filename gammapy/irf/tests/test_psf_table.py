@@ -119,6 +119,56 @@ def test_EnergyDependentTablePSF():
     assert_allclose(actual, desired)
 
 
+@requires_dependency('scipy')
+def test_EnergyDependentTablePSF_kernel(tmpdir):
+    energy = Quantity(np.logspace(1, 3, 5), 'GeV')
+    offset = Angle(np.linspace(0, 1, 50), 'deg')
+    sigma = Angle(0.3 * (energy.value / 10) ** -0.3, 'deg')[:, np.newaxis]
+    psf_value = np.exp(-0.5 * (offset.deg / sigma.deg) ** 2) / (2 * np.pi * sigma.radian ** 2)
+    psf = EnergyDependentTablePSF(energy, offset, psf_value=Quantity(psf_value, 'sr^-1'))
+
+    energy_band = Quantity([10, 500], 'GeV')
+    pixel_size = Angle(0.1, 'deg')
+    offset_max = Angle(0.5, 'deg')
+    desired = psf.table_psf_in_energy_band(energy_band).kernel(pixel_size, offset_max)
+
+    kernel = psf.kernel(energy_band, pixel_size, offset_max, cache_dir=str(tmpdir))
+    assert_allclose(kernel.value, desired.value)
+    assert_allclose(kernel.value.sum(), 1)
+    assert len(psf._kernel_cache) == 1
+
+    # Cached kernels are not modified by changes to the returned kernel
+    kernel *= 2
+    kernel = psf.kernel(energy_band.to('TeV'), pixel_size, offset_max)
+    assert_allclose(kernel.value, desired.value)
+    assert len(psf._kernel_cache) == 1
+
+    # Kernel is read from disk by a new PSF object
+    assert len(tmpdir.listdir()) == 1
+    psf = EnergyDependentTablePSF(energy, offset, psf_value=Quantity(psf_value, 'sr^-1'))
+    kernel = psf.kernel(energy_band, pixel_size, offset_max, cache_dir=str(tmpdir))
+    assert_allclose(kernel.value, desired.value)
+    assert kernel.unit == desired.unit
+
+
+@requires_dependency('scipy')
+def test_EnergyDependentTablePSF_containment_radius():
+    energy = Quantity(np.logspace(1, 3, 5), 'GeV')
+    offset = Angle(np.linspace(0, 1, 50), 'deg')
+    sigma = Angle(0.3 * (energy.value / 10) ** -0.3, 'deg')[:, np.newaxis]
+    psf_value = np.exp(-0.5 * (offset.deg / sigma.deg) ** 2) / (2 * np.pi * sigma.radian ** 2)
+    psf = EnergyDependentTablePSF(energy, offset, psf_value=Quantity(psf_value, 'sr^-1'))
+
+    energies = Quantity([[15, 50, 700]], 'GeV')
+    fractions = [0.5, 0.68, 0.95]
+    radius = psf.containment_radius(energies, fractions)
+    assert radius.shape == (1, 3, 3)
+
+    for idx, energy in enumerate(energies[0]):
+        desired = psf.table_psf_at_energy(energy).containment_radius(fractions)
+        assert_quantity_allclose(radius[0, idx], desired, rtol=1e-10)
+
+
 # TODO: fix this test (move the code from examples/plot_irfs.py here)
 @pytest.mark.xfail
 @requires_data('gammapy-extra')
@@ -2,11 +2,15 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 import logging
+import hashlib
+import os
 import numpy as np
-from astropy.units import Quantity
+from astropy.units import Quantity, Unit
 from astropy.table import QTable
 from astropy.coordinates import Angle
+from astropy.nddata.utils import NoOverlapError
 from ..utils.energy import EnergyBounds
+from ..utils.scripts import make_path
 from ..background import fill_acceptance_image
 from ..image import SkyImage, SkyImageCollection, disk_correlate
 from ..stats import significance
@@ -43,10 +47,16 @@ class ObsImage(object):
             Exclusion regions
     ncounts_min : int
             Minimum counts required for the observation
+    use_cutout : bool
+            Compute the images only on a cutout of ``empty_image`` around
+            the pointing position, that contains all pixels within the
+            maximum offset. Use `~gammapy.image.SkyImage.paste` to add the
+            images to the full image.
     """
 
     def __init__(self, obs, empty_image,
-                 energy_band, offset_band, exclusion_mask=None, ncounts_min=0):
+                 energy_band, offset_band, exclusion_mask=None, ncounts_min=0,
+                 use_cutout=False):
         # Select the events in the given energy and offset range
         self.energy_band = energy_band
         self.offset_band = offset_band
@@ -54,6 +64,13 @@ class ObsImage(object):
         self.obs_id = events.meta["OBS_ID"]
         events = events.select_energy(self.energy_band)
         self.events = events.select_offset(self.offset_band)
+        self.obs_center = obs.pointing_radec
+
+        if use_cutout:
+            size = _fov_cutout_size(empty_image, self.offset_band[1])
+            empty_image = empty_image.cutout(self.obs_center, size)
+            if exclusion_mask is not None:
+                exclusion_mask = exclusion_mask.cutout(self.obs_center, size)
 
         self.maps = SkyImageCollection()
         self.empty_image = empty_image
@@ -66,7 +83,6 @@ class ObsImage(object):
         self.edisp = obs.edisp
         self.psf = obs.psf
         self.bkg = obs.bkg
-        self.obs_center = obs.pointing_radec
         self.livetime = obs.observation_live_time_duration
 
     def counts_map(self):
@@ -93,12 +109,17 @@ class ObsImage(object):
         table = self.bkg.acceptance_curve_in_energy_band(energy_band=self.energy_band)
         center = self.obs_center.galactic
         bkg_hdu = fill_acceptance_image(self.header, center, table["offset"], table["Acceptance"], self.offset_band[1])
-        bkg_map.data = Quantity(bkg_hdu.data, table["Acceptance"].unit) * bkg_map.solid_angle() * self.livetime
-        bkg_map.data = bkg_map.data.decompose()
-        bkg_map.data = bkg_map.data.value
+
+        # Compute acceptance * solid angle * livetime in place, the units are
+        # handled by a scalar conversion factor
+        data = np.asarray(bkg_hdu.data, dtype=bkg_map.data.dtype)
+        data *= bkg_map.solid_angle().to('sr').value
+        unit = table["Acceptance"].unit * Unit('sr') * self.livetime.unit
+        data *= Quantity(self.livetime.value, unit).decompose().value
+        bkg_map.data = data
         if bkg_norm:
             scale = self.background_norm_factor(self.maps["counts"], bkg_map)
-            bkg_map.data = scale * bkg_map.data
+            bkg_map.data *= scale
 
         self.maps["bkg"] = bkg_map
 
@@ -278,9 +299,25 @@ class MosaicImage(object):
         self.thetapsf = None
 
     def make_images(self, make_background_image=False, bkg_norm=True, spectral_index=2.3, for_integral_flux=False,
-                    radius=10):
+                    radius=10, use_cutout=False, parallel=False, cache_dir=None):
         """Compute the counts, bkg, exposure, excess and significance images for a set of observation.
 
+        With ``use_cutout=True`` the images of every observation are only
+        computed on a cutout around the pointing position covering the
+        maximum offset and pasted into the total images, so the time and
+        memory per observation scales with the field of view size instead of
+        the total image size.
+
+        The images of every observation are added to the total images as soon
+        as they are computed, so only the total images are kept in memory.
+        With ``parallel=True`` the observations are processed on multiple
+        cores.
+
+        If ``cache_dir`` is given, the images of every observation are stored
+        there and re-used in later calls with the same image geometry, energy
+        band, offset band, exclusion mask and options. Adding observations to
+        a mosaic then only requires to process the new observations.
+
         Parameters
         ----------
         make_background_image : bool
@@ -293,30 +330,56 @@ class MosaicImage(object):
             True if you want that the total excess / exposure gives the integrated flux
         radius : float
             Disk radius in pixels for the significance map.
+        use_cutout : bool
+            Compute the images of every observation on a cutout around the
+            pointing position.
+        parallel : bool
+            Whether to process the observations in parallel on multiple cores.
+        cache_dir : str, optional
+            Directory to cache the images of every observation.
         """
-
-        total_counts = SkyImage.empty_like(self.empty_image)
-        if make_background_image:
-            total_bkg = SkyImage.empty_like(self.empty_image)
-            total_exposure = SkyImage.empty_like(self.empty_image)
-        for obs_id in self.obs_table['OBS_ID']:
-            obs = self.data_store.obs(obs_id)
-            obs_image = ObsImage(obs, self.empty_image, self.energy_band, self.offset_band,
-                                 self.exclusion_mask, self.ncounts_min)
-            if len(obs_image.events) <= self.ncounts_min:
-                continue
-            else:
-                obs_image.counts_map()
-                total_counts.data += obs_image.maps["counts"].data
-                if make_background_image:
-                    obs_image.bkg_map(bkg_norm)
-                    obs_image.exposure_map(spectral_index, for_integral_flux)
-                    total_bkg.data += obs_image.maps["bkg"].data
-                    total_exposure.data += obs_image.maps["exposure"].data
-        self.maps["counts"] = total_counts
+        if cache_dir is not None:
+            cache_dir = make_path(cache_dir)
+            if not cache_dir.is_dir():
+                cache_dir.mkdir(parents=True)
+            cache_dir = str(cache_dir)
+
+        options = dict(make_background_image=make_background_image, bkg_norm=bkg_norm,
+                       spectral_index=spectral_index, for_integral_flux=for_integral_flux,
+                       use_cutout=use_cutout)
+        cache_key = _obs_images_cache_key(self.empty_image, self.energy_band, self.offset_band,
+                                          self.exclusion_mask, self.ncounts_min, options)
+
+        # State shared by all observations, passed to the worker processes once
+        shared = dict(data_store=self.data_store, empty_image=self.empty_image,
+                      energy_band=self.energy_band, offset_band=self.offset_band,
+                      exclusion_mask=self.exclusion_mask, ncounts_min=self.ncounts_min,
+                      options=options, cache_dir=cache_dir, cache_key=cache_key)
+        obs_ids = list(self.obs_table['OBS_ID'])
+
+        names = ['counts', 'bkg', 'exposure'] if make_background_image else ['counts']
+        totals = dict((name, SkyImage.empty_like(self.empty_image)) for name in names)
+
+        if parallel:
+            from multiprocessing import Pool, cpu_count
+            log.info('Using {0} cores to compute observation images.'.format(cpu_count()))
+            pool = Pool(initializer=_init_obs_images_worker, initargs=(shared,))
+            results = pool.imap_unordered(_make_obs_images, obs_ids)
+        else:
+            results = (_make_obs_images(obs_id, shared) for obs_id in obs_ids)
+
+        try:
+            for obs_images in results:
+                if obs_images is not None:
+                    _add_obs_images(totals, obs_images, use_cutout)
+        finally:
+            if parallel:
+                pool.close()
+                pool.join()
+
+        for name in names:
+            self.maps[name] = totals[name]
         if make_background_image:
-            self.maps["bkg"] = total_bkg
-            self.maps["exposure"] = total_exposure
             self.significance_image(radius)
             self.excess_image()
 
@@ -341,3 +404,138 @@ class MosaicImage(object):
         total_excess = SkyImage.empty_like(self.empty_image)
         total_excess.data = self.maps["counts"].data - self.maps["bkg"].data
         self.maps["excess"] = total_excess
+
+
+def _add_obs_images(totals, obs_images, use_cutout):
+    """Add the images of one observation to the total images.
+
+    Images computed on the full image are added directly, cutouts are
+    pasted into the total images.
+    """
+    for name, total in totals.items():
+        if use_cutout:
+            total.paste(obs_images[name])
+        else:
+            total.data += obs_images[name].data
+
+
+def _fov_cutout_size(image, offset_max):
+    """Cutout size in pixels, that contains all pixels within ``offset_max``.
+
+    One extra pixel is added on every side to account for pixels whose
+    center lies within ``offset_max`` but are not fully contained.
+    """
+    pixel_scale = image.wcs_pixel_scale().min()
+    radius = int(np.ceil((Angle(offset_max) / pixel_scale).to('').value))
+    return 2 * radius + 3
+
+
+def _obs_images_cache_key(empty_image, energy_band, offset_band, exclusion_mask, ncounts_min, options):
+    """Hash identifying the images of an observation for `MosaicImage`."""
+    sha = hashlib.sha1()
+    sha.update(empty_image.wcs.to_header_string(relax=True).encode('ascii'))
+    sha.update(repr(empty_image.data.shape).encode('ascii'))
+    sha.update(repr(Quantity(energy_band).to('TeV').value.tolist()).encode('ascii'))
+    sha.update(repr(Angle(offset_band).deg.tolist()).encode('ascii'))
+    if exclusion_mask is not None:
+        sha.update(np.ascontiguousarray(exclusion_mask.data).tobytes())
+    sha.update(repr(ncounts_min).encode('ascii'))
+    sha.update(repr(sorted(options.items())).encode('ascii'))
+    return sha.hexdigest()
+
+
+def _obs_files_cache_key(data_store, obs_id):
+    """Hash identifying the data, IRF and background model files of an observation.
+
+    Uses the HDU index table entries of the observation and the size and
+    modification time of the files, so that the cached images of an
+    observation are re-computed e.g. for a new background model.
+    """
+    sha = hashlib.sha1()
+    hdu_table = data_store.hdu_table
+    for idx in np.flatnonzero(hdu_table['OBS_ID'] == obs_id):
+        location = hdu_table.location_info(idx)
+        path = str(location.path(abs_path=True))
+        info = [location.hdu_type, location.hdu_class, path, location.hdu_name]
+        if os.path.exists(path):
+            stat = os.stat(path)
+            info += [stat.st_size, stat.st_mtime]
+        sha.update(repr(info).encode('utf-8'))
+    return sha.hexdigest()
+
+
+def _obs_images_cache_filename(cache_dir, cache_key, data_store, obs_id):
+    """Cache filename for the images of an observation."""
+    sha = hashlib.sha1(cache_key.encode('ascii'))
+    sha.update(_obs_files_cache_key(data_store, obs_id).encode('ascii'))
+    return os.path.join(cache_dir, 'obs_{}_{}.fits'.format(obs_id, sha.hexdigest()))
+
+
+# State shared by all `_make_obs_images` calls in a worker process,
+# set by `_init_obs_images_worker`
+_OBS_IMAGES_SHARED = dict()
+
+
+def _init_obs_images_worker(shared):
+    """Initialise a worker process of the `MosaicImage.make_images` pool."""
+    _OBS_IMAGES_SHARED.clear()
+    _OBS_IMAGES_SHARED.update(shared)
+
+
+def _make_obs_images(obs_id, shared=None):
+    """Compute the images of one observation for `MosaicImage.make_images`.
+
+    Module level function, so that it can be used with `multiprocessing.Pool`.
+    The state shared by all observations (data store, empty image, ...) is
+    passed as a dict, or set once per worker process by
+    `_init_obs_images_worker`. Returns `None` for observations that are
+    skipped.
+    """
+    if shared is None:
+        shared = _OBS_IMAGES_SHARED
+    data_store, empty_image = shared['data_store'], shared['empty_image']
+    ncounts_min, options = shared['ncounts_min'], shared['options']
+    cache_dir = shared['cache_dir']
+
+    if cache_dir is not None:
+        filename = _obs_images_cache_filename(cache_dir, shared['cache_key'],
+                                              data_store, obs_id)
+        # Empty file marking observations that are skipped
+        filename_skipped = filename + '.skipped'
+        if os.path.exists(filename):
+            log.debug('Reading cached images for observation {}'.format(obs_id))
+            return SkyImageCollection.read(filename)
+        if os.path.exists(filename_skipped):
+            log.debug('Skipping observation {} (cached)'.format(obs_id))
+            return None
+
+    obs = data_store.obs(obs_id)
+    try:
+        obs_image = ObsImage(obs, empty_image, shared['energy_band'], shared['offset_band'],
+                             shared['exclusion_mask'], ncounts_min, options['use_cutout'])
+    except NoOverlapError:
+        log.info('Observation {} does not overlap with the image.'.format(obs_id))
+        obs_image = None
+
+    if obs_image is None or len(obs_image.events) <= ncounts_min:
+        if cache_dir is not None:
+            open(filename_skipped, 'w').close()
+        return None
+
+    obs_image.counts_map()
+    obs_images = SkyImageCollection(counts=obs_image.maps["counts"])
+    if options['make_background_image']:
+        obs_image.bkg_map(options['bkg_norm'])
+        obs_image.exposure_map(options['spectral_index'], options['for_integral_flux'])
+        obs_images["bkg"] = obs_image.maps["bkg"]
+        obs_images["exposure"] = obs_image.maps["exposure"]
+
+    if cache_dir is not None:
+        # Write to a temporary file first, so that interrupted runs don't
+        # leave incomplete files in the cache
+        filename_tmp = filename + '.tmp'
+        if os.path.exists(filename_tmp):
+            os.remove(filename_tmp)
+        obs_images.write(filename_tmp)
+        os.rename(filename_tmp, filename)
+    return obs_images
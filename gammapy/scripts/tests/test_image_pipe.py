@@ -1,12 +1,16 @@
 """Example how to make an acceptance curve and background model image.
 """
+import os
 from astropy.coordinates import SkyCoord, Angle
 from numpy.testing import assert_allclose
 from gammapy.utils.energy import Energy
-from gammapy.data import DataStore
+from gammapy.data import DataStore, HDUIndexTable
 from gammapy.image import SkyImage, SkyMask
 from gammapy.background import OffDataBackgroundMaker
 from gammapy.scripts import MosaicImage
+from gammapy.scripts.image_pipe import (_obs_images_cache_key, _obs_files_cache_key,
+                                        _obs_images_cache_filename, _make_obs_images,
+                                        _add_obs_images)
 from ...utils.testing import requires_data, requires_dependency
 
 
@@ -69,3 +73,117 @@ def test_image_pipe(tmpdir):
     assert_allclose(mosaic.maps['exposure'].data.sum(), 54190569251987.68, atol=3)
     assert_allclose(mosaic.maps['significance'].lookup(center), 33.707901541600634, atol=3)
     assert_allclose(mosaic.maps['excess'].data.sum(), 346.8486363336217, atol=3)
+
+    # Computing the images on cutouts around the pointing positions must
+    # give the same result
+    mosaic_cutout = MosaicImage(image, energy_band=energy_band, offset_band=offset_band, data_store=data_store,
+                                obs_table=data_store.obs_table, exclusion_mask=exclusion_mask)
+    mosaic_cutout.make_images(make_background_image=True, for_integral_flux=True, radius=10., use_cutout=True)
+    for name in ['counts', 'bkg', 'exposure', 'significance', 'excess']:
+        assert_allclose(mosaic_cutout.maps[name].data, mosaic.maps[name].data, rtol=1e-5)
+
+    # Parallel processing with a cache of the observation images
+    cache_dir = tmpdir + '/cache'
+    for _ in range(2):
+        mosaic_parallel = MosaicImage(image, energy_band=energy_band, offset_band=offset_band,
+                                      data_store=data_store, obs_table=data_store.obs_table,
+                                      exclusion_mask=exclusion_mask)
+        mosaic_parallel.make_images(make_background_image=True, for_integral_flux=True, radius=10.,
+                                    parallel=True, cache_dir=cache_dir)
+        for name in ['counts', 'bkg', 'exposure', 'significance', 'excess']:
+            assert_allclose(mosaic_parallel.maps[name].data, mosaic.maps[name].data, rtol=1e-5)
+
+
+def test_obs_images_cache_key():
+    image = SkyImage.empty(nxpix=10, nypix=10, binsz=0.1)
+    energy_band = Energy([1, 10], 'TeV')
+    offset_band = Angle([0, 2.49], 'deg')
+    options = dict(make_background_image=True, use_cutout=False)
+
+    key = _obs_images_cache_key(image, energy_band, offset_band, None, 0, options)
+    assert key == _obs_images_cache_key(image, Energy([1000, 10000], 'GeV'), offset_band, None, 0, options)
+    assert key != _obs_images_cache_key(image, Energy([1, 20], 'TeV'), offset_band, None, 0, options)
+    assert key != _obs_images_cache_key(image, energy_band, Angle([0, 2], 'deg'), None, 0, options)
+
+    image_other = SkyImage.empty(nxpix=10, nypix=10, binsz=0.2)
+    assert key != _obs_images_cache_key(image_other, energy_band, offset_band, None, 0, options)
+
+    mask = SkyMask.empty_like(image, fill=1)
+    assert key != _obs_images_cache_key(image, energy_band, offset_band, mask, 0, options)
+
+
+def make_data_store(base_dir):
+    hdu_table = HDUIndexTable(names=['OBS_ID', 'HDU_TYPE', 'HDU_CLASS', 'FILE_DIR',
+                                     'FILE_NAME', 'HDU_NAME'],
+                              rows=[[23523, 'events', 'events', '', 'events.fits', 'EVENTS'],
+                                    [23523, 'bkg', 'bkg_2d', '', 'bkg_1.fits', 'BKG'],
+                                    [23526, 'bkg', 'bkg_2d', '', 'bkg_1.fits', 'BKG']])
+    hdu_table.meta['BASE_DIR'] = base_dir
+    return DataStore(hdu_table=hdu_table)
+
+
+def test_obs_files_cache_key(tmpdir):
+    tmpdir = str(tmpdir)
+    for filename in ['events.fits', 'bkg_1.fits', 'bkg_2.fits']:
+        with open(os.path.join(tmpdir, filename), 'w') as fh:
+            fh.write(filename)
+
+    data_store = make_data_store(tmpdir)
+    key = _obs_files_cache_key(data_store, 23523)
+    assert key == _obs_files_cache_key(make_data_store(tmpdir), 23523)
+    assert key != _obs_files_cache_key(data_store, 23526)
+
+    # Other background model file
+    data_store.hdu_table['FILE_NAME'][1] = 'bkg_2.fits'
+    assert key != _obs_files_cache_key(data_store, 23523)
+
+    # Changed background model file
+    data_store = make_data_store(tmpdir)
+    with open(os.path.join(tmpdir, 'bkg_1.fits'), 'a') as fh:
+        fh.write('new model')
+    assert key != _obs_files_cache_key(data_store, 23523)
+
+
+def test_make_obs_images_skipped_cache(tmpdir):
+    tmpdir = str(tmpdir)
+    image = SkyImage.empty(nxpix=10, nypix=10, binsz=0.1)
+    energy_band = Energy([1, 10], 'TeV')
+    offset_band = Angle([0, 2.49], 'deg')
+    options = dict(make_background_image=True, use_cutout=False)
+    shared = dict(data_store=make_data_store(tmpdir), empty_image=image,
+                  energy_band=energy_band, offset_band=offset_band,
+                  exclusion_mask=None, ncounts_min=0, options=options,
+                  cache_dir=tmpdir,
+                  cache_key=_obs_images_cache_key(image, energy_band, offset_band,
+                                                  None, 0, options))
+
+    # The observation can't be loaded, so this only passes if the cached
+    # skipped marker is used
+    filename = _obs_images_cache_filename(tmpdir, shared['cache_key'],
+                                          shared['data_store'], 23523)
+    open(filename + '.skipped', 'w').close()
+    assert _make_obs_images(23523, shared) is None
+
+
+def test_add_obs_images():
+    center = SkyCoord(0, 0, unit='deg', frame='galactic')
+    for image in [SkyImage.empty(nxpix=10, nypix=8, binsz=0.1),
+                  SkyImage.empty(nxpix=360, nypix=180, binsz=1)]:
+        names = ['counts', 'bkg']
+        totals = dict((name, SkyImage.empty_like(image)) for name in names)
+
+        # Full size observation images
+        obs_images = dict((name, SkyImage.empty_like(image, fill=1)) for name in names)
+        _add_obs_images(totals, obs_images, use_cutout=False)
+        _add_obs_images(totals, obs_images, use_cutout=False)
+
+        # Observation images on cutouts
+        obs_images = dict((name, image.cutout(center, 3)) for name in names)
+        for obs_image in obs_images.values():
+            obs_image.data = obs_image.data + 1
+        _add_obs_images(totals, obs_images, use_cutout=True)
+
+        for name in names:
+            data = totals[name].data
+            assert_allclose(data.sum(), 2 * image.data.size + 9)
+            assert_allclose(data.max(), 3)
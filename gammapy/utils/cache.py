@@ -0,0 +1,131 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Simple in-memory caches.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from collections import OrderedDict
+from threading import RLock
+
+__all__ = ['LRUCache']
+
+
+class LRUCache(object):
+    """Dict-like cache with least-recently-used eviction.
+
+    Used to memoise expensive intermediate results (e.g. kernel FFTs or
+    coordinate grids) that are requested repeatedly with the same key.
+    When more than ``maxsize`` entries are stored, or the total size of the
+    entries exceeds ``maxbytes``, the entries that were accessed least
+    recently are dropped. The most recently used entry is always kept.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of cached entries.
+    maxbytes : int, optional
+        Maximum total size of the cached entries in bytes. No limit if `None`.
+    sizeof : callable, optional
+        Function returning the size of a cached value in bytes. Default is
+        the ``nbytes`` attribute of the value, or zero if it doesn't exist.
+        Sizes are evaluated on every insertion and on `LRUCache.trim`, so
+        values that grow after insertion are accounted for correctly.
+
+    Examples
+    --------
+    >>> from gammapy.utils.cache import LRUCache
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache['a'] = 1
+    >>> cache['b'] = 2
+    >>> cache['c'] = 3
+    >>> 'a' in cache
+    False
+    >>> cache.get_or_compute('d', lambda: 4)
+    4
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=None):
+        if maxsize < 1:
+            raise ValueError('Invalid maxsize: {}'.format(maxsize))
+        self.maxsize = int(maxsize)
+        self.maxbytes = maxbytes
+        self._sizeof = sizeof or _default_sizeof
+        self._data = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = self._data.pop(key)
+            self._data[key] = value
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            self.trim()
+
+    @property
+    def nbytes(self):
+        """Total size of the cached entries in bytes (int)."""
+        with self._lock:
+            return sum(self._sizeof(value) for value in self._data.values())
+
+    def trim(self):
+        """Drop least recently used entries until the cache is within its limits."""
+        with self._lock:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+            if self.maxbytes is None:
+                return
+
+            sizes = [self._sizeof(value) for value in self._data.values()]
+            total = sum(sizes)
+            for size in sizes[:-1]:
+                if total <= self.maxbytes:
+                    break
+                self._data.popitem(last=False)
+                total -= size
+
+    def get(self, key, default=None):
+        """Get cached value, or ``default`` if ``key`` is not cached."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_or_compute(self, key, func):
+        """Get cached value, calling ``func()`` and caching the result on a miss.
+
+        Parameters
+        ----------
+        key : hashable
+            Cache key.
+        func : callable
+            Function without arguments computing the value.
+
+        Returns
+        -------
+        value : object
+            Cached or newly computed value.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            value = func()
+            self[key] = value
+            return value
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._data.clear()
+
+
+def _default_sizeof(value):
+    return getattr(value, 'nbytes', 0)
@@ -0,0 +1,88 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Floating point data type policy for images and cubes.
+
+By default images, cubes and derived maps are computed in ``float64``.
+Setting the default float data type to ``float32`` halves the memory
+needed for survey-scale images and cubes, at the cost of a relative
+precision of about ``1e-7`` per operation.
+
+The data type can be set globally with `set_default_float_dtype`, for a
+block of code with the `default_float_dtype` context manager or for a
+single call with the ``dtype`` argument of functions that support it.
+"""
+from __future__ import absolute_import, division, print_function, unicode_literals
+from contextlib import contextmanager
+import numpy as np
+
+__all__ = [
+    'default_float_dtype',
+    'get_default_float_dtype',
+    'set_default_float_dtype',
+]
+
+_ALLOWED_FLOAT_DTYPES = [np.dtype('float32'), np.dtype('float64')]
+
+_DTYPE_POLICY = dict(float=np.dtype('float64'))
+
+
+def _validate_float_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype not in _ALLOWED_FLOAT_DTYPES:
+        raise ValueError('Invalid float dtype: {}. Choose one of {}'
+                         ''.format(dtype, [str(_) for _ in _ALLOWED_FLOAT_DTYPES]))
+    return dtype
+
+
+def get_default_float_dtype():
+    """Get the default float data type.
+
+    Returns
+    -------
+    dtype : `~numpy.dtype`
+        Default float data type.
+    """
+    return _DTYPE_POLICY['float']
+
+
+def set_default_float_dtype(dtype):
+    """Set the default float data type globally.
+
+    Parameters
+    ----------
+    dtype : {'float32', 'float64'}
+        Default float data type.
+    """
+    _DTYPE_POLICY['float'] = _validate_float_dtype(dtype)
+
+
+@contextmanager
+def default_float_dtype(dtype):
+    """Context manager to set the default float data type for a block of code.
+
+    Parameters
+    ----------
+    dtype : {'float32', 'float64'}
+        Default float data type.
+
+    Examples
+    --------
+    >>> from gammapy.image import SkyImage
+    >>> from gammapy.utils.dtype import default_float_dtype
+    >>> with default_float_dtype('float32'):
+    ...     image = SkyImage.empty(nxpix=10, nypix=10)
+    >>> image.data.dtype
+    dtype('float32')
+    """
+    previous = get_default_float_dtype()
+    set_default_float_dtype(dtype)
+    try:
+        yield
+    finally:
+        _DTYPE_POLICY['float'] = previous
+
+
+def _float_dtype(dtype=None):
+    """Resolve a float data type, `None` gives the default float data type."""
+    if dtype is None:
+        return get_default_float_dtype()
+    return _validate_float_dtype(dtype)
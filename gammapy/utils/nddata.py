@@ -34,8 +34,8 @@ class NDDataArray(object):
     """Axis names. This specifies the axis order"""
 
     interp_kwargs = dict(bounds_error=False)
-    """Interpolation kwargs used to initialize the
-    `scipy.interpolate.RegularGridInterpolator`.  The interpolation behaviour
+    """Interpolation kwargs ``bounds_error`` and ``fill_value``, with the same
+    meaning as for `scipy.interpolate.RegularGridInterpolator`. The interpolation behaviour
     of an individual axis ('log', 'linear') can be passed to the axis on
     initialization."""
 
@@ -74,7 +74,7 @@ class NDDataArray(object):
 
         if data is not None:
             self.data = data
-        self._regular_grid_interp = None
+        self._interp_cache = None
 
     @property
     def axes(self):
@@ -111,7 +111,7 @@ class NDDataArray(object):
                 msg += 'Axis {n} : {sa}, Data {sd}'
                 raise ValueError(msg.format(d=dim, n=self.axis_names[dim],
                                             sa=axis.nbins, sd=data.shape[dim]))
-        self._regular_grid_interp = None
+        self._interp_cache = None
         self._data = data
 
     @property
@@ -180,19 +180,27 @@ class NDDataArray(object):
         ss += array_stats_str(self.data, 'Data')
         return ss
 
-    def evaluate(self, method='linear', **kwargs):
+    def evaluate(self, method='linear', grid=True, **kwargs):
         """Evaluate NDData Array
 
         This function provides a uniform interface to several interpolators.
         The evaluation nodes are given as ``kwargs``.
 
-        Currently available:
-        `~scipy.interpolate.RegularGridInterpolator`, methods: linear, nearest
+        The interpolation is separable: for every axis the indices of the
+        neighbouring nodes and the interpolation weights are computed once
+        and the data array is contracted with them axis by axis. The results
+        are the same as for `~scipy.interpolate.RegularGridInterpolator`,
+        configured with ``interp_kwargs``.
 
         Parameters
         ----------
         method : str {'linear', 'nearest'}
             Interpolation method
+        grid : bool
+            If True, evaluate on the grid spanned by the values of all axes,
+            the result has the concatenated shapes of the axis values. If
+            False, the axis values are broadcast against each other and the
+            array is evaluated point by point.
         kwargs : dict
             Keys are the axis names, Values the evaluation points
 
@@ -201,6 +209,8 @@ class NDDataArray(object):
         array : `~astropy.units.Quantity`
             Interpolated values, axis order is the same as for the NDData array
         """
+        if method not in ['linear', 'nearest']:
+            raise ValueError('Interpolator {} not available'.format(method))
 
         values = list()
         for axname, axis in zip(self.axis_names, self.axes):
@@ -211,65 +221,138 @@ class NDDataArray(object):
             # Transform to match interpolation behaviour of axis
             values.append(np.atleast_1d(axis._interp_values(temp)))
 
-        if method == 'linear':
-            return self._eval_regular_grid_interp(
-                values, method='linear') * self.data.unit
-        elif method == 'nearest':
-            return self._eval_regular_grid_interp(
-                values, method='nearest') * self.data.unit
+        if grid:
+            res = self._eval_grid(values, method=method)
         else:
-            raise ValueError('Interpolator {} not available'.format(method))
+            res = self._eval_points(values, method=method)
+        return res * self.data.unit
 
-    def _eval_regular_grid_interp(self, values, method='linear'):
-        """Evaluate linear interpolator
+    def _eval_grid(self, values, method='linear'):
+        """Evaluate on the grid spanned by the axis values
 
         Input: list of values to evaluate, in correct units and correct order.
         """
-        if self._regular_grid_interp is None:
-            self._add_regular_grid_interp()
-
-        # This is necessary since np.append does not support the 1D case
-        if self.dim > 1:
-            shapes = np.append(*[np.shape(_) for _ in values])
-        else:
-            shapes = values[0].shape
+        nodes, data = self._interp_grid()
+        shapes = sum([np.shape(_) for _ in values], ())
         # Flatten in order to support 2D array input
-        values = [_.flatten() for _ in values]
-        points = list(itertools.product(*values))
-        res = self._regular_grid_interp(points, method=method)
-        res = np.reshape(res, shapes).squeeze()
+        values = [_.ravel() for _ in values]
+        weights = [self._interp_weights(_, x, method, dim)
+                   for dim, (_, x) in enumerate(zip(nodes, values))]
+
+        # Contract the axes which shrink the array most first
+        order = np.argsort([len(x) / len(_) for _, x in zip(nodes, values)])
+        res = data
+        for dim in order:
+            terms, outside = weights[dim]
+            shape = [1] * self.dim
+            shape[dim] = -1
+            res = sum(np.take(res, idx, axis=dim) * np.reshape(w, shape)
+                      for idx, w in terms)
+
+        fill_value = self._interp_kwargs().get('fill_value', np.nan)
+        if fill_value is not None:
+            mask = np.zeros(res.shape, dtype=bool)
+            for dim, (_, outside) in enumerate(weights):
+                shape = [1] * self.dim
+                shape[dim] = -1
+                mask |= outside.reshape(shape)
+            res[mask] = fill_value
+
+        return np.reshape(res, shapes).squeeze()
+
+    def _eval_points(self, values, method='linear'):
+        """Evaluate at broadcast points
+
+        Input: list of values to evaluate, in correct units and correct order.
+        """
+        nodes, data = self._interp_grid()
+        values = np.broadcast_arrays(*values)
+        weights = [self._interp_weights(_, x, method, dim)
+                   for dim, (_, x) in enumerate(zip(nodes, values))]
+
+        # Sum over the corners of the grid cells containing the points
+        res = np.zeros(values[0].shape)
+        for corner in itertools.product(*[terms for terms, _ in weights]):
+            idx = tuple(_[0] for _ in corner)
+            res += np.prod([_[1] for _ in corner], axis=0) * data[idx]
+
+        fill_value = self._interp_kwargs().get('fill_value', np.nan)
+        if fill_value is not None:
+            mask = np.any([outside for _, outside in weights], axis=0)
+            res[mask] = fill_value
 
         return res
 
-    def _add_regular_grid_interp(self, interp_kwargs=None):
-        """Add `~scipy.interpolate.RegularGridInterpolator`
+    def _interp_kwargs(self):
+        """Interpolation kwargs with the defaults of
+        `~scipy.interpolate.RegularGridInterpolator`"""
+        kwargs = dict(bounds_error=True, fill_value=np.nan)
+        kwargs.update(self.interp_kwargs)
+        return kwargs
 
-        http://docs.scipy.org/doc/scipy-0.14.0/reference/generated/scipy.interpolate.RegularGridInterpolator.html
+    def _interp_weights(self, nodes, values, method, dim):
+        """Interpolation indices and weights for one axis
 
         Parameters
         ----------
-        interp_kwargs : dict, optional
-            Interpolation kwargs
+        nodes : `~numpy.ndarray`
+            Interpolation nodes of the axis
+        values : `~numpy.ndarray`
+            Values to evaluate
+        method : str {'linear', 'nearest'}
+            Interpolation method
+        dim : int
+            Axis index, used for the error message
+
+        Returns
+        -------
+        terms : list of tuple
+            Node indices and weights ``(idx, weight)``, one term for nearest
+            neighbour and two terms for linear interpolation.
+        outside : `~numpy.ndarray`
+            Mask of values outside the node range
         """
-        from scipy.interpolate import RegularGridInterpolator
-        
-        if interp_kwargs is None:
-            interp_kwargs = self.interp_kwargs
-        points = [a._interp_nodes() for a in self.axes]
-        values = self.data.value
-
-        # If values contains nan, only setup interpolator in valid range
-        if np.isnan(values).any():
-            if self.dim > 1:
-                raise NotImplementedError('Data grid contains nan. This is not'
-                                          'supported for arrays dimension > 1')
-            else:
-                mask = np.isfinite(values)
-                points = [points[0][mask]]
-                values = values[mask]
-
-        self._regular_grid_interp = RegularGridInterpolator(points, values,
-                                                            **interp_kwargs)
+        outside = (values < nodes[0]) | (values > nodes[-1])
+        if self._interp_kwargs()['bounds_error'] and outside.any():
+            raise ValueError('One of the requested xi is out of bounds '
+                             'in dimension {}'.format(dim))
+
+        if len(nodes) == 1:
+            return [(np.zeros(values.shape, dtype=int), np.ones(values.shape))], outside
+
+        # Same index convention as `~scipy.interpolate.RegularGridInterpolator`
+        idx = np.clip(np.searchsorted(nodes, values) - 1, 0, len(nodes) - 2)
+        with np.errstate(invalid='ignore'):
+            distance = (values - nodes[idx]) / (nodes[idx + 1] - nodes[idx])
+
+        if method == 'nearest':
+            with np.errstate(invalid='ignore'):
+                idx = np.where(distance <= 0.5, idx, idx + 1)
+            return [(idx, np.ones(values.shape))], outside
+        else:
+            return [(idx, 1 - distance), (idx + 1, distance)], outside
+
+    def _interp_grid(self):
+        """Interpolation nodes and data values
+
+        If the data contains nan, only the valid range is used.
+        """
+        if self._interp_cache is None:
+            nodes = [a._interp_nodes() for a in self.axes]
+            values = np.asarray(self.data.value, dtype=float)
+
+            if np.isnan(values).any():
+                if self.dim > 1:
+                    raise NotImplementedError('Data grid contains nan. This is not'
+                                              'supported for arrays dimension > 1')
+                else:
+                    mask = np.isfinite(values)
+                    nodes = [nodes[0][mask]]
+                    values = values[mask]
+
+            self._interp_cache = nodes, values
+
+        return self._interp_cache
 
 
 class DataAxis(object):
@@ -0,0 +1,59 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+from astropy.tests.helper import pytest
+from ..cache import LRUCache
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache['a'] = 1
+    cache['b'] = 2
+
+    # Access 'a', so that 'b' is the least recently used entry
+    assert cache['a'] == 1
+    cache['c'] = 3
+
+    assert len(cache) == 2
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert cache.get('b', 42) == 42
+
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 99
+
+    assert cache.get_or_compute('d', compute) == 99
+    assert cache.get_or_compute('d', compute) == 99
+    assert len(calls) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_lru_cache_maxbytes():
+    cache = LRUCache(maxsize=10, maxbytes=100)
+    cache['a'] = np.zeros(5)
+    cache['b'] = np.zeros(5)
+    assert cache.nbytes == 80
+
+    cache['c'] = np.zeros(5)
+    assert list(cache._data) == ['b', 'c']
+
+    # Values that grow after insertion are accounted for on trim
+    value = dict(nbytes=10)
+    cache = LRUCache(maxsize=10, maxbytes=100, sizeof=lambda _: _['nbytes'])
+    cache['a'] = value
+    cache['b'] = dict(nbytes=10)
+    value['nbytes'] = 95
+    cache.trim()
+    assert list(cache._data) == ['b']
+
+    # The most recently used entry is kept, even if it exceeds the budget
+    cache['c'] = dict(nbytes=200)
+    assert list(cache._data) == ['c']
@@ -0,0 +1,40 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import absolute_import, division, print_function, unicode_literals
+import numpy as np
+from numpy.testing import assert_allclose
+from astropy.tests.helper import pytest
+from ..dtype import (default_float_dtype, get_default_float_dtype,
+                     set_default_float_dtype)
+from ...image import SkyImage, disk_correlate
+from ...cube import SkyCube
+
+
+def test_default_float_dtype():
+    assert get_default_float_dtype() == np.float64
+
+    with default_float_dtype('float32'):
+        assert get_default_float_dtype() == np.float32
+        image = SkyImage.empty(nxpix=10, nypix=5)
+        cube = SkyCube.empty(nxpix=10, nypix=5, enbins=3)
+
+    assert get_default_float_dtype() == np.float64
+    assert image.data.dtype == np.float32
+    assert cube.data.dtype == np.float32
+    assert SkyImage.empty_like(image).data.dtype == np.float32
+    assert SkyImage.empty_like(image, dtype='float64').data.dtype == np.float64
+    assert SkyImage.empty(nxpix=10, nypix=5).data.dtype == np.float64
+
+    with pytest.raises(ValueError):
+        set_default_float_dtype('int32')
+
+
+def test_float32_precision():
+    np.random.seed(0)
+    image = SkyImage.empty(nxpix=200, nypix=200, dtype='float32')
+    image.data += np.random.poisson(10, image.data.shape)
+
+    for method in ['direct', 'fft']:
+        actual = disk_correlate(image.data, 20, method=method)
+        desired = disk_correlate(image.data.astype('float64'), 20, method=method)
+        assert actual.dtype == np.float32
+        assert_allclose(actual, desired, rtol=1e-5)